@@ -1,422 +1,814 @@
+import logging
+import os
 import streamlit as st
 import time
-import asyncio
-from typing import Dict, List, Any
-import json
-import requests
-from datetime import datetime
-
-# Simulasi import agents (dalam implementasi nyata, ini akan dari file terpisah)
-class ReasoningAgent:
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-    
-    def analyze_requirements(self, topic: str, level: str, duration: int, format_type: str) -> Dict[str, Any]:
-        """Menganalisis kebutuhan kurikulum berdasarkan input pengguna"""
-        # Simulasi pemrosesan dengan Gemini 2.0 Flash
-        time.sleep(2)  # Simulasi API call
-        
-        competencies = {
-            "pemula": ["Pemahaman dasar", "Pengenalan konsep", "Praktik sederhana"],
-            "menengah": ["Penerapan teori", "Analisis kasus", "Project menengah"],
-            "lanjutan": ["Analisis mendalam", "Optimisasi", "Project kompleks"]
-        }
-        
-        return {
-            "topic": topic,
-            "level": level,
-            "duration": duration,
-            "format": format_type,
-            "competencies": competencies.get(level, competencies["pemula"]),
-            "learning_objectives": [
-                f"Memahami konsep dasar {topic}",
-                f"Mampu menerapkan {topic} dalam konteks {level}",
-                f"Menguasai tools dan teknik {topic}"
-            ],
-            "recommended_modules": duration // 2 if duration > 4 else 2
-        }
+import uuid
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import TimeoutError as FuturesTimeout
+from contextlib import nullcontext
+
+from core.admission import (
+    DEGRADED_MODES, MIN_PIPELINE_BUDGET, NEAR_MATCH_THRESHOLD, REQUEST_DEADLINE,
+    AdmissionController, Deadline, Overloaded, request_deadline
+)
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer, run_sync
+from core.cache import DEFAULT_CACHE_PATH, CurriculumCache, make_cache_key
+from core.catalog import VideoCatalog
+from core.extract import PageExtractionPool
+from core.export import EXPORT_FORMATS, ExportEngine, cached_items, export_filename, render
+from core.fetch import Fetcher, YouTubeDataBackend, youtube_quota_bucket, TokenBucket
+from core.jobs import POLL_INTERVAL, JobQueue, QueueFull, WorkerPool
+from core.mail import EmailQueue, LocalSMTPServer, build_curriculum_email
+from core.graph import CheckpointStore, NodeEvent, build_curriculum_graph, curriculum_run_id
+from core.memo import StageMemoizer
+from core.metrics import MetricsStore, histogram_quantile, hit_rate, metrics
+from core.pipeline import AGENT_TIMEOUT, find_similar_curriculum, reuse_similar
+from core.prefetch import PrefetchBudget, RequestHistory, SpeculativePrefetcher, WarmupScheduler
+from core.results import ResultStore
+from core.scoring import rescore_references
+from core.semantic import SemanticIndex
+from core.tracing import span_tree, tracer
+
+logger = logging.getLogger(__name__)
+
+# Mode antrean: pipeline dijalankan proses worker (python -m core.jobs), UI hanya memantau.
+# KURIKULUM_QUEUE_WORKERS > 0 menjalankan pool worker di dalam proses Streamlit ini.
+JOB_QUEUE_PATH = os.environ.get("KURIKULUM_JOB_QUEUE")
+QUEUE_WORKERS = int(os.environ.get("KURIKULUM_QUEUE_WORKERS", "0"))
+QUEUE_TIMEOUT = 300
+
+# Jumlah pipeline yang boleh berjalan bersamaan di proses Streamlit ini
+MAX_CONCURRENT_GENERATIONS = int(os.environ.get("KURIKULUM_MAX_CONCURRENT", "4"))
+
+# Lama menunggu render export sebelum UI menampilkan status "sedang dirender"
+EXPORT_WAIT = 10.0
+BULK_EXPORT_LIMIT = 500
+BULK_EXPORT_DIR = os.path.join(".cache", "exports")
 
-class YouTubeAgent:
-    def __init__(self, api_key: str = None):
-        self.api_key = api_key
+# Tanpa KURIKULUM_SMTP_HOST email disimpan oleh SMTP stand-in lokal di .cache/outbox
+SMTP_HOST = os.environ.get("KURIKULUM_SMTP_HOST")
+SMTP_PORT = int(os.environ.get("KURIKULUM_SMTP_PORT", "25"))
+
+# Warm-up cache untuk N kombinasi paling populer (0 = nonaktif) dan prefetch spekulatif
+# dari input sidebar sebelum Generate diklik (KURIKULUM_SPECULATIVE=0 = nonaktif)
+PREFETCH_TOP_N = int(os.environ.get("KURIKULUM_PREFETCH_TOP_N", "20"))
+SPECULATIVE_PREFETCH = os.environ.get("KURIKULUM_SPECULATIVE", "1") != "0"
+# Lama maksimum menunggu prefetch spekulatif yang sedang berjalan saat Generate diklik
+SPECULATION_WAIT = 15.0
+
+class StreamlitReporter:
+    """Menampilkan pesan dari agent di halaman Streamlit"""
     
-    def _create_search_query(self, requirements: Dict[str, Any]) -> str:
-        """Membuat query pencarian yang optimal"""
-        topic = requirements['topic']
-        level = requirements['level']
-        
-        # Reasoning untuk membuat query yang efektif
-        if level == "pemula":
-            query = f"{topic} tutorial beginners"
-        elif level == "menengah":
-            query = f"{topic} intermediate guide"
-        else:
-            query = f"{topic} advanced masterclass"
-        
-        return query
+    def error(self, message: str) -> None:
+        st.error(message)
+    
+    def warning(self, message: str) -> None:
+        st.warning(message)
+
+@st.cache_resource
+def get_stage_memo() -> StageMemoizer:
+    """Memo per stage yang dibagi oleh semua sesi"""
+    return StageMemoizer()
+
+@st.cache_resource
+def get_fetcher() -> Fetcher:
+    """Satu connection pool HTTP yang dibagi oleh semua sesi"""
+    return Fetcher()
+
+@st.cache_resource
+def get_extraction_pool() -> PageExtractionPool:
+    """Process pool ekstraksi halaman referensi yang dibagi oleh semua sesi"""
+    return PageExtractionPool()
+
+@st.cache_resource
+def get_youtube_quota() -> TokenBucket:
+    """Kuota YouTube Data API dibagi oleh semua sesi dalam proses ini"""
+    return youtube_quota_bucket()
+
+@st.cache_resource
+def get_video_catalog() -> VideoCatalog:
+    """Katalog video lokal yang dibagi oleh semua sesi; dibangun dari hasil pencarian"""
+    return VideoCatalog()
+
+@st.cache_resource
+def get_semantic_index() -> SemanticIndex:
+    """Indeks topik serupa yang dibagi oleh semua sesi"""
+    return SemanticIndex()
+
+@st.cache_resource
+def get_checkpoint_store() -> CheckpointStore:
+    """Checkpoint node graph yang dibagi oleh semua sesi; run lama dibersihkan saat start"""
+    store = CheckpointStore()
+    store.prune(older_than=24 * 3600)
+    return store
+
+@st.cache_resource
+def get_result_store() -> ResultStore:
+    """Hasil generasi terbaru per generation ID, dibagi lintas sesi dengan batas jumlah entri"""
+    return ResultStore()
+
+@st.cache_resource
+def get_metrics_store() -> MetricsStore:
+    """Store metrik bersama semua worker; flusher proses ini dimulai sekali"""
+    store = MetricsStore()
+    metrics.start_flusher(store)
+    return store
+
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """Antrean job bersama; pool worker lokal (jika dikonfigurasi) dimulai sekali per proses"""
+    if QUEUE_WORKERS > 0:
+        # Worker memakai cache kurikulum dan katalog video yang sama dengan UI
+        WorkerPool(QUEUE_WORKERS, JOB_QUEUE_PATH, cache_path=DEFAULT_CACHE_PATH).start()
+    return JobQueue(JOB_QUEUE_PATH)
+
+@st.cache_resource
+def get_admission_controller() -> AdmissionController:
+    """Batas pipeline bersamaan yang dibagi oleh semua sesi dalam proses ini"""
+    return AdmissionController(max_concurrent=MAX_CONCURRENT_GENERATIONS)
+
+@st.cache_resource
+def get_export_engine() -> ExportEngine:
+    """Thread pool render export yang dibagi oleh semua sesi"""
+    return ExportEngine()
+
+@st.cache_resource
+def get_email_queue() -> EmailQueue:
+    """Antrean email keluar bersama; SMTP stand-in lokal dimulai sekali jika tidak ada server SMTP"""
+    if SMTP_HOST:
+        return EmailQueue(SMTP_HOST, SMTP_PORT)
+    return EmailQueue("127.0.0.1", LocalSMTPServer().start_in_thread())
+
+def queue_curriculum_email(address: str, topic: str, curriculum: Dict[str, Any]) -> None:
+    """Render PDF di pool export lalu masukkan email ke antrean, tanpa menahan thread UI"""
+    email_queue = get_email_queue()
+    
+    def enqueue(future) -> None:
+        try:
+            email_queue.send(build_curriculum_email(
+                address, curriculum, render(curriculum, "markdown").decode("utf-8"),
+                [(export_filename(topic, "pdf"), future.result(), EXPORT_FORMATS["pdf"].mime)]
+            ))
+        except Exception:
+            logger.exception("Gagal memasukkan email kurikulum ke antrean")
+    
+    get_export_engine().submit(curriculum, "pdf").add_done_callback(enqueue)
+
+@st.cache_resource
+def get_curriculum_cache() -> CurriculumCache:
+    """Satu instance cache kurikulum yang dibagi oleh semua sesi"""
+    return CurriculumCache()
+
+@st.cache_resource
+def get_request_history() -> RequestHistory:
+    """Frekuensi permintaan per kombinasi input, sumber daftar warm-up"""
+    return RequestHistory()
+
+@st.cache_resource
+def get_prefetch_budget() -> PrefetchBudget:
+    """Budget kerja latar belakang: tidak mengambil slot, CPU, atau kuota YouTube dari permintaan live"""
+    return PrefetchBudget(get_admission_controller(), quota=get_youtube_quota())
+
+@st.cache_resource
+def get_speculative_prefetcher() -> SpeculativePrefetcher:
+    """Prefetch stage awal dari input sidebar, satu per sesi"""
+    return SpeculativePrefetcher(get_prefetch_budget())
+
+@st.cache_resource
+def get_warmup_scheduler() -> WarmupScheduler:
+    """Thread warm-up cache yang dimulai sekali per proses; memakai API key dari environment"""
+    return WarmupScheduler(
+        get_request_history(),
+        get_curriculum_cache(),
+        get_prefetch_budget(),
+        lambda: build_agents(os.environ.get("GEMINI_API_KEY", ""), os.environ.get("YOUTUBE_API_KEY", "")),
+        semantic_index=get_semantic_index(),
+        top_n=PREFETCH_TOP_N
+    ).start()
+
+def build_agents(
+    gemini_api_key: str,
+    youtube_api_key: str,
+    reporter: Optional[StreamlitReporter] = None
+) -> Tuple[ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer]:
+    """Agent pipeline dengan memo, connection pool, kuota dan katalog video bersama"""
+    stage_memo = get_stage_memo()
+    youtube_backend = None
+    if youtube_api_key:
+        youtube_backend = YouTubeDataBackend(youtube_api_key, get_fetcher(), get_youtube_quota())
+    return (
+        ReasoningAgent(gemini_api_key, memo=stage_memo, reporter=reporter),
+        YouTubeAgent(youtube_api_key, youtube_backend, memo=stage_memo, reporter=reporter, catalog=get_video_catalog()),
+        WebAgent(memo=stage_memo, reporter=reporter, extractor=get_extraction_pool()),
+        CurriculumComposer(reporter=reporter)
+    )
+
+def speculate(
+    topic: str,
+    level: str,
+    duration: int,
+    format_type: List[str],
+    gemini_api_key: str,
+    youtube_api_key: str
+) -> None:
+    """Mulai analisis dan pencarian untuk input sidebar saat ini, sebelum Generate diklik"""
+    if not SPECULATIVE_PREFETCH or JOB_QUEUE_PATH:
+        return
+    cache_key = make_cache_key(topic, level, duration, format_type)
+    cache = get_curriculum_cache()
+    # Kurikulum sudah ada, atau jalur topik serupa tidak butuh reasoning maupun pencarian
+    # Dipanggil di setiap rerun script: cek tanpa menghitung hit/miss cache
+    if (
+        cache.expires_at(cache_key) is not None
+        or find_similar_curriculum(get_semantic_index(), cache, topic, level, peek=True)
+    ):
+        return
+    # Tanpa reporter Streamlit: agent berjalan di luar thread script
+    reasoning_agent, youtube_agent, web_agent, _ = build_agents(gemini_api_key, youtube_api_key)
+    get_speculative_prefetcher().update(
+        st.session_state.get("metrics_session_id", ""), topic, level, duration, format_type,
+        (reasoning_agent, youtube_agent, web_agent)
+    )
+
+def generate_results(
+    topic: str,
+    level: str,
+    duration: int,
+    format_type: List[str],
+    gemini_api_key: str,
+    youtube_api_key: str
+) -> Dict[str, Any]:
+    """Menjalankan (atau mengambil dari cache) pipeline, merender hasilnya, dan mengembalikan satu generasi"""
+    started = time.perf_counter()
+    generation_id = curriculum_run_id(topic, level, duration, format_type)
+    result_store = get_result_store()
+    get_request_history().record(topic, level, duration, format_type)
+    
+    # Generasi dengan input yang sama mungkin baru saja dibuat oleh sesi lain
+    shared = result_store.get(generation_id)
+    if shared is not None:
+        tracer.current().set("cache.curriculum", "memory")
+        st.success("⚡ Kurikulum diambil dari memori")
+        return _present(shared, None, started)
     
-    def search_videos(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Mencari video YouTube yang relevan menggunakan web search"""
-        query = self._create_search_query(requirements)
+    view = None
+    
+    # Cek cache sebelum menjalankan pipeline
+    cache = get_curriculum_cache()
+    cache_key = make_cache_key(topic, level, duration, format_type)
+    curriculum = cache.get(cache_key)
+    semantic_index = get_semantic_index()
+    similar = None
+    if curriculum is None:
+        similar = find_similar_curriculum(semantic_index, cache, topic, level)
+    tracer.current().set("cache.curriculum", "hit" if curriculum is not None else "similar" if similar else "miss")
+    
+    if curriculum is not None:
+        # Cache hanya menyimpan kurikulum final, bukan requirements mentah
+        requirements = None
+        videos = curriculum['videos']
+        references = curriculum['references']
+        st.success(f"⚡ Kurikulum diambil dari cache (dibuat {curriculum['created_at']})")
+    elif similar is not None:
+        # Topik hampir sama sudah pernah dibuat: pakai ulang video & referensinya
+        match, _ = similar
+        st.success(f"♻️ Video & referensi diambil dari kurikulum serupa: {match.topic} (kemiripan {match.similarity:.0%})")
+        view = ResultsView(started)
+        stages = reuse_similar(
+            ReasoningAgent(gemini_api_key), CurriculumComposer(reporter=StreamlitReporter()),
+            similar, topic, level, duration, format_type, cache, started
+        )
         
+        async def run_reuse() -> Dict[str, Any]:
+            state = {}
+            async for stage, output in stages:
+                show_stage_output(view, stage, output)
+                state[stage] = output
+            return state
+        
+        with st.spinner("📝 Menyesuaikan kurikulum dari topik serupa..."):
+            state = run_sync(run_reuse())
+        requirements = state["requirements"]
+        videos = state["videos"]
+        references = state["references"]
+        curriculum = state["curriculum"]
+    elif JOB_QUEUE_PATH:
+        # Pipeline berjalan di proses worker; hasil dirender setelah job selesai
         try:
-            # Menggunakan web search untuk mencari video YouTube
-            import requests
-            from urllib.parse import quote
+            result = run_queued_job(topic, level, duration, format_type)
+        except Overloaded as e:
+            return serve_overloaded(e, generation_id, topic, level, format_type, None, started)
+        requirements = result.get("requirements")
+        videos = result["videos"]
+        references = result["references"]
+        curriculum = result["curriculum"]
+        cache.set(cache_key, curriculum)
+        semantic_index.add(topic, level, cache_key)
+        metrics.record_generation(curriculum, time.perf_counter() - started)
+    else:
+        # Initialize agents
+        reasoning_agent, youtube_agent, web_agent, composer = build_agents(
+            gemini_api_key, youtube_api_key, StreamlitReporter()
+        )
+        
+        # Progress tracking; hasil dirender bertahap di bawahnya
+        progress_container = st.container()
+        view = ResultsView(started)
+        with progress_container:
+            st.markdown("### 🔄 Proses Generasi Kurikulum")
             
-            # Search query untuk YouTube
-            search_query = f"site:youtube.com {query}"
+            progress_bar = st.progress(0)
+            status_text = st.empty()
             
-            # Simulasi web search (dalam implementasi nyata, gunakan Google Search API)
-            # Untuk demo, kita buat reasoning berdasarkan topic dan level
-            videos = self._reason_video_selection(requirements, query)
+            # Agent dijalankan sebagai graph: reasoning -> {youtube, web} -> composer.
+            # Output tiap node di-checkpoint, sehingga rerun/refresh dengan input
+            # yang sama melanjutkan dari node terakhir yang selesai.
+            graph = build_curriculum_graph(
+                reasoning_agent, youtube_agent, web_agent, composer, on_description=view.stream_description
+            )
+            run_id = curriculum_run_id(topic, level, duration, format_type)
+            inputs = {"topic": topic, "level": level, "duration": duration, "format": format_type}
+            node_labels = {
+                "reasoning": "✅ Analisis kebutuhan selesai",
+                "youtube": "✅ Video pembelajaran ditemukan",
+                "web": "✅ Referensi web terkumpul",
+                "composer": "✅ Kurikulum berhasil dibuat!"
+            }
             
-            return videos
+            async def run_graph() -> Dict[str, Any]:
+                state = {}
+                # Sesi lain dengan input yang sama menunggu run ini lalu memutar ulang checkpoint-nya.
+                # Run yang selesai dilayani cache (dengan TTL dan eviction-nya), bukan dari checkpoint
+                async for event in graph.astream(
+                    run_id, inputs, get_checkpoint_store(), node_timeout=AGENT_TIMEOUT, discard=True
+                ):
+                    show_node_output(view, event)
+                    if event.partial:
+                        continue
+                    
+                    state[event.node] = event.output
+                    progress_bar.progress(25 * len(state))
+                    suffix = " (dipulihkan dari checkpoint)" if event.resumed else ""
+                    st.success(node_labels[event.node] + suffix)
+                    
+                    if "composer" in state:
+                        continue
+                    if "youtube" in state and "web" in state:
+                        status_text.text("📝 Agent 4: Menyusun kurikulum final...")
+                    elif "reasoning" in state:
+                        status_text.text("🎥🌐 Agent 2 & 3: Mencari video dan mengumpulkan referensi web...")
+                return state
             
-        except Exception as e:
-            st.error(f"Error searching videos: {str(e)}")
-            return []
-    
-    def _reason_video_selection(self, requirements: Dict[str, Any], query: str) -> List[Dict[str, Any]]:
-        """Reasoning untuk memilih video yang tepat berdasarkan requirements"""
-        topic = requirements['topic']
-        level = requirements['level']
-        duration = requirements['duration']
-        
-        # Reasoning untuk menentukan jenis video yang dibutuhkan
-        video_types = []
-        
-        if level == "pemula":
-            video_types = ["introduction", "basics", "getting started", "fundamentals"]
-        elif level == "menengah":
-            video_types = ["intermediate", "practical", "implementation", "projects"]
-        else:
-            video_types = ["advanced", "masterclass", "expert", "optimization"]
-        
-        # Reasoning untuk durasi video yang optimal
-        if duration <= 4:
-            preferred_duration = "short tutorial"
-        elif duration <= 12:
-            preferred_duration = "comprehensive guide"
-        else:
-            preferred_duration = "complete course"
-        
-        # Generate video list berdasarkan reasoning
-        videos = []
-        for i, video_type in enumerate(video_types[:3]):  # Maksimal 3 video
-            video = {
-                "title": f"{topic.title()} {video_type.title()} - {preferred_duration.title()}",
-                "channel": self._generate_channel_name(topic, video_type),
-                "duration": self._estimate_duration(video_type, duration),
-                "views": self._estimate_views(video_type),
-                "url": f"https://youtube.com/search?q={quote(f'{topic} {video_type}')}",
-                "thumbnail": f"https://img.youtube.com/vi/placeholder/maxresdefault.jpg",
-                "description": self._generate_description(topic, video_type, level),
-                "relevance_score": self._calculate_relevance(video_type, requirements)
-            }
-            videos.append(video)
-        
-        # Sort berdasarkan relevance score
-        videos.sort(key=lambda x: x['relevance_score'], reverse=True)
-        
-        return videos
+            # Deadline dihitung sejak klik, termasuk waktu menunggu slot eksekusi
+            deadline = Deadline(REQUEST_DEADLINE)
+            session_id = st.session_state.get("metrics_session_id", "")
+            # Prefetch spekulatif untuk input yang sama sudah mengerjakan stage awal;
+            # menunggunya lebih murah daripada menjalankan stage yang sama dua kali
+            if SPECULATIVE_PREFETCH:
+                get_speculative_prefetcher().wait(
+                    session_id, topic, level, duration, format_type,
+                    min(SPECULATION_WAIT, deadline.remaining() - MIN_PIPELINE_BUDGET)
+                )
+            status_text.text("⏳ Menunggu giliran eksekusi...")
+            try:
+                with get_admission_controller().admit(session_id, deadline.remaining() - MIN_PIPELINE_BUDGET):
+                    status_text.text("🧠 Agent 1: Menganalisis kebutuhan kurikulum...")
+                    with request_deadline(deadline):
+                        state = run_sync(run_graph())
+            except Overloaded as e:
+                status_text.text("")
+                return serve_overloaded(e, generation_id, topic, level, format_type, view, started)
+            except TimeoutError:
+                status_text.text("")
+                st.error(f"⚠️ Agent tidak selesai dalam {AGENT_TIMEOUT} detik. Silakan coba lagi.")
+                st.stop()
+            except Exception as e:
+                status_text.text("")
+                st.error(f"⚠️ Gagal menjalankan agent: {str(e)}")
+                st.stop()
+            
+            requirements = state["reasoning"]
+            videos = state["youtube"]
+            references = state["web"]
+            curriculum = state["composer"]
+            if deadline.degraded:
+                curriculum["degraded"] = {"mode": "template", "stages": list(deadline.degraded)}
+                metrics.inc("degraded_responses_total", mode="template")
+                # Hasil template tidak disimpan agar permintaan berikutnya mencoba pipeline penuh
+            else:
+                cache.set(cache_key, curriculum)
+                semantic_index.add(topic, level, cache_key)
+            metrics.record_generation(curriculum, time.perf_counter() - started)
+            
+            status_text.text("🎉 Selesai! Scroll ke bawah untuk melihat hasil.")
     
-    def _generate_channel_name(self, topic: str, video_type: str) -> str:
-        """Generate nama channel yang realistis"""
-        if "basic" in video_type or "introduction" in video_type:
-            return f"{topic.split()[0]} Academy"
-        elif "advanced" in video_type or "expert" in video_type:
-            return f"Pro {topic.split()[0]}"
-        else:
-            return f"{topic.title()} Hub"
-    
-    def _estimate_duration(self, video_type: str, total_duration: int) -> str:
-        """Estimasi durasi video berdasarkan jenis"""
-        if "introduction" in video_type:
-            minutes = min(15, total_duration * 15)
-        elif "advanced" in video_type:
-            minutes = min(45, total_duration * 25)
-        else:
-            minutes = min(30, total_duration * 20)
-        
-        return f"{minutes}:{minutes % 60:02d}"
+    generation = {
+        "id": generation_id,
+        "topic": topic,
+        "requirements": requirements,
+        "videos": videos,
+        "references": references,
+        "curriculum": curriculum
+    }
+    _present(generation, view, started)
+    result_store.put(generation)
+    return generation
+
+def serve_overloaded(
+    error: Overloaded,
+    generation_id: str,
+    topic: str,
+    level: str,
+    format_type: List[str],
+    view: Optional["ResultsView"],
+    started: float
+) -> Dict[str, Any]:
+    """Jalur degradasi saat tidak mendapat slot: kurikulum topik serupa, atau respons sibuk"""
+    near = find_similar_curriculum(
+        get_semantic_index(), get_curriculum_cache(), topic, level,
+        threshold=NEAR_MATCH_THRESHOLD, same_word_count=True
+    )
+    if near is None:
+        metrics.inc("degraded_responses_total", mode="busy")
+        tracer.current().set("degraded", "busy")
+        st.warning(f"⏳ {DEGRADED_MODES['busy']} ({error}). Silakan coba beberapa saat lagi.")
+        st.stop()
     
-    def _estimate_views(self, video_type: str) -> str:
-        """Estimasi jumlah views berdasarkan jenis video"""
-        if "basic" in video_type:
-            return f"{150 + hash(video_type) % 100}K"
-        elif "advanced" in video_type:
-            return f"{80 + hash(video_type) % 50}K"
+    match, previous = near
+    curriculum = dict(previous)
+    curriculum["references"] = rescore_references(previous["references"], {"level": level, "format": format_type})
+    curriculum["degraded"] = {
+        "mode": "near_match",
+        "reason": error.reason,
+        "topic": match.topic,
+        "similarity": round(match.similarity, 3)
+    }
+    metrics.inc("degraded_responses_total", mode="near_match")
+    tracer.current().set("degraded", "near_match")
+    
+    generation = {
+        "id": generation_id,
+        "topic": topic,
+        "requirements": None,
+        "videos": curriculum["videos"],
+        "references": curriculum["references"],
+        "curriculum": curriculum
+    }
+    if view is not None:
+        view.show_curriculum(curriculum)
+        for video in generation["videos"]:
+            view.add_video(video)
+        for ref in generation["references"]:
+            view.add_reference(ref)
+    return _present(generation, view, started)
+
+def run_queued_job(topic: str, level: str, duration: int, format_type: List[str]) -> Dict[str, Any]:
+    """Mengirim generasi ke antrean worker dan memantau progresnya sampai selesai"""
+    queue = get_job_queue()
+    try:
+        job_id = queue.submit(
+            {"topic": topic, "level": level, "duration": duration, "formats": format_type},
+            priority="interactive"
+        )
+    except QueueFull as e:
+        raise Overloaded("queue_full", str(e)) from e
+    
+    st.markdown("### 🔄 Proses Generasi Kurikulum")
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    deadline = time.monotonic() + QUEUE_TIMEOUT
+    while True:
+        job = queue.get(job_id)
+        if job["status"] in ("done", "error"):
+            break
+        if time.monotonic() > deadline:
+            status_text.text("")
+            st.error(f"⚠️ Kurikulum belum selesai dalam {QUEUE_TIMEOUT} detik. Silakan coba lagi.")
+            st.stop()
+        
+        progress_bar.progress(job["progress"])
+        if job["status"] == "queued":
+            status_text.text("⏳ Menunggu worker yang tersedia...")
+        elif job["progress"] >= 75:
+            status_text.text("📝 Agent 4: Menyusun kurikulum final...")
+        elif job["progress"] >= 25:
+            status_text.text("🎥🌐 Agent 2 & 3: Mencari video dan mengumpulkan referensi web...")
         else:
-            return f"{120 + hash(video_type) % 80}K"
-    
-    def _generate_description(self, topic: str, video_type: str, level: str) -> str:
-        """Generate deskripsi video yang relevan"""
-        descriptions = {
-            "introduction": f"Pengenalan komprehensif {topic} untuk {level}. Cocok untuk pemula yang ingin memahami dasar-dasar.",
-            "basics": f"Pembelajaran fundamental {topic} dengan pendekatan step-by-step yang mudah diikuti.",
-            "intermediate": f"Panduan menengah {topic} dengan fokus pada implementasi praktis dan studi kasus nyata.",
-            "advanced": f"Teknik lanjutan {topic} untuk profesional yang ingin mendalami aspek kompleks.",
-            "practical": f"Aplikasi praktis {topic} dalam proyek nyata dengan contoh implementasi.",
-            "masterclass": f"Masterclass {topic} yang mencakup best practices dan optimization techniques."
-        }
-        
-        return descriptions.get(video_type, f"Video pembelajaran {topic} untuk level {level}")
+            status_text.text("🧠 Agent 1: Menganalisis kebutuhan kurikulum...")
+        time.sleep(POLL_INTERVAL)
     
-    def _calculate_relevance(self, video_type: str, requirements: Dict[str, Any]) -> float:
-        """Menghitung skor relevansi video dengan requirements"""
-        score = 0.5  # Base score
-        
-        level = requirements['level']
-        topic = requirements['topic'].lower()
+    if job["status"] == "error":
+        status_text.text("")
+        st.error(f"⚠️ Gagal menjalankan agent: {job['error']}")
+        st.stop()
+    
+    progress_bar.progress(100)
+    status_text.text("🎉 Selesai! Scroll ke bawah untuk melihat hasil.")
+    return job["result"]
+
+def _present(generation: Dict[str, Any], view: Optional["ResultsView"], started: float) -> Dict[str, Any]:
+    """Melengkapi tampilan hasil dan mencatat time-to-first-content"""
+    if view is None:
+        view = ResultsView(started)
+        render_results(generation, view)
+    else:
+        view.show_degraded(generation["curriculum"].get("degraded"))
+        view.show_export(generation)
+    
+    generation["timings"] = view.timings_summary()
+    view.show_timings(generation["timings"])
+    
+    # Rincian span hanya milik generasi yang sedang direkam, bukan salinan dari sesi lain
+    generation.pop("trace", None)
+    spans = tracer.recorded()
+    if spans is not None:
+        generation["trace"] = span_tree(spans)
+        view.show_trace(generation["trace"])
+    return generation
+
+def show_node_output(view: "ResultsView", event: NodeEvent):
+    """Merender output (atau item parsial) dari satu node graph ke placeholder-nya"""
+    if event.node == "reasoning":
+        view.show_objectives(event.output['learning_objectives'], event.output['competencies'])
+    elif event.node == "youtube" and (event.partial or event.resumed):
+        # Event final non-resumed hanya mengulang item yang sudah dirender
+        for video in ([event.output] if event.partial else event.output):
+            view.add_video(video)
+    elif event.node == "web" and (event.partial or event.resumed):
+        for ref in ([event.output] if event.partial else event.output):
+            view.add_reference(ref)
+    elif event.node == "composer":
+        view.show_curriculum(event.output)
+
+def show_stage_output(view: "ResultsView", stage: str, output: Any):
+    """Merender satu stage (iter_pipeline / reuse_similar) ke placeholder-nya"""
+    if stage == "requirements":
+        view.show_objectives(output['learning_objectives'], output['competencies'])
+    elif stage == "videos":
+        for video in output:
+            view.add_video(video)
+    elif stage == "references":
+        for ref in output:
+            view.add_reference(ref)
+    elif stage == "description":
+        view.stream_description(output)
+    elif stage == "curriculum":
+        view.show_curriculum(output)
+
+class ResultsView:
+    """Kerangka halaman hasil dengan placeholder yang diisi bertahap saat agent selesai"""
+    
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.first_content_ms: Optional[float] = None
+        self.video_count = 0
+        self.reference_count = 0
+        self.description = ["", ""]
         
-        # Boost score berdasarkan kesesuaian level
-        if level == "pemula" and video_type in ["introduction", "basics"]:
-            score += 0.3
-        elif level == "menengah" and video_type in ["intermediate", "practical"]:
-            score += 0.3
-        elif level == "lanjutan" and video_type in ["advanced", "masterclass"]:
-            score += 0.3
+        st.markdown("---")
         
-        # Boost untuk topik teknis
-        if any(tech in topic for tech in ["programming", "development", "machine learning", "data"]):
-            if video_type in ["practical", "implementation"]:
-                score += 0.2
+        # Display Results
+        st.markdown("## 📋 Hasil Kurikulum")
+        self.notice = st.empty()
         
-        return min(1.0, score)
-
-class WebAgent:
-    def __init__(self):
-        pass
-    
-    def _create_search_queries(self, requirements: Dict[str, Any]) -> List[str]:
-        """Membuat beberapa query pencarian yang efektif"""
-        topic = requirements['topic']
-        level = requirements['level']
+        # Curriculum Overview
+        col1, col2 = st.columns([2, 1])
+        self.overview = col1.empty()
+        self.objectives = col2.empty()
+        with self.overview.container():
+            st.info("📝 Deskripsi program sedang disusun...")
         
-        # Reasoning untuk membuat query yang beragam dan efektif
-        queries = []
+        st.markdown("---")
         
-        # Query 1: Panduan umum
-        queries.append(f"{topic} guide tutorial")
+        # Videos Section with reasoning info
+        st.markdown("## 🎥 Video Pembelajaran")
+        st.markdown("*Video dipilih berdasarkan AI reasoning untuk level dan durasi yang optimal*")
+        self.videos = st.container()
         
-        # Query 2: Best practices
-        queries.append(f"{topic} best practices tips")
+        st.markdown("---")
         
-        # Query 3: Dokumentasi dan referensi
-        queries.append(f"{topic} documentation reference")
+        # References Section with reasoning info
+        st.markdown("## 📚 Referensi Pembelajaran")
+        st.markdown("*Referensi dikurasi menggunakan multiple search queries dan AI reasoning*")
+        self.references = st.container()
         
-        # Query 4: Berdasarkan level
-        if level == "pemula":
-            queries.append(f"{topic} beginner introduction")
-        elif level == "menengah":
-            queries.append(f"{topic} intermediate examples")
+        self.export = st.container()
+        self.timings = st.empty()
+        self.trace = st.empty()
+    
+    def _mark_content(self):
+        if self.first_content_ms is None:
+            self.first_content_ms = (time.perf_counter() - self.started) * 1000
+    
+    def show_objectives(self, learning_objectives: List[str], competencies: List[str]):
+        with self.objectives.container():
+            st.markdown("#### 🎯 Objektif Pembelajaran")
+            for obj in learning_objectives:
+                st.markdown(f"• {obj}")
+            
+            st.markdown("#### 💡 Kompetensi yang Dicapai")
+            for comp in competencies:
+                st.markdown(f"• {comp}")
+        self._mark_content()
+    
+    def add_video(self, video: Dict[str, Any]):
+        with self.videos:
+            with st.expander(f"📹 {video['title']}", expanded=(self.video_count == 0)):
+                col1, col2 = st.columns([1, 2])
+                
+                with col1:
+                    st.image(video['thumbnail'], width=200)
+                    st.markdown(f"**⭐ Relevance Score:** {video.get('relevance_score', 0.8):.2f}/1.0")
+                
+                with col2:
+                    st.markdown(f"**📺 Channel:** {video['channel']}")
+                    st.markdown(f"**⏱️ Durasi:** {video['duration']}")
+                    st.markdown(f"**👀 Views:** {video['views']}")
+                    st.markdown(f"**📖 Deskripsi:** {video['description']}")
+                    st.markdown(f"[🔗 Tonton Video]({video['url']})")
+        self.video_count += 1
+        self._mark_content()
+    
+    def add_reference(self, ref: Dict[str, Any]):
+        with self.references:
+            with st.expander(f"📄 {ref['title']}", expanded=(self.reference_count == 0)):
+                col1, col2 = st.columns([2, 1])
+                
+                with col1:
+                    st.markdown(f"**📝 Type:** {ref['type']}")
+                    st.markdown(f"**🎯 Summary:** {ref['summary']}")
+                    st.markdown(f"[🔗 Baca Selengkapnya]({ref['url']})")
+                
+                with col2:
+                    st.markdown(f"**⭐ Relevance:** {ref.get('relevance_score', 0.8):.2f}/1.0")
+                    st.markdown(f"**🏷️ Site Type:** {ref.get('site_type', 'General')}")
+                    st.markdown(f"**📊 Depth:** {ref.get('estimated_depth', 'Moderate')}")
+                    if 'query_source' in ref:
+                        st.markdown(f"**🔍 Query:** `{ref['query_source']}`")
+        self.reference_count += 1
+        self._mark_content()
+    
+    def stream_description(self, chunk: Dict[str, Any]):
+        """Menambahkan satu potongan deskripsi dari composer ke placeholder overview"""
+        index = chunk["paragraph"]
+        if chunk["replace"]:
+            self.description[index] = chunk["text"]
         else:
-            queries.append(f"{topic} advanced techniques")
+            self.description[index] += chunk["text"]
         
-        return queries
+        with self.overview.container():
+            st.markdown("#### 📝 Deskripsi Program")
+            for i, para in enumerate(self.description, 1):
+                if para:
+                    st.markdown(f"**Paragraf {i}:**")
+                    st.markdown(para + (" ▌" if i - 1 == index else ""))
+        self._mark_content()
     
-    def scrape_references(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Mengumpulkan referensi dari web menggunakan reasoning"""
-        
-        try:
-            queries = self._create_search_queries(requirements)
-            all_references = []
+    def show_degraded(self, degraded: Optional[Dict[str, Any]]):
+        """Memberi tahu jalur degradasi yang melayani hasil ini (jika ada)"""
+        if not degraded:
+            return
+        message = DEGRADED_MODES[degraded["mode"]]
+        if degraded["mode"] == "template":
+            message += f" ({', '.join(degraded['stages'])})"
+        elif degraded["mode"] == "near_match":
+            message += f": {degraded['topic']} (kemiripan {degraded['similarity']:.0%})"
+        self.notice.warning(f"🐢 {message}. Generate ulang nanti untuk hasil lengkap.")
+    
+    def show_curriculum(self, curriculum: Dict[str, Any]):
+        with self.overview.container():
+            st.markdown(f"### {curriculum['title']}")
+            st.markdown(f"**Durasi:** {curriculum['duration']} | **Level:** {curriculum['level'].title()}")
             
-            for query in queries:
-                # Simulasi pencarian web (dalam implementasi nyata gunakan Google Search API)
-                refs = self._reason_web_content(requirements, query)
-                all_references.extend(refs)
+            st.markdown("#### 📝 Deskripsi Program")
+            for i, para in enumerate(curriculum['description'], 1):
+                st.markdown(f"**Paragraf {i}:**")
+                st.markdown(para)
+                st.markdown("")
+        self.show_objectives(curriculum['learning_objectives'], curriculum['competencies'])
+    
+    def show_export(self, generation: Dict[str, Any]):
+        topic = generation["topic"]
+        curriculum = generation["curriculum"]
+        
+        with self.export:
+            # Export Options
+            st.markdown("## 💾 Export Kurikulum")
             
-            # Reasoning untuk memilih referensi terbaik
-            best_references = self._select_best_references(all_references, requirements)
+            export_cols = st.columns(len(EXPORT_FORMATS) + 1)
             
-            return best_references[:4]  # Maksimal 4 referensi terbaik
+            # Render hanya saat diminta, di thread pool export; hasilnya disimpan per generasi
+            for col, (fmt, spec) in zip(export_cols, EXPORT_FORMATS.items()):
+                with col:
+                    state_key = f"export:{generation['id']}:{fmt}"
+                    future = st.session_state.get(state_key)
+                    if future is None and st.button(f"📄 Siapkan {spec.label}", key=f"prepare:{state_key}"):
+                        future = st.session_state[state_key] = get_export_engine().submit(curriculum, fmt)
+                    if future is None:
+                        continue
+                    
+                    try:
+                        with st.spinner(f"Merender {spec.label}..."):
+                            data = future.result(timeout=EXPORT_WAIT)
+                    except FuturesTimeout:
+                        st.caption(f"⏳ {spec.label} masih dirender")
+                        st.button("🔄 Cek lagi", key=f"poll:{state_key}")
+                        continue
+                    except Exception as e:
+                        del st.session_state[state_key]
+                        st.error(f"Export {spec.label} gagal: {e}")
+                        continue
+                    st.download_button(
+                        label=f"📁 Download {spec.label}",
+                        data=data,
+                        file_name=export_filename(topic, fmt),
+                        mime=spec.mime,
+                        key=f"download:{state_key}"
+                    )
             
-        except Exception as e:
-            st.error(f"Error scraping references: {str(e)}")
-            return []
-    
-    def _reason_web_content(self, requirements: Dict[str, Any], query: str) -> List[Dict[str, Any]]:
-        """Reasoning untuk menentukan jenis konten web yang relevan"""
-        topic = requirements['topic']
-        level = requirements['level']
-        
-        # Reasoning berdasarkan query untuk menentukan jenis konten
-        if "guide" in query or "tutorial" in query:
-            content_type = "Tutorial Guide"
-            site_type = "educational"
-        elif "best practices" in query or "tips" in query:
-            content_type = "Best Practices"
-            site_type = "blog"
-        elif "documentation" in query or "reference" in query:
-            content_type = "Documentation"
-            site_type = "official"
-        elif "beginner" in query or "introduction" in query:
-            content_type = "Beginner Guide"
-            site_type = "educational"
-        elif "advanced" in query:
-            content_type = "Advanced Tutorial"
-            site_type = "technical"
-        else:
-            content_type = "General Resource"
-            site_type = "mixed"
-        
-        # Generate konten berdasarkan reasoning
-        reference = {
-            "title": self._generate_title(topic, content_type, level),
-            "url": self._generate_url(topic, content_type, site_type),
-            "type": content_type,
-            "summary": self._generate_summary(topic, content_type, level),
-            "site_type": site_type,
-            "relevance_score": self._calculate_content_relevance(content_type, requirements),
-            "estimated_depth": self._estimate_content_depth(content_type, level),
-            "query_source": query
-        }
-        
-        return [reference]
-    
-    def _generate_title(self, topic: str, content_type: str, level: str) -> str:
-        """Generate judul yang realistis berdasarkan jenis konten"""
-        if content_type == "Tutorial Guide":
-            return f"Complete {topic} Tutorial for {level.title()} Developers"
-        elif content_type == "Best Practices":
-            return f"{topic} Best Practices and Common Pitfalls"
-        elif content_type == "Documentation":
-            return f"Official {topic} Documentation and API Reference"
-        elif content_type == "Beginner Guide":
-            return f"Getting Started with {topic}: A Beginner's Guide"
-        elif content_type == "Advanced Tutorial":
-            return f"Advanced {topic} Techniques and Optimization"
-        else:
-            return f"Comprehensive {topic} Resource Guide"
-    
-    def _generate_url(self, topic: str, content_type: str, site_type: str) -> str:
-        """Generate URL yang realistis berdasarkan jenis site"""
-        topic_slug = topic.lower().replace(' ', '-')
-        
-        if site_type == "official":
-            return f"https://docs.{topic_slug}.org/getting-started"
-        elif site_type == "educational":
-            return f"https://learn{topic_slug}.com/tutorials/complete-guide"
-        elif site_type == "blog":
-            return f"https://medium.com/@expert/mastering-{topic_slug}-best-practices"
-        elif site_type == "technical":
-            return f"https://dev.to/advanced-{topic_slug}-techniques"
-        else:
-            return f"https://www.{topic_slug}-resources.com/comprehensive-guide"
-    
-    def _generate_summary(self, topic: str, content_type: str, level: str) -> str:
-        """Generate summary yang informatif"""
-        summaries = {
-            "Tutorial Guide": f"Panduan komprehensif {topic} yang mencakup konsep fundamental hingga implementasi praktis. Dilengkapi dengan contoh kode dan studi kasus untuk level {level}.",
-            "Best Practices": f"Kumpulan best practices terpilih dalam penggunaan {topic}, termasuk tips optimasi, common pitfalls yang harus dihindari, dan rekomendasi dari para ahli industri.",
-            "Documentation": f"Dokumentasi resmi dan referensi API {topic} yang lengkap. Menyediakan spesifikasi teknis, parameter, dan contoh implementasi untuk pengembangan profesional.",
-            "Beginner Guide": f"Panduan pemula yang ramah untuk memulai perjalanan belajar {topic}. Dijelaskan dengan bahasa sederhana dan pendekatan step-by-step.",
-            "Advanced Tutorial": f"Tutorial lanjutan {topic} untuk profesional yang ingin mendalami teknik optimization, scalability, dan implementasi enterprise-level.",
-            "General Resource": f"Sumber daya komprehensif {topic} yang mencakup berbagai aspek pembelajaran dari dasar hingga lanjutan."
-        }
-        
-        return summaries.get(content_type, f"Sumber pembelajaran {topic} berkualitas tinggi untuk level {level}.")
-    
-    def _calculate_content_relevance(self, content_type: str, requirements: Dict[str, Any]) -> float:
-        """Menghitung skor relevansi konten"""
-        score = 0.5  # Base score
-        level = requirements['level']
-        format_prefs = requirements.get('format', [])
-        
-        # Boost berdasarkan level
-        if level == "pemula" and content_type in ["Beginner Guide", "Tutorial Guide"]:
-            score += 0.3
-        elif level == "menengah" and content_type in ["Tutorial Guide", "Best Practices"]:
-            score += 0.3
-        elif level == "lanjutan" and content_type in ["Advanced Tutorial", "Documentation"]:
-            score += 0.3
-        
-        # Boost berdasarkan format preference
-        if "teks" in format_prefs:
-            if content_type in ["Documentation", "Tutorial Guide"]:
-                score += 0.2
-        
-        return min(1.0, score)
-    
-    def _estimate_content_depth(self, content_type: str, level: str) -> str:
-        """Estimasi kedalaman konten"""
-        if content_type in ["Advanced Tutorial", "Documentation"]:
-            return "Deep"
-        elif content_type in ["Tutorial Guide", "Best Practices"]:
-            return "Moderate"
-        else:
-            return "Surface"
+            with export_cols[-1]:
+                address = st.text_input("Email tujuan", key=f"email:{generation['id']}", placeholder="nama@contoh.id")
+                if st.button("📧 Kirim Email", key=f"send:{generation['id']}"):
+                    if "@" not in address:
+                        st.warning("Masukkan alamat email yang valid")
+                    else:
+                        queue_curriculum_email(address.strip(), topic, curriculum)
+                        st.success("📧 Email masuk antrean pengiriman")
     
-    def _select_best_references(self, all_references: List[Dict], requirements: Dict[str, Any]) -> List[Dict]:
-        """Memilih referensi terbaik berdasarkan reasoning"""
-        
-        # Sort berdasarkan relevance score
-        all_references.sort(key=lambda x: x['relevance_score'], reverse=True)
-        
-        # Reasoning untuk diversity - hindari duplikasi jenis konten
-        selected = []
-        used_types = set()
-        
-        for ref in all_references:
-            if ref['type'] not in used_types or len(selected) < 2:
-                selected.append(ref)
-                used_types.add(ref['type'])
-            
-            if len(selected) >= 4:  # Maksimal 4 referensi
-                break
-        
-        # Pastikan ada minimal 3 referensi
-        while len(selected) < 3 and len(all_references) > len(selected):
-            for ref in all_references:
-                if ref not in selected:
-                    selected.append(ref)
-                    break
-        
-        return selected
-
-class CurriculumComposer:
-    def __init__(self):
-        pass
-    
-    def compose_curriculum(self, requirements: Dict[str, Any], videos: List[Dict], references: List[Dict]) -> Dict[str, Any]:
-        """Menyusun kurikulum final"""
-        time.sleep(1)  # Simulasi composition
-        
-        topic = requirements['topic']
-        level = requirements['level']
-        duration = requirements['duration']
-        
-        description_para1 = f"""
-        Kurikulum {topic} level {level} ini dirancang khusus untuk memberikan pemahaman komprehensif 
-        dalam waktu {duration} jam pembelajaran. Program ini menggabungkan teori fundamental dengan 
-        praktik langsung, memastikan peserta tidak hanya memahami konsep dasar tetapi juga mampu 
-        menerapkannya dalam skenario nyata. Setiap modul telah dikurasi dengan cermat untuk memastikan 
-        progres pembelajaran yang optimal.
-        """
-        
-        description_para2 = f"""
-        Melalui kombinasi video pembelajaran berkualitas tinggi dan referensi teks yang mendalam, 
-        kurikulum ini memberikan pengalaman belajar multi-modal yang efektif. Peserta akan dibimbing 
-        melalui {requirements['recommended_modules']} modul utama yang mencakup {', '.join(requirements['competencies'][:2])} 
-        dan berbagai aspek praktis lainnya. Setiap sesi dirancang untuk membangun pemahaman secara 
-        bertahap dan memberikan kesempatan untuk praktek langsung.
-        """
-        
+    def timings_summary(self) -> Dict[str, float]:
+        """Time-to-first-content dan total waktu render sejak tombol Generate diklik"""
+        total_ms = (time.perf_counter() - self.started) * 1000
         return {
-            "title": f"Kurikulum {topic} - Level {level.title()}",
-            "description": [description_para1.strip(), description_para2.strip()],
-            "duration": f"{duration} jam",
-            "level": level,
-            "learning_objectives": requirements['learning_objectives'],
-            "competencies": requirements['competencies'],
-            "videos": videos,
-            "references": references,
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "first_content_ms": round(self.first_content_ms if self.first_content_ms is not None else total_ms, 1),
+            "total_ms": round(total_ms, 1)
         }
+    
+    def show_timings(self, timings: Dict[str, float]):
+        self.timings.caption(
+            f"⏱️ Konten pertama tampil dalam {timings['first_content_ms']:.0f} ms · "
+            f"selesai dalam {timings['total_ms']:.0f} ms"
+        )
+
+    def show_trace(self, rows: List[Dict[str, Any]]):
+        """Panel rincian waktu per agent dari span tracing"""
+        with self.trace.container():
+            with st.expander("🧭 Rincian waktu per agent"):
+                for row in rows:
+                    tags = " · ".join(f"{key}={value}" for key, value in row["attributes"].items())
+                    indent = "&nbsp;" * 4 * row["depth"]
+                    line = f"{indent}`{row['name']}` — **{row['duration_ms']:.1f} ms**"
+                    if tags:
+                        line += f" · {tags}"
+                    if row["error"]:
+                        line += f" · ⚠️ {row['error']}"
+                    st.markdown(line)
+
+def render_results(generation: Dict[str, Any], view: Optional[ResultsView] = None):
+    """Menampilkan hasil generasi; dipanggil ulang di setiap rerun tanpa menghitung ulang"""
+    view = view or ResultsView()
+    curriculum = generation["curriculum"]
+    
+    view.show_curriculum(curriculum)
+    view.show_degraded(curriculum.get("degraded"))
+    for video in generation["videos"]:
+        view.add_video(video)
+    for ref in generation["references"]:
+        view.add_reference(ref)
+    view.show_export(generation)
+    
+    if "timings" in generation:
+        view.show_timings(generation["timings"])
+    if "trace" in generation:
+        view.show_trace(generation["trace"])
 
 # Streamlit App
+def show_bulk_export():
+    """ZIP berisi kurikulum tersimpan, ditulis streaming ke disk oleh pool export"""
+    fmt = st.selectbox("Format", list(EXPORT_FORMATS), format_func=lambda f: EXPORT_FORMATS[f].label, key="bulk_format")
+    path = os.path.join(BULK_EXPORT_DIR, f"kurikulum_{st.session_state.get('metrics_session_id', 'sesi')}_{fmt}.zip")
+    if st.button("📦 Siapkan ZIP", key="bulk_prepare"):
+        st.session_state["bulk_export"] = (fmt, get_export_engine().submit_bulk(
+            cached_items(get_curriculum_cache(), BULK_EXPORT_LIMIT), fmt, path
+        ))
+    
+    if "bulk_export" not in st.session_state:
+        return
+    bulk_fmt, future = st.session_state["bulk_export"]
+    if not future.done():
+        st.caption("⏳ ZIP sedang disiapkan")
+        st.button("🔄 Cek lagi", key="bulk_poll")
+    elif future.exception() is not None:
+        st.error(f"Export massal gagal: {future.exception()}")
+    else:
+        with open(future.result(), "rb") as f:
+            st.download_button(
+                label=f"⬇️ Download ZIP ({EXPORT_FORMATS[bulk_fmt].label})",
+                data=f,
+                file_name=f"kurikulum_{bulk_fmt}.zip",
+                mime="application/zip",
+                key="bulk_download"
+            )
+
 def main():
     st.set_page_config(
         page_title="Curriculum Generator",
@@ -424,6 +816,11 @@ def main():
         layout="wide"
     )
     
+    get_metrics_store()
+    metrics.touch_session(st.session_state.setdefault("metrics_session_id", uuid.uuid4().hex))
+    if PREFETCH_TOP_N > 0:
+        get_warmup_scheduler()
+    
     st.title("🎓 AI-Powered Curriculum Generator")
     st.markdown("*Powered by Gemini 2.0 Flash, LangChain & LangGraph*")
     
@@ -461,146 +858,32 @@ def main():
         with st.expander("🔧 API Configuration"):
             gemini_api_key = st.text_input("Gemini API Key", type="password")
             youtube_api_key = st.text_input("YouTube API Key", type="password")
-            
+        
+        show_trace = st.checkbox("🧭 Tampilkan rincian waktu agent", value=False)
+        
+        with st.expander("📦 Export Massal"):
+            show_bulk_export()
+        
         generate_button = st.button("🚀 Generate Curriculum", type="primary")
     
+    # Input berubah tanpa klik Generate: mulai stage awal di latar belakang
+    if topic and not generate_button:
+        speculate(topic, level, duration, format_type, gemini_api_key, youtube_api_key)
+    
     # Main content area
     if generate_button and topic:
-        # Initialize agents
-        reasoning_agent = ReasoningAgent(gemini_api_key)
-        youtube_agent = YouTubeAgent(youtube_api_key)
-        web_agent = WebAgent()
-        composer = CurriculumComposer()
-        
-        # Progress tracking
-        progress_container = st.container()
-        with progress_container:
-            st.markdown("### 🔄 Proses Generasi Kurikulum")
-            
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # Agent 1: Reasoning
-            status_text.text("🧠 Agent 1: Menganalisis kebutuhan kurikulum...")
-            requirements = reasoning_agent.analyze_requirements(topic, level, duration, format_type)
-            progress_bar.progress(25)
-            st.success("✅ Analisis kebutuhan selesai")
-            
-            # Agent 2: YouTube Search
-            status_text.text("🎥 Agent 2: Mencari video pembelajaran...")
-            videos = youtube_agent.search_videos(requirements)
-            progress_bar.progress(50)
-            st.success("✅ Video pembelajaran ditemukan")
-            
-            # Agent 3: Web Scraping
-            status_text.text("🌐 Agent 3: Mengumpulkan referensi web...")
-            references = web_agent.scrape_references(requirements)
-            progress_bar.progress(75)
-            st.success("✅ Referensi web terkumpul")
-            
-            # Agent 4: Composition
-            status_text.text("📝 Agent 4: Menyusun kurikulum final...")
-            curriculum = composer.compose_curriculum(requirements, videos, references)
-            progress_bar.progress(100)
-            st.success("✅ Kurikulum berhasil dibuat!")
-            
-            status_text.text("🎉 Selesai! Scroll ke bawah untuk melihat hasil.")
-        
-        st.markdown("---")
-        
-        # Display Results
-        st.markdown("## 📋 Hasil Kurikulum")
-        
-        # Curriculum Overview
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.markdown(f"### {curriculum['title']}")
-            st.markdown(f"**Durasi:** {curriculum['duration']} | **Level:** {curriculum['level'].title()}")
-            
-            st.markdown("#### 📝 Deskripsi Program")
-            for i, para in enumerate(curriculum['description'], 1):
-                st.markdown(f"**Paragraf {i}:**")
-                st.markdown(para)
-                st.markdown("")
-        
-        with col2:
-            st.markdown("#### 🎯 Objektif Pembelajaran")
-            for obj in curriculum['learning_objectives']:
-                st.markdown(f"• {obj}")
-            
-            st.markdown("#### 💡 Kompetensi yang Dicapai")
-            for comp in curriculum['competencies']:
-                st.markdown(f"• {comp}")
-        
-        st.markdown("---")
-        
-        # Videos Section with reasoning info
-        st.markdown("## 🎥 Video Pembelajaran")
-        st.markdown("*Video dipilih berdasarkan AI reasoning untuk level dan durasi yang optimal*")
-        
-        for i, video in enumerate(videos):
-            with st.expander(f"📹 {video['title']}", expanded=(i==0)):
-                col1, col2 = st.columns([1, 2])
-                
-                with col1:
-                    st.image(video['thumbnail'], width=200)
-                    st.markdown(f"**⭐ Relevance Score:** {video.get('relevance_score', 0.8):.2f}/1.0")
-                
-                with col2:
-                    st.markdown(f"**📺 Channel:** {video['channel']}")
-                    st.markdown(f"**⏱️ Durasi:** {video['duration']}")
-                    st.markdown(f"**👀 Views:** {video['views']}")
-                    st.markdown(f"**📖 Deskripsi:** {video['description']}")
-                    st.markdown(f"[🔗 Tonton Video]({video['url']})")
-        
-        st.markdown("---")
-        
-        # References Section with reasoning info
-        st.markdown("## 📚 Referensi Pembelajaran")
-        st.markdown("*Referensi dikurasi menggunakan multiple search queries dan AI reasoning*")
-        
-        for i, ref in enumerate(references):
-            with st.expander(f"📄 {ref['title']}", expanded=(i==0)):
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    st.markdown(f"**📝 Type:** {ref['type']}")
-                    st.markdown(f"**🎯 Summary:** {ref['summary']}")
-                    st.markdown(f"[🔗 Baca Selengkapnya]({ref['url']})")
-                
-                with col2:
-                    st.markdown(f"**⭐ Relevance:** {ref.get('relevance_score', 0.8):.2f}/1.0")
-                    st.markdown(f"**🏷️ Site Type:** {ref.get('site_type', 'General')}")
-                    st.markdown(f"**📊 Depth:** {ref.get('estimated_depth', 'Moderate')}")
-                    if 'query_source' in ref:
-                        st.markdown(f"**🔍 Query:** `{ref['query_source']}`")
-        
-        # Export Options
-        st.markdown("## 💾 Export Kurikulum")
-        
-        export_cols = st.columns(3)
-        
-        with export_cols[0]:
-            if st.button("📄 Export PDF"):
-                st.info("Fitur export PDF akan segera tersedia!")
-        
-        with export_cols[1]:
-            curriculum_json = json.dumps(curriculum, indent=2, ensure_ascii=False)
-            st.download_button(
-                label="📁 Download JSON",
-                data=curriculum_json,
-                file_name=f"curriculum_{topic.replace(' ', '_')}.json",
-                mime="application/json"
-            )
-        
-        with export_cols[2]:
-            if st.button("📧 Kirim Email"):
-                st.info("Fitur kirim email akan segera tersedia!")
+        with tracer.record() if show_trace else nullcontext():
+            with tracer.span("generate_results", topic=topic, level=level, duration=duration):
+                generation = generate_results(topic, level, duration, format_type, gemini_api_key, youtube_api_key)
+        # Simpan di session agar rerun (klik tombol export, expand video, dst.) tidak menghitung ulang
+        st.session_state["generation"] = generation
     
     elif generate_button and not topic:
         st.error("⚠️ Silakan masukkan topik pembelajaran terlebih dahulu!")
     
+    elif "generation" in st.session_state:
+        render_results(st.session_state["generation"])
+    
     else:
         # Landing page
         st.markdown("""
@@ -625,20 +908,28 @@ def main():
         **Mulai dengan mengisi form di sidebar →**
         """)
         
-        # Demo metrics
+        # Metrik operasional dari semua worker
+        values = metrics.read(get_metrics_store())
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Kurikulum Dibuat", "1,234", "↗️ 12%")
+            st.metric("Kurikulum Dibuat", f"{values.get('curricula_generated_total', 0):,.0f}")
         
         with col2:
-            st.metric("Video Terkurasi", "5,678", "↗️ 8%")
+            st.metric("Video Terkurasi", f"{values.get('videos_curated_total', 0):,.0f}")
         
         with col3:
-            st.metric("Referensi Terkumpul", "12,345", "↗️ 15%")
+            st.metric("Referensi Terkumpul", f"{values.get('references_collected_total', 0):,.0f}")
         
         with col4:
-            st.metric("Pengguna Aktif", "2,468", "↗️ 23%")
+            st.metric("Pengguna Aktif", f"{values.get('active_sessions', 0):,.0f}")
+        
+        cache_rate = hit_rate(values)
+        p95 = histogram_quantile(values, "pipeline_latency_seconds", 0.95)
+        st.caption(
+            f"Cache hit rate: {'-' if cache_rate is None else f'{cache_rate:.0%}'} · "
+            f"Latensi pipeline p95: {'-' if p95 is None else f'≤ {p95:g} detik'}"
+        )
 
 if __name__ == "__main__":
     main()
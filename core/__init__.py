@@ -0,0 +1,32 @@
+"""Komponen inti pipeline kurikulum yang tidak bergantung pada UI.
+
+Ekspor di bawah di-resolve secara lazy agar `import core` tetap murah;
+submodul (dan dependency-nya) baru dimuat saat atributnya dipakai.
+"""
+import importlib
+
+_EXPORTS = {
+    "ReasoningAgent": "core.agents",
+    "YouTubeAgent": "core.agents",
+    "WebAgent": "core.agents",
+    "CurriculumComposer": "core.agents",
+    "SimulatedBackend": "core.agents",
+    "CurriculumCache": "core.cache",
+    "make_cache_key": "core.cache",
+    "StageConfig": "core.memo",
+    "StageMemoizer": "core.memo",
+    "generate_curriculum": "core.pipeline",
+    "iter_pipeline": "core.pipeline",
+    "LoggingReporter": "core.reporting",
+    "Reporter": "core.reporting",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'core' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,233 @@
+"""Admission control, deadline per permintaan, dan tangga degradasi saat overload.
+
+Setiap klik Generate mendapat `Deadline` yang disimpan di contextvar sehingga
+keempat agent (termasuk task dalam `asyncio.gather`) melihat sisa waktu yang
+sama. Panggilan backend yang melewati deadline dibatalkan dan stage tersebut
+kembali ke reasoning template deterministik.
+
+`AdmissionController` membatasi jumlah pipeline yang berjalan bersamaan di
+satu proses. Permintaan yang menunggu dilayani bergiliran per sesi (round
+robin) sehingga satu sesi yang mengklik berulang kali tidak menyerobot sesi
+lain. Permintaan ditolak segera (load shedding) jika antrean penuh atau
+perkiraan waktu tunggunya sudah melewati deadline.
+
+Tangga degradasi dari yang paling ringan:
+    template     agent yang kehabisan waktu memakai `_reason_*` template
+    near_match   tidak mendapat slot: kurikulum tersimpan dengan topik mirip
+    busy         tidak ada yang bisa dipakai: respons "sedang sibuk" cepat
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, List, Any, Awaitable, Deque, Iterator, Optional
+
+from core.metrics import metrics
+
+# Batas waktu total (detik) satu permintaan dari klik sampai kurikulum tersedia
+REQUEST_DEADLINE = 30.0
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_MAX_WAITING = 16
+# Jumlah permintaan yang boleh menunggu per sesi
+DEFAULT_PER_SESSION = 1
+# Sisa waktu minimum agar pipeline masih layak dijalankan setelah menunggu slot
+MIN_PIPELINE_BUDGET = 5.0
+# Perkiraan awal lama satu pipeline sebelum ada pengukuran
+INITIAL_SERVICE_TIME = 10.0
+# Ambang kemiripan yang lebih longgar untuk jalur degradasi near_match. Di bawah
+# ~0.8 varian topik yang berbeda ikut cocok (React/React Native 0.69, Python 2/3
+# 0.67, Excel/Excel VBA 0.75), jadi jumlah kata inti topik juga harus sama.
+NEAR_MATCH_THRESHOLD = 0.8
+
+DEGRADED_MODES = {
+    "template": "Sebagian agent kehabisan waktu dan memakai hasil reasoning template",
+    "near_match": "Server sibuk: kurikulum diambil dari topik serupa yang tersimpan",
+    "busy": "Server sibuk dan belum ada kurikulum serupa yang tersimpan"
+}
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Sisa waktu permintaan habis sebelum panggilan backend selesai"""
+
+class Overloaded(Exception):
+    """Permintaan tidak mendapat slot eksekusi (antrean penuh, tunggu terlalu lama, dsb.)"""
+    
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+class Deadline:
+    """Batas waktu absolut satu permintaan beserta stage yang terdegradasi di dalamnya"""
+    
+    __slots__ = ("seconds", "expires_at", "degraded")
+    
+    def __init__(self, seconds: float = REQUEST_DEADLINE):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.degraded: List[str] = []
+    
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("request_deadline", default=None)
+
+@contextmanager
+def request_deadline(deadline: Deadline) -> Iterator[Deadline]:
+    """Mengaktifkan deadline untuk semua agent yang dipanggil di dalam blok ini"""
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+def current_deadline() -> Optional[Deadline]:
+    return _deadline.get()
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """Sisa waktu deadline aktif, dibatasi `default` jika diberikan"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    if default is None:
+        return deadline.remaining()
+    return min(default, deadline.remaining())
+
+def mark_degraded(stage: str) -> None:
+    """Mencatat bahwa `stage` memakai fallback template pada permintaan ini"""
+    deadline = _deadline.get()
+    if deadline is not None and stage not in deadline.degraded:
+        deadline.degraded.append(stage)
+
+def stage_degraded(stage: str) -> bool:
+    """True jika `stage` sudah memakai fallback template pada permintaan ini"""
+    deadline = _deadline.get()
+    return deadline is not None and stage in deadline.degraded
+
+async def within_deadline(awaitable: Awaitable[Any]) -> Any:
+    """Menunggu `awaitable` paling lama sampai deadline aktif; DeadlineExceeded jika lewat"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return await awaitable
+    
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded(f"Deadline {deadline.seconds:g} detik sudah lewat")
+    try:
+        return await asyncio.wait_for(awaitable, remaining)
+    except asyncio.TimeoutError as e:
+        if isinstance(e, DeadlineExceeded):
+            raise
+        raise DeadlineExceeded(f"Deadline {deadline.seconds:g} detik sudah lewat") from e
+
+class _Ticket:
+    __slots__ = ("session_id", "granted")
+    
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.granted = False
+
+class AdmissionController:
+    """Batas pipeline bersamaan per proses dengan antrean tunggu yang adil per sesi"""
+    
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        max_waiting: int = DEFAULT_MAX_WAITING,
+        per_session: int = DEFAULT_PER_SESSION
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.per_session = per_session
+        self.service_time = INITIAL_SERVICE_TIME  # EWMA lama satu pipeline (detik)
+        self._active = 0
+        self._waiting: "OrderedDict[str, Deque[_Ticket]]" = OrderedDict()
+        self._condition = threading.Condition()
+    
+    @contextmanager
+    def admit(self, session_id: str, timeout: float) -> Iterator[None]:
+        """Menunggu slot paling lama `timeout` detik; Overloaded jika permintaan ditolak"""
+        self._acquire(session_id, timeout)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started)
+    
+    def estimated_wait(self) -> float:
+        """Perkiraan waktu tunggu permintaan baru berdasarkan antrean dan lama pipeline"""
+        with self._condition:
+            return self._estimated_wait()
+    
+    def _estimated_wait(self) -> float:
+        if self._active < self.max_concurrent and not self._waiting:
+            return 0.0
+        waiting = sum(len(tickets) for tickets in self._waiting.values())
+        return (waiting // self.max_concurrent + 1) * self.service_time
+    
+    def _acquire(self, session_id: str, timeout: float) -> None:
+        with self._condition:
+            if self._active < self.max_concurrent and not self._waiting:
+                self._active += 1
+                metrics.inc("admission_requests_total", result="admitted")
+                return
+            
+            waiting = sum(len(tickets) for tickets in self._waiting.values())
+            if waiting >= self.max_waiting:
+                self._shed("queue_full", f"Antrean penuh ({waiting} permintaan menunggu)")
+            if len(self._waiting.get(session_id, ())) >= self.per_session:
+                self._shed("session_limit", "Sesi ini masih punya permintaan yang menunggu")
+            if self._estimated_wait() > timeout:
+                self._shed("deadline", f"Perkiraan tunggu {self._estimated_wait():.0f} detik melewati deadline")
+            
+            ticket = _Ticket(session_id)
+            self._waiting.setdefault(session_id, deque()).append(ticket)
+            expires_at = time.monotonic() + timeout
+            while not ticket.granted:
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    self._withdraw(ticket)
+                    self._shed("timeout", f"Tidak mendapat slot dalam {timeout:.0f} detik")
+                self._condition.wait(remaining)
+            metrics.inc("admission_requests_total", result="admitted")
+    
+    def _shed(self, reason: str, message: str) -> None:
+        metrics.inc("admission_requests_total", result=reason)
+        raise Overloaded(reason, message)
+    
+    def _withdraw(self, ticket: _Ticket) -> None:
+        tickets = self._waiting.get(ticket.session_id)
+        if tickets is not None:
+            tickets.remove(ticket)
+            if not tickets:
+                del self._waiting[ticket.session_id]
+    
+    def _release(self, elapsed: float) -> None:
+        with self._condition:
+            self._active -= 1
+            self.service_time = 0.8 * self.service_time + 0.2 * elapsed
+            # Round robin: sesi terdepan mendapat satu slot lalu pindah ke belakang
+            while self._active < self.max_concurrent and self._waiting:
+                session_id, tickets = next(iter(self._waiting.items()))
+                tickets.popleft().granted = True
+                self._active += 1
+                if tickets:
+                    self._waiting.move_to_end(session_id)
+                else:
+                    del self._waiting[session_id]
+            self._condition.notify_all()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "active": self._active,
+                "waiting": sum(len(tickets) for tickets in self._waiting.values()),
+                "sessions_waiting": len(self._waiting),
+                "service_time": round(self.service_time, 3)
+            }
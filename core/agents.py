@@ -0,0 +1,714 @@
+import asyncio
+import contextvars
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Any, AsyncIterator, Callable, Coroutine, Optional, Protocol, Tuple
+from urllib.parse import quote
+
+from core.admission import DeadlineExceeded, mark_degraded, remaining_time, within_deadline
+from core.catalog import VideoCatalog
+from core.fetch import parse_youtube_items
+from core.memo import StageMemoizer
+from core.scoring import score_references, score_videos, select_diverse, top_k
+from core.templates import CURRICULUM_LABELS, DESCRIPTION_PARAGRAPHS, get_registry, make_context
+from core.reporting import LoggingReporter, Reporter
+from core.tracing import traced, tracer
+
+if TYPE_CHECKING:
+    # html.parser baru dimuat saat halaman nyata diekstrak
+    from core.extract import PageExtractionPool
+
+# Batas waktu (detik) model menulis deskripsi kurikulum sebelum kembali ke template
+COMPOSE_TIMEOUT = 15.0
+# Jumlah kata per potongan saat teks template dialirkan ke UI
+TEMPLATE_CHUNK_WORDS = 8
+
+class AgentBackend(Protocol):
+    """Kontrak backend (Gemini, YouTube Data API, HTTP) yang dipanggil oleh agent secara async.
+
+    Backend model boleh menambahkan `stream(operation, payload)` berupa async
+    iterator teks; CurriculumComposer memakainya untuk mengalirkan deskripsi.
+    """
+    
+    async def call(self, operation: str, payload: Dict[str, Any]) -> Any:
+        ...
+
+class SimulatedBackend:
+    """Backend lokal yang hanya mensimulasikan latensi panggilan API tanpa memblokir event loop"""
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+    
+    async def call(self, operation: str, payload: Dict[str, Any]) -> Any:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return None
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Menjalankan coroutine agent dari kode sinkron (mis. script Streamlit)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    # Sudah ada event loop aktif di thread ini, jalankan di thread terpisah
+    # dengan context yang sama agar span tracing tetap bersarang
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(contextvars.copy_context().run, asyncio.run, coro).result()
+
+class BaseAgent:
+    """Dasar untuk semua agent: menyimpan backend async yang dapat diganti"""
+    
+    def __init__(
+        self,
+        backend: Optional[AgentBackend] = None,
+        memo: Optional[StageMemoizer] = None,
+        reporter: Optional[Reporter] = None,
+        locale: Optional[str] = None
+    ):
+        self.backend = backend or SimulatedBackend()
+        self.memo = memo
+        self.reporter = reporter or LoggingReporter()
+        # Template teks terkompilasi untuk locale ini (default: KURIKULUM_LOCALE)
+        self.templates = get_registry().localized(locale)
+    
+    async def _memoized(self, stage: str, key: Any, compute: Callable[[], Coroutine[Any, Any, Any]]) -> Any:
+        """Menjalankan stage lewat memo bila tersedia, dan menandai hit/miss di span aktif"""
+        if self.memo is None:
+            return await compute()
+        
+        hit = True
+        
+        async def tracked() -> Any:
+            nonlocal hit
+            hit = False
+            return await compute()
+        
+        value = await self.memo.memoize_async(stage, key, tracked)
+        tracer.current().set(f"cache.{stage}", "hit" if hit else "miss")
+        return value
+    
+    async def _call(self, operation: str, payload: Dict[str, Any]) -> Any:
+        """Panggilan backend yang dihitung sebagai outbound call pada span aktif.
+
+        Dibatasi deadline permintaan aktif (jika ada); DeadlineExceeded jika lewat.
+        """
+        tracer.current().add("outbound_calls")
+        with tracer.span(f"backend.{operation}", backend=type(self.backend).__name__):
+            return await within_deadline(self.backend.call(operation, payload))
+
+class ReasoningAgent(BaseAgent):
+    def __init__(
+        self,
+        api_key: str,
+        backend: Optional[AgentBackend] = None,
+        memo: Optional[StageMemoizer] = None,
+        reporter: Optional[Reporter] = None,
+        locale: Optional[str] = None
+    ):
+        super().__init__(backend or SimulatedBackend(latency=2), memo, reporter, locale)
+        self.api_key = api_key
+    
+    def analyze_requirements(self, topic: str, level: str, duration: int, format_type: str) -> Dict[str, Any]:
+        """Menganalisis kebutuhan kurikulum berdasarkan input pengguna"""
+        return run_sync(self.analyze(topic, level, duration, format_type))
+    
+    @traced("ReasoningAgent.analyze_requirements")
+    async def analyze(self, topic: str, level: str, duration: int, format_type: str) -> Dict[str, Any]:
+        """Versi async dari analyze_requirements"""
+        # Kompetensi dan objektif hanya bergantung pada (topic, level)
+        analysis = await self._memoized(
+            "competencies",
+            (topic, level),
+            lambda: self._analyze_competencies(topic, level)
+        )
+        
+        return {
+            "topic": topic,
+            "level": level,
+            "duration": duration,
+            "format": format_type,
+            "competencies": list(analysis["competencies"]),
+            "learning_objectives": list(analysis["learning_objectives"]),
+            "recommended_modules": self._recommended_modules(duration)
+        }
+    
+    def adapt_requirements(
+        self,
+        previous: Dict[str, Any],
+        topic: str,
+        level: str,
+        duration: int,
+        format_type: str
+    ) -> Dict[str, Any]:
+        """Menyusun requirements dari kurikulum topik serupa tanpa memanggil model"""
+        return {
+            "topic": topic,
+            "level": level,
+            "duration": duration,
+            "format": format_type,
+            "competencies": list(previous["competencies"]),
+            "learning_objectives": list(previous["learning_objectives"]),
+            "recommended_modules": self._recommended_modules(duration)
+        }
+    
+    def _recommended_modules(self, duration: int) -> int:
+        return duration // 2 if duration > 4 else 2
+    
+    async def _analyze_competencies(self, topic: str, level: str) -> Dict[str, List[str]]:
+        """Menentukan kompetensi dan objektif pembelajaran untuk topik dan level"""
+        # Simulasi pemrosesan dengan Gemini 2.0 Flash
+        try:
+            await self._call("analyze", {"topic": topic, "level": level})
+        except DeadlineExceeded:
+            # Kompetensi per level sudah deterministik; lanjut tanpa jawaban model
+            mark_degraded("requirements")
+        
+        competencies = {
+            "pemula": ["Pemahaman dasar", "Pengenalan konsep", "Praktik sederhana"],
+            "menengah": ["Penerapan teori", "Analisis kasus", "Project menengah"],
+            "lanjutan": ["Analisis mendalam", "Optimisasi", "Project kompleks"]
+        }
+        
+        return {
+            "competencies": competencies.get(level, competencies["pemula"]),
+            "learning_objectives": [
+                f"Memahami konsep dasar {topic}",
+                f"Mampu menerapkan {topic} dalam konteks {level}",
+                f"Menguasai tools dan teknik {topic}"
+            ]
+        }
+
+class YouTubeAgent(BaseAgent):
+    def __init__(
+        self,
+        api_key: str = None,
+        backend: Optional[AgentBackend] = None,
+        memo: Optional[StageMemoizer] = None,
+        reporter: Optional[Reporter] = None,
+        catalog: Optional[VideoCatalog] = None,
+        locale: Optional[str] = None
+    ):
+        super().__init__(backend, memo, reporter, locale)
+        self.api_key = api_key
+        self.catalog = catalog
+    
+    def _create_search_query(self, requirements: Dict[str, Any]) -> str:
+        """Membuat query pencarian yang optimal"""
+        topic = requirements['topic']
+        level = requirements['level']
+        
+        # Reasoning untuk membuat query yang efektif
+        if level == "pemula":
+            query = f"{topic} tutorial beginners"
+        elif level == "menengah":
+            query = f"{topic} intermediate guide"
+        else:
+            query = f"{topic} advanced masterclass"
+        
+        return query
+    
+    def search_videos(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Mencari video YouTube yang relevan menggunakan web search"""
+        return run_sync(self.search(requirements))
+    
+    @traced("YouTubeAgent.search_videos")
+    async def search(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Versi async dari search_videos; dijawab dari katalog video lokal bila tersedia"""
+        if self.catalog is None:
+            return await self._search_videos(requirements)
+        
+        found = self.catalog.lookup(requirements['topic'], requirements['level'], requirements['duration'])
+        tracer.current().set("cache.catalog", "miss" if found is None else "stale" if found.stale else "hit")
+        if found is not None:
+            if found.stale:
+                self.catalog.refresh_later(requirements, lambda: self._backend_videos(requirements))
+            return found.videos
+        
+        videos, from_backend = await self._fetch_videos(requirements)
+        # Hanya hasil backend pencarian nyata yang masuk katalog. Video template
+        # (tanpa API key atau karena deadline) akan menutupi API sampai basi.
+        if videos and from_backend:
+            self.catalog.add(videos, requirements)
+        return videos
+    
+    async def _backend_videos(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Video dari backend pencarian nyata saja; kosong jika pencarian jatuh ke template"""
+        videos, from_backend = await self._fetch_videos(requirements)
+        return videos if from_backend else []
+    
+    async def _search_videos(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Pencarian video lewat backend (atau reasoning template) tanpa katalog"""
+        videos, _ = await self._fetch_videos(requirements)
+        return videos
+    
+    async def _fetch_videos(self, requirements: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], bool]:
+        """(videos, from_backend): from_backend False jika video dibuat reasoning template"""
+        query = self._create_search_query(requirements)
+        
+        try:
+            # Menggunakan web search untuk mencari video YouTube
+            # Search query untuk YouTube
+            search_query = f"site:youtube.com {query}"
+            try:
+                results = await self._memoized(
+                    "video_search",
+                    search_query,
+                    lambda: self._call("search", {"query": search_query})
+                )
+            except DeadlineExceeded:
+                # Waktu permintaan habis: jatuh ke reasoning template di bawah
+                mark_degraded("videos")
+                results = None
+            
+            if results:
+                # Backend nyata (YouTube Data API) mengembalikan item hasil pencarian
+                return self._videos_from_search(results, requirements), True
+            
+            # Simulasi web search (dalam implementasi nyata, gunakan Google Search API)
+            # Untuk demo, kita buat reasoning berdasarkan topic dan level
+            return self._reason_video_selection(requirements, query), False
+            
+        except Exception as e:
+            self.reporter.error(f"Error searching videos: {str(e)}")
+            return [], False
+    
+    async def iter_search(self, requirements: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Menghasilkan video satu per satu sesuai urutan relevansi untuk rendering bertahap"""
+        # Ranking butuh semua kandidat, jadi item tersedia setelah seleksi selesai
+        for video in await self.search(requirements):
+            yield video
+    
+    def _reason_video_selection(self, requirements: Dict[str, Any], query: str) -> List[Dict[str, Any]]:
+        """Reasoning untuk memilih video yang tepat berdasarkan requirements"""
+        topic = requirements['topic']
+        level = requirements['level']
+        duration = requirements['duration']
+        
+        # Reasoning untuk menentukan jenis video yang dibutuhkan
+        video_types = []
+        
+        if level == "pemula":
+            video_types = ["introduction", "basics", "getting started", "fundamentals"]
+        elif level == "menengah":
+            video_types = ["intermediate", "practical", "implementation", "projects"]
+        else:
+            video_types = ["advanced", "masterclass", "expert", "optimization"]
+        
+        # Reasoning untuk durasi video yang optimal
+        if duration <= 4:
+            preferred_duration = "short tutorial"
+        elif duration <= 12:
+            preferred_duration = "comprehensive guide"
+        else:
+            preferred_duration = "complete course"
+        
+        # Generate video list berdasarkan reasoning
+        video_types = video_types[:3]  # Maksimal 3 video
+        scores = score_videos(video_types, requirements)
+        descriptions = self.templates.render_batch(
+            tuple(("video.description", video_type) for video_type in video_types), level, make_context(requirements)
+        )
+        videos = []
+        for i, video_type in enumerate(video_types):
+            video = {
+                "title": f"{topic.title()} {video_type.title()} - {preferred_duration.title()}",
+                "channel": self._generate_channel_name(topic, video_type),
+                "duration": self._estimate_duration(video_type, duration),
+                "views": self._estimate_views(video_type),
+                "url": f"https://youtube.com/search?q={quote(f'{topic} {video_type}')}",
+                "thumbnail": f"https://img.youtube.com/vi/placeholder/maxresdefault.jpg",
+                "description": descriptions[i],
+                "relevance_score": float(scores[i])
+            }
+            videos.append(video)
+        
+        # Urutkan berdasarkan relevance score
+        return [videos[i] for i in top_k(scores, len(videos))]
+    
+    def _videos_from_search(self, items: List[Dict[str, Any]], requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Mengubah hasil YouTube Data API menjadi format video yang dipakai UI"""
+        videos = []
+        for rank, (video_id, snippet) in enumerate(parse_youtube_items(items)[:3]):
+            thumbnails = snippet.get("thumbnails", {})
+            thumbnail = (thumbnails.get("high") or thumbnails.get("default") or {}).get("url", "")
+            videos.append({
+                "title": snippet.get("title", ""),
+                "channel": snippet.get("channelTitle", ""),
+                "duration": "-",
+                "views": "-",
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+                "thumbnail": thumbnail,
+                "description": snippet.get("description", ""),
+                # Urutan dari API sudah berdasarkan relevansi
+                "relevance_score": round(max(0.5, 1.0 - 0.1 * rank), 2)
+            })
+        return videos
+    
+    def _generate_channel_name(self, topic: str, video_type: str) -> str:
+        """Generate nama channel yang realistis"""
+        if "basic" in video_type or "introduction" in video_type:
+            return f"{topic.split()[0]} Academy"
+        elif "advanced" in video_type or "expert" in video_type:
+            return f"Pro {topic.split()[0]}"
+        else:
+            return f"{topic.title()} Hub"
+    
+    def _estimate_duration(self, video_type: str, total_duration: int) -> str:
+        """Estimasi durasi video berdasarkan jenis"""
+        if "introduction" in video_type:
+            minutes = min(15, total_duration * 15)
+        elif "advanced" in video_type:
+            minutes = min(45, total_duration * 25)
+        else:
+            minutes = min(30, total_duration * 20)
+        
+        return f"{minutes}:{minutes % 60:02d}"
+    
+    def _estimate_views(self, video_type: str) -> str:
+        """Estimasi jumlah views berdasarkan jenis video"""
+        if "basic" in video_type:
+            return f"{150 + hash(video_type) % 100}K"
+        elif "advanced" in video_type:
+            return f"{80 + hash(video_type) % 50}K"
+        else:
+            return f"{120 + hash(video_type) % 80}K"
+
+class WebAgent(BaseAgent):
+    def __init__(
+        self,
+        backend: Optional[AgentBackend] = None,
+        memo: Optional[StageMemoizer] = None,
+        reporter: Optional[Reporter] = None,
+        extractor: Optional["PageExtractionPool"] = None,
+        locale: Optional[str] = None
+    ):
+        super().__init__(backend, memo, reporter, locale)
+        self.extractor = extractor
+    
+    def _create_search_queries(self, requirements: Dict[str, Any]) -> List[str]:
+        """Membuat beberapa query pencarian yang efektif"""
+        topic = requirements['topic']
+        level = requirements['level']
+        
+        # Reasoning untuk membuat query yang beragam dan efektif
+        queries = []
+        
+        # Query 1: Panduan umum
+        queries.append(f"{topic} guide tutorial")
+        
+        # Query 2: Best practices
+        queries.append(f"{topic} best practices tips")
+        
+        # Query 3: Dokumentasi dan referensi
+        queries.append(f"{topic} documentation reference")
+        
+        # Query 4: Berdasarkan level
+        if level == "pemula":
+            queries.append(f"{topic} beginner introduction")
+        elif level == "menengah":
+            queries.append(f"{topic} intermediate examples")
+        else:
+            queries.append(f"{topic} advanced techniques")
+        
+        return queries
+    
+    def scrape_references(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Mengumpulkan referensi dari web menggunakan reasoning"""
+        return run_sync(self.scrape(requirements))
+    
+    @traced("WebAgent.scrape_references")
+    async def scrape(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Versi async dari scrape_references, semua query dijalankan bersamaan"""
+        
+        try:
+            queries = self._create_search_queries(requirements)
+            all_references = []
+            
+            async def fetch(query: str) -> List[Dict[str, Any]]:
+                with tracer.span("WebAgent._reason_web_content", query=query) as span:
+                    # Simulasi pencarian web (dalam implementasi nyata gunakan Google Search API)
+                    try:
+                        pages = await self._memoized(
+                            "web_content",
+                            query,
+                            lambda: self._call("scrape", {"query": query})
+                        )
+                    except DeadlineExceeded:
+                        mark_degraded("references")
+                        pages = None
+                    if pages:
+                        # Backend nyata mengembalikan halaman kandidat: [{"url": ..., "content": bytes}]
+                        span.set("pages", len(pages))
+                        return await self._extract_web_content(requirements, query, pages)
+                    return self._reason_web_content(requirements, query)
+            
+            for refs in await asyncio.gather(*(fetch(query) for query in queries)):
+                all_references.extend(refs)
+            
+            # Reasoning untuk memilih referensi terbaik
+            best_references = self._select_best_references(all_references, requirements)
+            
+            return best_references[:4]  # Maksimal 4 referensi terbaik
+            
+        except Exception as e:
+            self.reporter.error(f"Error scraping references: {str(e)}")
+            return []
+    
+    async def iter_scrape(self, requirements: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Menghasilkan referensi terpilih satu per satu untuk rendering bertahap"""
+        # Seleksi diversity butuh semua kandidat, jadi item tersedia setelah seleksi selesai
+        for reference in await self.scrape(requirements):
+            yield reference
+    
+    async def _extract_web_content(
+        self,
+        requirements: Dict[str, Any],
+        query: str,
+        pages: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Membuat referensi dari halaman nyata dengan ekstraksi streaming"""
+        content_type, _ = self._classify_query(query)
+        
+        if self.extractor is not None:
+            extracted = await self.extractor.extract_many([(page["content"], page["url"]) for page in pages])
+        else:
+            from core.extract import extract_page
+            
+            extracted = [extract_page(page["content"], page["url"]) for page in pages]
+        
+        return [
+            {
+                "title": page["title"],
+                "url": page["url"],
+                "type": content_type,
+                "summary": page["summary"],
+                "site_type": page["site_type"],
+                "estimated_depth": page["estimated_depth"],
+                "query_source": query
+            }
+            for page in extracted
+        ]
+    
+    def _classify_query(self, query: str) -> Tuple[str, str]:
+        """Menentukan (content_type, site_type) yang diharapkan dari sebuah query"""
+        if "guide" in query or "tutorial" in query:
+            content_type = "Tutorial Guide"
+            site_type = "educational"
+        elif "best practices" in query or "tips" in query:
+            content_type = "Best Practices"
+            site_type = "blog"
+        elif "documentation" in query or "reference" in query:
+            content_type = "Documentation"
+            site_type = "official"
+        elif "beginner" in query or "introduction" in query:
+            content_type = "Beginner Guide"
+            site_type = "educational"
+        elif "advanced" in query:
+            content_type = "Advanced Tutorial"
+            site_type = "technical"
+        else:
+            content_type = "General Resource"
+            site_type = "mixed"
+        
+        return content_type, site_type
+    
+    def _reason_web_content(self, requirements: Dict[str, Any], query: str) -> List[Dict[str, Any]]:
+        """Reasoning untuk menentukan jenis konten web yang relevan"""
+        level = requirements['level']
+        
+        # Reasoning berdasarkan query untuk menentukan jenis konten
+        content_type, site_type = self._classify_query(query)
+        
+        # Generate konten berdasarkan reasoning
+        title, url, summary = self.templates.render_batch(
+            (("reference.title", content_type), ("reference.url", site_type), ("reference.summary", content_type)),
+            level, make_context(requirements)
+        )
+        reference = {
+            "title": title,
+            "url": url,
+            "type": content_type,
+            "summary": summary,
+            "site_type": site_type,
+            "estimated_depth": self._estimate_content_depth(content_type, level),
+            "query_source": query
+        }
+        
+        return [reference]
+    
+    def _estimate_content_depth(self, content_type: str, level: str) -> str:
+        """Estimasi kedalaman konten"""
+        if content_type in ["Advanced Tutorial", "Documentation"]:
+            return "Deep"
+        elif content_type in ["Tutorial Guide", "Best Practices"]:
+            return "Moderate"
+        else:
+            return "Surface"
+    
+    def _select_best_references(self, all_references: List[Dict], requirements: Dict[str, Any]) -> List[Dict]:
+        """Memberi skor semua kandidat dalam satu pass lalu memilih referensi terbaik"""
+        types = [ref['type'] for ref in all_references]
+        scores = score_references(types, requirements).tolist()
+        
+        # Reasoning untuk diversity - hindari duplikasi jenis konten,
+        # maksimal 4 referensi dan minimal 3 bila kandidat mencukupi
+        selected = select_diverse(scores, types, limit=4, free_slots=2, minimum=3)
+        
+        return [{**all_references[i], "relevance_score": scores[i]} for i in selected]
+
+class CurriculumComposer(BaseAgent):
+    """Menyusun kurikulum final; deskripsi program dapat dialirkan potongan demi potongan.
+
+    Jika backend menyediakan `stream(operation, payload)` (async iterator teks),
+    deskripsi diambil dari sana dengan paragraf dipisah baris kosong. Backend
+    tanpa `stream` dipanggil lewat `call("compose", ...)`. Paragraf yang tidak
+    selesai dalam `timeout` detik, atau tidak ditulis oleh model sama sekali,
+    diisi dengan teks template sehingga latensi ekor tetap terbatas.
+    """
+    
+    def __init__(
+        self,
+        backend: Optional[AgentBackend] = None,
+        reporter: Optional[Reporter] = None,
+        timeout: float = COMPOSE_TIMEOUT,
+        locale: Optional[str] = None
+    ):
+        super().__init__(backend or SimulatedBackend(latency=1), reporter=reporter, locale=locale)
+        self.timeout = timeout
+    
+    def compose_curriculum(
+        self,
+        requirements: Dict[str, Any],
+        videos: List[Dict],
+        references: List[Dict],
+        on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Menyusun kurikulum final"""
+        return run_sync(self.compose(requirements, videos, references, on_chunk))
+    
+    async def compose(
+        self,
+        requirements: Dict[str, Any],
+        videos: List[Dict],
+        references: List[Dict],
+        on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Versi async dari compose_curriculum; `on_chunk` menerima setiap potongan deskripsi"""
+        curriculum = None
+        async for stage, output in self.iter_compose(requirements, videos, references):
+            if stage == "description":
+                if on_chunk is not None:
+                    on_chunk(output)
+            else:
+                curriculum = output
+        return curriculum
+    
+    @traced("CurriculumComposer.compose_curriculum")
+    async def iter_compose(
+        self,
+        requirements: Dict[str, Any],
+        videos: List[Dict],
+        references: List[Dict]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Menghasilkan ("description", potongan) selama deskripsi ditulis, lalu ("curriculum", kurikulum)"""
+        paragraphs = ["", ""]
+        async for chunk in self.stream_description(requirements):
+            if chunk["replace"]:
+                paragraphs[chunk["paragraph"]] = chunk["text"]
+            else:
+                paragraphs[chunk["paragraph"]] += chunk["text"]
+            yield "description", chunk
+        
+        level = requirements['level']
+        title, duration = self.templates.render_batch(CURRICULUM_LABELS, level, make_context(requirements))
+        
+        yield "curriculum", {
+            "title": title,
+            "description": [para.strip() for para in paragraphs],
+            "duration": duration,
+            "level": level,
+            "learning_objectives": requirements['learning_objectives'],
+            "competencies": requirements['competencies'],
+            "videos": videos,
+            "references": references,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    
+    async def stream_description(self, requirements: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Potongan deskripsi {"paragraph", "text", "replace"} sesuai urutan tulis.
+
+        `replace` True berarti teks paragraf yang sudah diterima harus diganti
+        (model timeout di tengah paragraf dan template dipakai sebagai gantinya).
+        """
+        loop = asyncio.get_running_loop()
+        # Batas composer tidak boleh melewati deadline permintaan
+        timeout = remaining_time(self.timeout)
+        deadline = loop.time() + timeout
+        written = ["", ""]
+        paragraph = 0
+        
+        model = self._model_description(requirements)
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                try:
+                    text = await asyncio.wait_for(model.__anext__(), remaining)
+                except StopAsyncIteration:
+                    break
+                
+                for i, piece in enumerate(text.split("\n\n")):
+                    if i > 0:
+                        if paragraph < len(written) - 1 and written[paragraph].strip():
+                            paragraph += 1
+                        else:
+                            piece = "\n\n" + piece
+                    if piece:
+                        written[paragraph] += piece
+                        yield {"paragraph": paragraph, "text": piece, "replace": False}
+            # Paragraf terakhir yang ditulis model dianggap selesai
+            complete = paragraph + 1 if written[paragraph].strip() else paragraph
+        except asyncio.TimeoutError:
+            self.reporter.warning(
+                f"Model tidak selesai menulis deskripsi dalam {timeout:g} detik, memakai template"
+            )
+            tracer.current().set("description.timeout", True)
+            mark_degraded("description")
+            complete = paragraph
+        finally:
+            await model.aclose()
+        
+        templates = self._description_templates(requirements)
+        tracer.current().set("description.template_paragraphs", len(templates) - complete)
+        for index in range(complete, len(templates)):
+            replace = bool(written[index])
+            for words in _word_chunks(templates[index], TEMPLATE_CHUNK_WORDS):
+                yield {"paragraph": index, "text": words, "replace": replace}
+                replace = False
+    
+    async def _model_description(self, requirements: Dict[str, Any]) -> AsyncIterator[str]:
+        """Teks deskripsi dari backend; kosong jika backend tidak menulis apa pun"""
+        payload = {"requirements": requirements}
+        stream = getattr(self.backend, "stream", None)
+        if stream is None:
+            result = await self._call("compose", payload)  # Simulasi composition
+            if isinstance(result, str) and result:
+                yield result
+            return
+        
+        tracer.current().add("outbound_calls")
+        async for text in stream("compose", payload):
+            if text:
+                yield text
+    
+    def _description_templates(self, requirements: Dict[str, Any]) -> List[str]:
+        """Dua paragraf deskripsi template, dipakai saat model tidak tersedia atau timeout"""
+        return self.templates.render_batch(DESCRIPTION_PARAGRAPHS, requirements['level'], make_context(requirements))
+
+def _word_chunks(text: str, size: int) -> List[str]:
+    """Memotong teks per `size` kata tanpa mengubah spasi, sehingga gabungannya identik"""
+    words = re.findall(r"\S+\s*", text)
+    return ["".join(words[i:i + size]) for i in range(0, len(words), size)]
@@ -0,0 +1,257 @@
+"""Runner headless untuk membuat kurikulum dari katalog topik (CSV / JSONL).
+
+Contoh:
+    python -m core.batch topics.csv -o curricula.jsonl --workers 32
+
+Output JSONL sekaligus menjadi checkpoint: menjalankan ulang perintah yang sama
+setelah crash hanya memproses baris yang belum berstatus "ok".
+"""
+import asyncio
+import csv
+import json
+import math
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Dict, List, Any, Iterator, Optional, Set
+
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer, SimulatedBackend
+from core.cache import CurriculumCache, make_cache_key
+from core.catalog import VideoCatalog
+from core.memo import StageMemoizer
+from core.pipeline import generate_curriculum
+from core.records import LEVELS
+from core.semantic import SemanticIndex
+from core.tracing import tracer
+
+if TYPE_CHECKING:
+    # html.parser baru dimuat saat runner dibuat, bukan saat modul di-import
+    from core.extract import PageExtractionPool
+
+DEFAULT_FORMATS = ["video", "teks"]
+
+def _parse_formats(value: Any) -> List[str]:
+    """Format boleh berupa list (JSONL) atau string dipisah ';', '|' atau ','"""
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    if not value:
+        return list(DEFAULT_FORMATS)
+    for separator in (";", "|", ","):
+        if separator in value:
+            return [item.strip() for item in value.split(separator) if item.strip()]
+    return [value.strip()]
+
+def _normalize_job(index: int, row: Dict[str, Any]) -> Dict[str, Any]:
+    topic = str(row.get("topic", "")).strip()
+    if not topic:
+        raise ValueError(f"baris {index}: topic kosong")
+    
+    level = str(row.get("level") or "pemula").strip().lower()
+    if level not in LEVELS:
+        raise ValueError(f"baris {index}: level harus salah satu dari {list(LEVELS)}")
+    try:
+        duration = int(row.get("duration") or 8)
+    except (TypeError, ValueError):
+        raise ValueError(f"baris {index}: duration bukan angka: {row.get('duration')!r}") from None
+    
+    job = {
+        "topic": topic,
+        "level": level,
+        "duration": duration,
+        "formats": _parse_formats(row.get("formats", row.get("format")))
+    }
+    # ID stabil antar run: posisi baris + input ternormalisasi
+    job["id"] = f"{index}:{make_cache_key(job['topic'], job['level'], job['duration'], job['formats'])}"
+    return job
+
+def read_jobs(path: str) -> Iterator[Dict[str, Any]]:
+    """Membaca job dari file CSV atau JSONL secara streaming.
+    
+    Baris yang tidak valid tidak menghentikan batch: baris itu menjadi job
+    dengan key "error" yang dicatat runner sebagai record berstatus "error".
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            rows = (line for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        
+        for index, row in enumerate(rows):
+            try:
+                if isinstance(row, str):
+                    row = json.loads(row)
+                    if not isinstance(row, dict):
+                        raise ValueError(f"baris {index}: bukan objek JSON")
+                yield _normalize_job(index, row)
+            except ValueError as e:
+                # json.JSONDecodeError juga turunan ValueError
+                yield {"id": f"{index}:invalid", "input": row, "error": str(e)}
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """Mengambil ID job yang sudah sukses dari file output sebelumnya"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Baris terakhir bisa terpotong saat crash
+                continue
+            if record.get("status") == "ok":
+                done.add(record["id"])
+    return done
+
+def percentile(values: List[float], pct: float) -> float:
+    """Persentil nearest-rank"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Rank ke-ceil(p/100 * n), berbasis 1; dikali dulu agar 7/100 * 100 tidak menjadi 7.000...1
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct * len(ordered) / 100) - 1))
+    return ordered[rank]
+
+class BatchRunner:
+    """Menjalankan pipeline untuk banyak job dengan jumlah worker terbatas"""
+    
+    def __init__(
+        self,
+        workers: int = 16,
+        cache: Optional[CurriculumCache] = None,
+        memo: Optional[StageMemoizer] = None,
+        backend_latency: Optional[float] = None,
+        semantic_index: Optional[SemanticIndex] = None,
+        catalog: Optional[VideoCatalog] = None,
+        extractor: Optional["PageExtractionPool"] = None
+    ):
+        self.workers = workers
+        self.cache = cache
+        self.semantic_index = semantic_index
+        self.memo = memo if memo is not None else StageMemoizer()
+        
+        reasoning_backend = composer_backend = search_backend = None
+        if backend_latency is not None:
+            reasoning_backend = composer_backend = search_backend = SimulatedBackend(backend_latency)
+        
+        self.reasoning_agent = ReasoningAgent(os.environ.get("GEMINI_API_KEY", ""), reasoning_backend, self.memo)
+        self.youtube_agent = YouTubeAgent(os.environ.get("YOUTUBE_API_KEY"), search_backend, self.memo, catalog=catalog)
+        if extractor is None:
+            from core.extract import PageExtractionPool
+            
+            extractor = PageExtractionPool()
+        self.extractor = extractor
+        self.web_agent = WebAgent(search_backend, self.memo, extractor=self.extractor)
+        self.composer = CurriculumComposer(composer_backend)
+    
+    async def run(self, jobs: Iterator[Dict[str, Any]], output_path: str, skip: Set[str]) -> Dict[str, Any]:
+        """Memproses job dan menulis setiap hasil ke JSONL segera setelah selesai"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 2)
+        latencies: List[float] = []
+        counts = {"ok": 0, "error": 0, "skipped": 0}
+        
+        with open(output_path, "a", encoding="utf-8") as out:
+            async def worker():
+                while True:
+                    job = await queue.get()
+                    if job is None:
+                        return
+                    
+                    started = time.perf_counter()
+                    try:
+                        with tracer.span("batch.job", job_id=job["id"]):
+                            curriculum = await generate_curriculum(
+                                self.reasoning_agent, self.youtube_agent, self.web_agent, self.composer,
+                                job["topic"], job["level"], job["duration"], job["formats"],
+                                cache=self.cache,
+                                semantic_index=self.semantic_index
+                            )
+                        record = {"id": job["id"], "status": "ok", "input": job, "curriculum": curriculum}
+                    except Exception as e:
+                        record = {"id": job["id"], "status": "error", "input": job, "error": str(e)}
+                    
+                    elapsed = time.perf_counter() - started
+                    latencies.append(elapsed)
+                    counts[record["status"]] += 1
+                    record["latency"] = round(elapsed, 4)
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+            
+            tasks = [asyncio.create_task(worker()) for _ in range(self.workers)]
+            started = time.perf_counter()
+            
+            for job in jobs:
+                if job["id"] in skip:
+                    counts["skipped"] += 1
+                    continue
+                if "error" in job:
+                    counts["error"] += 1
+                    out.write(json.dumps({**job, "status": "error"}, ensure_ascii=False) + "\n")
+                    out.flush()
+                    continue
+                await queue.put(job)
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+            
+            wall_time = time.perf_counter() - started
+        
+        processed = counts["ok"] + counts["error"]
+        return {
+            **counts,
+            "wall_time": wall_time,
+            "throughput": processed / wall_time if wall_time > 0 else 0.0,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95)
+        }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Generate kurikulum secara batch tanpa UI")
+    parser.add_argument("input", help="File CSV atau JSONL berisi topic, level, duration, formats")
+    parser.add_argument("-o", "--output", default="curricula.jsonl", help="File JSONL output (juga checkpoint)")
+    parser.add_argument("-w", "--workers", type=int, default=16, help="Jumlah generasi yang berjalan bersamaan")
+    parser.add_argument("--cache", help="Path SQLite cache kurikulum (opsional)")
+    parser.add_argument("--backend-latency", type=float, help="Override latensi backend simulasi (detik)")
+    parser.add_argument("--no-resume", action="store_true", help="Abaikan checkpoint dan proses ulang semua baris")
+    args = parser.parse_args(argv)
+    
+    if args.no_resume and os.path.exists(args.output):
+        os.remove(args.output)
+    skip = load_checkpoint(args.output)
+    if skip:
+        print(f"Melanjutkan dari checkpoint: {len(skip)} job sudah selesai", file=sys.stderr)
+    
+    cache = semantic_index = catalog = None
+    if args.cache:
+        cache = CurriculumCache(args.cache)
+        semantic_index = SemanticIndex(os.path.join(os.path.dirname(args.cache) or ".", "semantic"))
+        catalog = VideoCatalog(os.path.join(os.path.dirname(args.cache) or ".", "video_catalog.sqlite3"))
+    runner = BatchRunner(
+        workers=args.workers,
+        cache=cache,
+        backend_latency=args.backend_latency,
+        semantic_index=semantic_index,
+        catalog=catalog
+    )
+    try:
+        summary = asyncio.run(runner.run(read_jobs(args.input), args.output, skip))
+    finally:
+        runner.extractor.close()
+    if cache is not None:
+        cache.close()
+    tracer.flush()
+    
+    print(
+        f"Selesai: {summary['ok']} ok, {summary['error']} error, {summary['skipped']} dilewati "
+        f"dalam {summary['wall_time']:.2f}s\n"
+        f"Throughput: {summary['throughput']:.2f} kurikulum/detik\n"
+        f"Latensi p50: {summary['p50'] * 1000:.1f} ms | p95: {summary['p95'] * 1000:.1f} ms",
+        file=sys.stderr
+    )
+    return 0 if summary["error"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""Benchmark pipeline generasi dengan ambang regresi terhadap baseline.
+
+    python -m core.bench                                  # latensi backend 0, konkurensi 1/4/16
+    python -m core.bench --latency 0.02 -o bench.json
+    python -m core.bench --baseline bench_baseline.json --save-baseline
+    python -m core.bench --baseline bench_baseline.json --threshold 0.2
+
+Keempat agent dijalankan langsung (tanpa memo/cache) atas korpus tetap: topik
+contoh x tiga level x semua durasi slider sidebar (2-40 jam). Model dan
+pencarian diganti backend lokal dengan latensi yang dapat diatur, sehingga
+angka yang diukur adalah overhead pipeline ditambah latensi yang disuntikkan.
+
+Hasil (distribusi latensi per stage dan end-to-end, throughput per tingkat
+konkurensi, peak RSS) ditulis sebagai JSON. Jika baseline diberikan, exit 1
+saat salah satu metrik memburuk melebihi ambang.
+
+Baseline bergantung pada mesin, jadi tidak disimpan di repo. Buat sekali di
+mesin yang sama dengan pengecekan (mis. runner CI) memakai korpus penuh:
+
+    python -m core.bench --baseline .cache/bench_baseline.json --save-baseline
+
+Run dengan kurang dari `MIN_SAMPLES` job (mis. `--limit` kecil), atau dengan
+korpus/latensi berbeda dari baseline, tidak dibandingkan karena selisihnya
+didominasi noise.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer
+from core.batch import percentile
+from core.reporting import LoggingReporter
+
+BENCH_TOPICS = [
+    "Machine Learning",
+    "Web Development",
+    "Data Science",
+    "Python Programming",
+    "Digital Marketing",
+    "UI/UX Design",
+    "Cloud Computing",
+    "Akuntansi Dasar",
+]
+BENCH_LEVELS = ["pemula", "menengah", "lanjutan"]
+# Sama dengan slider durasi di sidebar: 2-40 jam, kelipatan 2
+BENCH_DURATIONS = list(range(2, 41, 2))
+BENCH_FORMATS = ["video", "teks"]
+
+STAGES = ["analyze_requirements", "search_videos", "scrape_references", "compose_curriculum"]
+DEFAULT_CONCURRENCY = [1, 4, 16]
+DEFAULT_THRESHOLD = 0.25
+# Selisih absolut (ms) di bawah ini dianggap noise, bukan regresi
+MIN_DELTA_MS = 1.0
+# Selisih throughput relatif di bawah ini dianggap noise, berapa pun ambangnya
+MIN_THROUGHPUT_DELTA = 0.05
+# Run dengan job lebih sedikit dari ini tidak dibandingkan dengan baseline
+MIN_SAMPLES = 30
+
+class StandInBackend:
+    """Pengganti lokal model dan backend pencarian dengan latensi per operasi"""
+    
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.calls: Dict[str, int] = {}
+        self._random = random.Random(seed)
+    
+    async def call(self, operation: str, payload: Dict[str, Any]) -> Any:
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        delay = self.latency * (1 + self._random.uniform(-self.jitter, self.jitter))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # None membuat agent memakai jalur reasoning/template lokal
+        return None
+
+def build_corpus(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Korpus tetap topik x level x durasi; `limit` mengambil sampel merata"""
+    corpus = [
+        {"topic": topic, "level": level, "duration": duration, "formats": list(BENCH_FORMATS)}
+        for topic in BENCH_TOPICS
+        for level in BENCH_LEVELS
+        for duration in BENCH_DURATIONS
+    ]
+    if limit is not None and 0 < limit < len(corpus):
+        step = len(corpus) / limit
+        corpus = [corpus[int(i * step)] for i in range(limit)]
+    return corpus
+
+def distribution(values: List[float]) -> Dict[str, float]:
+    """Ringkasan distribusi latensi dalam milidetik"""
+    if not values:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values) * 1000, 3),
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(max(values) * 1000, 3)
+    }
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size proses ini, atau None jika platform tidak mendukung"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KiB, macOS byte
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(rss / divisor, 1)
+
+class PipelineBenchmark:
+    """Mengukur setiap stage agent dan pipeline end-to-end pada beberapa tingkat konkurensi"""
+    
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        backend = StandInBackend(latency, jitter, seed)
+        reporter = LoggingReporter()
+        self.backend = backend
+        self.reasoning_agent = ReasoningAgent("", backend, reporter=reporter)
+        self.youtube_agent = YouTubeAgent(None, backend, reporter=reporter)
+        self.web_agent = WebAgent(backend, reporter=reporter)
+        self.composer = CurriculumComposer(backend, reporter=reporter)
+    
+    async def _timed(self, stage: str, timings: Dict[str, List[float]], coro) -> Any:
+        started = time.perf_counter()
+        result = await coro
+        timings[stage].append(time.perf_counter() - started)
+        return result
+    
+    async def run_job(self, job: Dict[str, Any], timings: Dict[str, List[float]]) -> None:
+        started = time.perf_counter()
+        requirements = await self._timed(
+            "analyze_requirements", timings,
+            self.reasoning_agent.analyze(job["topic"], job["level"], job["duration"], job["formats"])
+        )
+        videos, references = await asyncio.gather(
+            self._timed("search_videos", timings, self.youtube_agent.search(requirements)),
+            self._timed("scrape_references", timings, self.web_agent.scrape(requirements))
+        )
+        await self._timed("compose_curriculum", timings, self.composer.compose(requirements, videos, references))
+        timings["end_to_end"].append(time.perf_counter() - started)
+    
+    async def run(self, corpus: List[Dict[str, Any]], concurrency: int) -> Dict[str, Any]:
+        """Menjalankan seluruh korpus dengan paling banyak `concurrency` job bersamaan"""
+        timings: Dict[str, List[float]] = {stage: [] for stage in STAGES + ["end_to_end"]}
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def bounded(job: Dict[str, Any]) -> None:
+            async with semaphore:
+                await self.run_job(job, timings)
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(bounded(job) for job in corpus))
+        wall_time = time.perf_counter() - started
+        
+        return {
+            "concurrency": concurrency,
+            "jobs": len(corpus),
+            "wall_time_s": round(wall_time, 4),
+            "throughput_per_s": round(len(corpus) / wall_time, 3) if wall_time > 0 else 0.0,
+            "stages": {stage: distribution(timings[stage]) for stage in STAGES},
+            "end_to_end": distribution(timings["end_to_end"])
+        }
+
+def run_benchmark(
+    concurrency_levels: List[int] = DEFAULT_CONCURRENCY,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    limit: Optional[int] = None,
+    warmup: int = 8
+) -> Dict[str, Any]:
+    corpus = build_corpus(limit)
+    bench = PipelineBenchmark(latency, jitter)
+    
+    async def main() -> List[Dict[str, Any]]:
+        # Pemanasan: import lazy (numpy) dan cache interpreter tidak ikut terukur
+        await bench.run(corpus[:warmup], 1)
+        return [await bench.run(corpus, concurrency) for concurrency in concurrency_levels]
+    
+    runs = asyncio.run(main())
+    return {
+        "config": {
+            "latency_s": latency,
+            "jitter": jitter,
+            "jobs": len(corpus),
+            "concurrency": list(concurrency_levels),
+            "python": sys.version.split()[0]
+        },
+        "runs": {str(run["concurrency"]): run for run in runs},
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+def comparable(current: Dict[str, Any], baseline: Dict[str, Any], min_samples: int = MIN_SAMPLES) -> Optional[str]:
+    """None jika hasil boleh dibandingkan dengan baseline, atau alasannya tidak"""
+    config, before = current.get("config", {}), baseline.get("config", {})
+    if config.get("jobs", 0) < min_samples or before.get("jobs", 0) < min_samples:
+        return f"kurang dari {min_samples} job per run"
+    if config.get("jobs") != before.get("jobs") or config.get("latency_s") != before.get("latency_s"):
+        return "korpus atau latensi backend berbeda dengan baseline"
+    return None
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = MIN_DELTA_MS
+) -> List[str]:
+    """Daftar regresi: latensi/RSS naik atau throughput turun lebih dari `threshold`.
+
+    Pemanggil memastikan `comparable()` lebih dulu; throughput memakai toleransi
+    relatif `MIN_THROUGHPUT_DELTA` sebagai pengganti lantai absolut.
+    """
+    regressions = []
+    
+    def check(name: str, now: Optional[float], before: Optional[float], higher_is_worse: bool, floor: float) -> None:
+        if now is None or before is None or before <= 0:
+            return
+        change = (now - before) / before
+        worse = change > threshold if higher_is_worse else change < -threshold
+        if worse and abs(now - before) > floor:
+            regressions.append(f"{name}: {before:g} -> {now:g} ({change:+.0%})")
+    
+    for key, run in current["runs"].items():
+        previous = baseline.get("runs", {}).get(key)
+        if previous is None:
+            continue
+        metrics: List[Tuple[str, Dict[str, float], Dict[str, float]]] = [
+            (stage, run["stages"][stage], previous["stages"].get(stage, {})) for stage in STAGES
+        ]
+        metrics.append(("end_to_end", run["end_to_end"], previous.get("end_to_end", {})))
+        for name, now, before in metrics:
+            for stat in ("p50_ms", "p95_ms"):
+                check(f"c={key} {name} {stat}", now.get(stat), before.get(stat), True, min_delta_ms)
+        before = previous.get("throughput_per_s")
+        check(
+            f"c={key} throughput_per_s", run["throughput_per_s"], before, False,
+            (before or 0.0) * MIN_THROUGHPUT_DELTA
+        )
+    
+    check("peak_rss_mb", current.get("peak_rss_mb"), baseline.get("peak_rss_mb"), True, 1.0)
+    return regressions
+
+def print_report(result: Dict[str, Any]) -> None:
+    for key, run in result["runs"].items():
+        print(f"Konkurensi {key}: {run['jobs']} job dalam {run['wall_time_s']:.2f}s "
+              f"({run['throughput_per_s']:.1f} kurikulum/detik)")
+        for name, dist in [*run["stages"].items(), ("end_to_end", run["end_to_end"])]:
+            print(f"  {name:<22} p50 {dist['p50_ms']:9.2f} ms | p95 {dist['p95_ms']:9.2f} ms | "
+                  f"p99 {dist['p99_ms']:9.2f} ms")
+    if result["peak_rss_mb"] is not None:
+        print(f"Peak RSS: {result['peak_rss_mb']:.1f} MB")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline curriculum generator")
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latensi backend stand-in per panggilan (detik)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variasi latensi relatif, mis. 0.2 = +/-20%%")
+    parser.add_argument("--limit", type=int, help="Jumlah job dari korpus (sampel merata)")
+    parser.add_argument("-o", "--output", help="File JSON hasil benchmark")
+    parser.add_argument("--baseline", help="File JSON baseline untuk cek regresi")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Ambang regresi relatif")
+    args = parser.parse_args(argv)
+    
+    result = run_benchmark(args.concurrency, args.latency, args.jitter, args.limit)
+    print_report(result)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    
+    if not args.baseline:
+        return 0
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline disimpan ke {args.baseline}")
+        return 0
+    
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    reason = comparable(result, baseline)
+    if reason is not None:
+        print(f"Tidak dibandingkan dengan baseline: {reason}", file=sys.stderr)
+        return 0
+    
+    regressions = compare(result, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESI {regression}", file=sys.stderr)
+    if regressions:
+        print(f"GAGAL: {len(regressions)} metrik melewati ambang {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    print("Tidak ada regresi terhadap baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
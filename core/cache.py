@@ -0,0 +1,224 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
+
+from core.metrics import metrics
+from core.records import Curriculum, pack, unpack
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "curricula.sqlite3")
+
+def make_cache_key(topic: str, level: str, duration: int, format_type: Union[str, List[str]]) -> str:
+    """Membuat kunci cache dari input yang sudah dinormalisasi"""
+    normalized_topic = " ".join(topic.lower().split())
+    if isinstance(format_type, str):
+        formats = [format_type]
+    else:
+        formats = sorted(set(format_type))
+    
+    return json.dumps(
+        [normalized_topic, level.strip().lower(), int(duration), formats],
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+
+class CurriculumCache:
+    """Cache dua tingkat untuk kurikulum final: LRU di memori dan SQLite di disk.
+    
+    Setiap entri kedaluwarsa setelah `ttl` detik. Tingkat memori dibatasi
+    `max_memory_items`, tingkat disk dibatasi `max_disk_items`; entri yang paling
+    lama tidak diakses dibuang terlebih dahulu.
+    
+    Tingkat memori menyimpan record `Curriculum` (slots, teks di-intern) dan disk
+    menyimpan hasil `pack()`; `get` selalu mengembalikan dict baru. Baris lama
+    berformat JSON tetap terbaca.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_CACHE_PATH,
+        ttl: float = 24 * 3600,
+        max_memory_items: int = 256,
+        max_disk_items: int = 10000
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        
+        self._memory: "OrderedDict[str, Tuple[float, Curriculum]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        
+        self._db = None
+        if path:
+            import sqlite3
+            
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS curricula ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON curricula(accessed_at)")
+            self._db.commit()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Mengambil kurikulum dari cache, atau None jika tidak ada / kedaluwarsa"""
+        now = time.time()
+        
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    metrics.inc("cache_requests_total", cache="curriculum", result="hit")
+                    return value.to_dict()
+                del self._memory[key]
+            
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM curricula WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if row[1] > now:
+                        self._db.execute("UPDATE curricula SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        record = unpack(row[0]) if isinstance(row[0], bytes) else Curriculum.from_dict(json.loads(row[0]))
+                        self._remember(key, row[1], record)
+                        self._stats["disk_hits"] += 1
+                        metrics.inc("cache_requests_total", cache="curriculum", result="hit")
+                        return record.to_dict()
+                    self._db.execute("DELETE FROM curricula WHERE key = ?", (key,))
+                    self._db.commit()
+            
+            self._stats["misses"] += 1
+            metrics.inc("cache_requests_total", cache="curriculum", result="miss")
+            return None
+    
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Menyimpan kurikulum ke kedua tingkat cache"""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        
+        record = Curriculum.from_dict(value)
+        with self._lock:
+            self._remember(key, expires_at, record)
+            
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO curricula (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, pack(record), expires_at, now)
+                )
+                self._evict_disk(now)
+                self._db.commit()
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """Seperti `get`, tetapi tanpa statistik, metrics, urutan LRU, maupun `accessed_at`"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1].to_dict()
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value FROM curricula WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        if row is None:
+            return None
+        record = unpack(row[0]) if isinstance(row[0], bytes) else Curriculum.from_dict(json.loads(row[0]))
+        return record.to_dict()
+    
+    def expires_at(self, key: str) -> Optional[float]:
+        """Waktu kedaluwarsa entri (epoch), atau None jika tidak ada; tidak dihitung di statistik"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[0]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at FROM curricula WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    return row[0]
+        return None
+    
+    def iter_items(self, limit: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(key, kurikulum) yang belum kedaluwarsa, terbaru diakses dulu; satu baris per langkah"""
+        now = time.time()
+        with self._lock:
+            if self._db is None:
+                entries = [(key, value) for key, (expires_at, value) in reversed(self._memory.items()) if expires_at > now]
+                keys = None
+            else:
+                keys = [row[0] for row in self._db.execute(
+                    "SELECT key FROM curricula WHERE expires_at > ? ORDER BY accessed_at DESC LIMIT ?",
+                    (now, -1 if limit is None else limit)
+                )]
+        
+        if keys is None:
+            for key, record in entries[:limit]:
+                yield key, record.to_dict()
+            return
+        
+        for key in keys:
+            with self._lock:
+                if self._db is None:
+                    return
+                row = self._db.execute("SELECT value FROM curricula WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                record = unpack(row[0]) if isinstance(row[0], bytes) else Curriculum.from_dict(json.loads(row[0]))
+                yield key, record.to_dict()
+    
+    def clear(self) -> None:
+        """Menghapus seluruh isi cache"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM curricula")
+                self._db.commit()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Statistik hit/miss untuk monitoring"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+        
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        total = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_rate"] = hits / total if total else 0.0
+        return stats
+    
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+    
+    def _remember(self, key: str, expires_at: float, value: Curriculum) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+    
+    def _evict_disk(self, now: float) -> None:
+        self._db.execute("DELETE FROM curricula WHERE expires_at <= ?", (now,))
+        excess = self._db.execute("SELECT COUNT(*) FROM curricula").fetchone()[0] - self.max_disk_items
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM curricula WHERE key IN "
+                "(SELECT key FROM curricula ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,)
+            )
+            self._stats["evictions"] += excess
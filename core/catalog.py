@@ -0,0 +1,264 @@
+"""Katalog video lokal dengan inverted index untuk mengambil kandidat tanpa pencarian ulang.
+
+Lalu lintas didominasi beberapa ratus topik yang sama, dan metadata video
+(judul, channel, durasi, views, deskripsi) jarang berubah. Setiap hasil
+`YouTubeAgent.search` dimasukkan ke katalog secara inkremental; permintaan
+berikutnya dijawab dari indeks di memori:
+
+    terms     kata (dinormalisasi seperti topik semantik) dari judul + deskripsi,
+              ditambah kata topik pencarian yang menemukan video tersebut
+    level     pemula / menengah / lanjutan
+    bucket    kelompok durasi kurikulum: short (<= 4 jam), medium (<= 12), long
+
+Record disimpan di SQLite (`.cache/video_catalog.sqlite3`) dan dimuat sekali
+saat start; penambahan berikutnya hanya menulis baris yang berubah. Proses lain
+yang berbagi file yang sama disusul lewat `sync()` berdasarkan `updated_at`.
+Video hanya cocok jika kata topik permintaan mencakup semua kata topik yang
+menemukannya dan sebaliknya, sehingga video "React Native" tidak dipakai untuk
+"React".
+Entri yang lebih tua dari `stale_after` tetap dipakai, tetapi dijadwalkan untuk
+diperbarui oleh satu thread latar belakang.
+"""
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Awaitable, Callable, Optional, Set, Tuple
+
+from core.metrics import metrics
+from core.semantic import normalize_topic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = os.path.join(".cache", "video_catalog.sqlite3")
+# Metadata video jarang berubah; entri lebih tua dari ini diperbarui di latar belakang
+DEFAULT_STALE_AFTER = 7 * 24 * 3600
+# Jumlah video yang harus ditemukan agar katalog menggantikan pencarian
+MIN_CANDIDATES = 3
+# Jeda minimum antar sinkronisasi dengan baris yang ditulis proses lain
+SYNC_INTERVAL = 5.0
+
+def duration_bucket(duration: int) -> str:
+    """Kelompok durasi yang sama dengan preferensi video di `_reason_video_selection`"""
+    if duration <= 4:
+        return "short"
+    if duration <= 12:
+        return "medium"
+    return "long"
+
+def terms(text: str) -> Set[str]:
+    return set(normalize_topic(text).split())
+
+@dataclass
+class CatalogLookup:
+    videos: List[Dict[str, Any]]
+    stale: bool
+
+class VideoCatalog:
+    """Record video dengan inverted index kata dan indeks sekunder level/durasi"""
+    
+    def __init__(self, path: Optional[str] = DEFAULT_CATALOG_PATH, stale_after: float = DEFAULT_STALE_AFTER):
+        self.stale_after = stale_after
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._updated: Dict[int, float] = {}
+        self._terms: Dict[str, Set[int]] = {}
+        self._by_level: Dict[str, Set[int]] = {}
+        self._by_bucket: Dict[str, Set[int]] = {}
+        self._doc_terms: Dict[int, Set[str]] = {}
+        self._topics: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._synced_at = 0.0
+        self._last_sync = time.monotonic()
+        self._refresher: Optional["CatalogRefresher"] = None
+        
+        directory = os.path.dirname(path) if path else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # sqlite3 di-import di sini agar `import core.agents` tetap murah (lihat core.import_budget)
+        import sqlite3
+        
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS videos ("
+                "id INTEGER PRIMARY KEY, url TEXT NOT NULL, level TEXT NOT NULL, bucket TEXT NOT NULL, "
+                "record TEXT NOT NULL, updated_at REAL NOT NULL, topics TEXT NOT NULL DEFAULT '[]', "
+                "UNIQUE (url, level, bucket))"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(videos)")}
+            if "topics" not in columns:
+                # Katalog lama menyimpan kata topik di dalam record
+                self._db.execute("ALTER TABLE videos ADD COLUMN topics TEXT NOT NULL DEFAULT '[]'")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_videos_updated ON videos(updated_at)")
+            self._db.commit()
+            self._load(0.0)
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def lookup(self, topic: str, level: str, duration: int, limit: int = MIN_CANDIDATES) -> Optional[CatalogLookup]:
+        """Video untuk (topik, level, durasi) tanpa memanggil pencarian, atau None jika kurang dari `limit`"""
+        wanted = terms(topic)
+        if not wanted:
+            return None
+        
+        found = self._match(wanted, level, duration_bucket(duration), limit)
+        if found is None and time.monotonic() - self._last_sync >= SYNC_INTERVAL:
+            # Mungkin sudah ditambahkan worker lain sejak sinkronisasi terakhir
+            self.sync()
+            found = self._match(wanted, level, duration_bucket(duration), limit)
+        metrics.inc("cache_requests_total", cache="video_catalog", result="miss" if found is None else "hit")
+        return found
+    
+    def _match(self, wanted: Set[str], level: str, bucket: str, limit: int) -> Optional[CatalogLookup]:
+        with self._lock:
+            # Irisan posting list dari yang terpendek, lalu disaring indeks sekunder
+            postings = sorted((self._terms.get(term, set()) for term in wanted), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting
+                if not candidates:
+                    return None
+            candidates &= self._by_level.get(level, set())
+            candidates &= self._by_bucket.get(bucket, set())
+            # Video dari topik yang lebih sempit ("react native") tidak menjawab "react"
+            candidates = {i for i in candidates if self._topics[i] <= wanted}
+            if len(candidates) < limit:
+                return None
+            
+            ranked = sorted(candidates, key=lambda i: (-self._records[i].get("relevance_score", 0.0), i))[:limit]
+            cutoff = time.time() - self.stale_after
+            return CatalogLookup(
+                videos=[dict(self._records[i]) for i in ranked],
+                stale=any(self._updated[i] < cutoff for i in ranked)
+            )
+    
+    def add(self, videos: List[Dict[str, Any]], requirements: Dict[str, Any]) -> int:
+        """Menambahkan atau memperbarui video hasil pencarian untuk requirements ini"""
+        level = requirements["level"]
+        bucket = duration_bucket(requirements["duration"])
+        topic_terms = terms(requirements["topic"])
+        now = time.time()
+        
+        topics = json.dumps(sorted(topic_terms))
+        with self._lock:
+            for video in videos:
+                record = dict(video)
+                video_id = self._db.execute(
+                    "INSERT INTO videos (url, level, bucket, record, updated_at, topics) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(url, level, bucket) DO UPDATE SET "
+                    "record = excluded.record, updated_at = excluded.updated_at, topics = excluded.topics "
+                    "RETURNING id",
+                    (video["url"], level, bucket, json.dumps(record, ensure_ascii=False), now, topics)
+                ).fetchone()[0]
+                self._index(video_id, level, bucket, record, topic_terms, now)
+            self._db.commit()
+        return len(videos)
+    
+    def sync(self) -> int:
+        """Memuat baris yang ditulis proses lain sejak sinkronisasi terakhir"""
+        with self._lock:
+            self._last_sync = time.monotonic()
+            return self._load(self._synced_at)
+    
+    def _load(self, since: float) -> int:
+        rows = self._db.execute(
+            "SELECT id, level, bucket, record, updated_at, topics FROM videos WHERE updated_at > ? ORDER BY updated_at",
+            (since,)
+        ).fetchall()
+        for video_id, level, bucket, record, updated_at, topics in rows:
+            record = json.loads(record)
+            topic_terms = set(json.loads(topics)) | set(record.pop("topics", []))
+            self._index(video_id, level, bucket, record, topic_terms, updated_at)
+            self._synced_at = max(self._synced_at, updated_at)
+        return len(rows)
+    
+    def _index(
+        self,
+        video_id: int,
+        level: str,
+        bucket: str,
+        record: Dict[str, Any],
+        topic_terms: Set[str],
+        updated_at: float
+    ) -> None:
+        """Memperbarui record dan semua indeks untuk satu video (hanya posting yang berubah)"""
+        # Judul hasil API tidak selalu menyebut topik; topik pencarian ikut diindeks
+        new_terms = terms(f"{record.get('title', '')} {record.get('description', '')}") | topic_terms
+        old_terms = self._doc_terms.get(video_id, set())
+        for term in old_terms - new_terms:
+            posting = self._terms.get(term)
+            if posting is not None:
+                posting.discard(video_id)
+                if not posting:
+                    del self._terms[term]
+        for term in new_terms - old_terms:
+            self._terms.setdefault(term, set()).add(video_id)
+        
+        self._doc_terms[video_id] = new_terms
+        self._topics[video_id] = set(topic_terms)
+        self._records[video_id] = record
+        self._updated[video_id] = updated_at
+        self._by_level.setdefault(level, set()).add(video_id)
+        self._by_bucket.setdefault(bucket, set()).add(video_id)
+    
+    def refresh_later(self, requirements: Dict[str, Any], fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> bool:
+        """Menjadwalkan pembaruan entri basi di thread latar belakang (sekali per kombinasi)"""
+        if self._refresher is None:
+            with self._lock:
+                if self._refresher is None:
+                    self._refresher = CatalogRefresher(self)
+        return self._refresher.submit(requirements, fetch)
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            cutoff = time.time() - self.stale_after
+            return {
+                "videos": len(self._records),
+                "terms": len(self._terms),
+                "stale": sum(1 for updated_at in self._updated.values() if updated_at < cutoff)
+            }
+    
+    def close(self) -> None:
+        self._db.close()
+
+class CatalogRefresher:
+    """Satu thread daemon yang menjalankan ulang pencarian untuk entri katalog yang basi"""
+    
+    def __init__(self, catalog: VideoCatalog, max_pending: int = 256):
+        self.catalog = catalog
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._pending: Set[Tuple[str, str, str]] = set()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, name="catalog-refresher", daemon=True).start()
+    
+    def submit(self, requirements: Dict[str, Any], fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> bool:
+        key = (normalize_topic(requirements["topic"]), requirements["level"], duration_bucket(requirements["duration"]))
+        with self._lock:
+            if key in self._pending:
+                return False
+            try:
+                self._queue.put_nowait((key, requirements, fetch))
+            except queue.Full:
+                return False
+            self._pending.add(key)
+        return True
+    
+    def _run(self) -> None:
+        while True:
+            key, requirements, fetch = self._queue.get()
+            try:
+                videos = asyncio.run(fetch())
+                if videos:
+                    self.catalog.add(videos, requirements)
+            except Exception:
+                logger.warning("Gagal memperbarui katalog video untuk %s", key, exc_info=True)
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+                self._queue.task_done()
@@ -0,0 +1,363 @@
+"""Export kurikulum ke PDF, Markdown dan JSON secara lazy dan streaming.
+
+Renderer adalah generator yang menghasilkan potongan bytes, sehingga output
+besar (mis. ZIP berisi ribuan kurikulum) tidak pernah dibangun utuh di memori.
+`ExportEngine` menjalankan render di thread pool terpisah dari thread UI dan
+hanya ketika diminta; hasil render terakhir disimpan sebentar agar klik ulang
+tidak merender lagi.
+
+    python -m core.export --cache .cache/curricula.sqlite3 --format markdown -o kurikulum.zip
+
+PDF ditulis langsung (PDF 1.4, font Helvetica bawaan, teks WinAnsi) tanpa
+dependency tambahan; karakter di luar Latin-1 diganti "?".
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from core.memo import StageConfig, StageMemo
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Ukuran potongan output streaming (bytes)
+CHUNK_SIZE = 16 * 1024
+DEFAULT_EXPORT_WORKERS = 2
+
+# Tata letak PDF (A4, satuan point)
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MARGIN = 56
+WRAP_CHARS = 90
+
+# (jenis, teks, url) untuk satu baris kerangka dokumen
+OutlineItem = Tuple[str, str, Optional[str]]
+
+def outline(curriculum: Dict[str, Any]) -> Iterator[OutlineItem]:
+    """Kerangka dokumen yang sama untuk Markdown dan PDF"""
+    yield "title", curriculum["title"], None
+    yield "text", f"Durasi: {curriculum['duration']} | Level: {curriculum['level'].title()}", None
+    
+    yield "heading", "Deskripsi Program", None
+    for para in curriculum["description"]:
+        yield "text", " ".join(para.split()), None
+    
+    yield "heading", "Objektif Pembelajaran", None
+    for objective in curriculum["learning_objectives"]:
+        yield "bullet", objective, None
+    
+    yield "heading", "Kompetensi yang Dicapai", None
+    for competency in curriculum["competencies"]:
+        yield "bullet", competency, None
+    
+    yield "heading", "Video Pembelajaran", None
+    for video in curriculum["videos"]:
+        yield "bullet", f"{video['title']} - {video['channel']} ({video['duration']})", video["url"]
+    
+    yield "heading", "Referensi Pembelajaran", None
+    for ref in curriculum["references"]:
+        yield "bullet", f"{ref['title']} ({ref['type']})", ref["url"]
+        yield "text", ref["summary"], None
+    
+    yield "text", f"Dibuat: {curriculum['created_at']}", None
+
+def _coalesce(pieces: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Menggabungkan potongan teks kecil menjadi chunk bytes berukuran ~`size`"""
+    buffer: List[bytes] = []
+    length = 0
+    for piece in pieces:
+        data = piece.encode("utf-8")
+        buffer.append(data)
+        length += len(data)
+        if length >= size:
+            yield b"".join(buffer)
+            buffer.clear()
+            length = 0
+    if buffer:
+        yield b"".join(buffer)
+
+def iter_json(curriculum: Dict[str, Any]) -> Iterator[bytes]:
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+    return _coalesce(encoder.iterencode(curriculum))
+
+def iter_markdown(curriculum: Dict[str, Any]) -> Iterator[bytes]:
+    def lines() -> Iterator[str]:
+        for kind, text, url in outline(curriculum):
+            if kind == "title":
+                yield f"# {text}\n\n"
+            elif kind == "heading":
+                yield f"\n## {text}\n\n"
+            elif kind == "bullet":
+                yield f"- [{text}]({url})\n" if url else f"- {text}\n"
+            else:
+                yield f"{text}\n\n"
+    return _coalesce(lines())
+
+class _PdfWriter:
+    """Menulis objek PDF berurutan sambil mencatat offset untuk tabel xref"""
+    
+    def __init__(self):
+        self.offset = 0
+        self.offsets: Dict[int, int] = {}
+        self.last_id = 0
+    
+    def reserve(self) -> int:
+        self.last_id += 1
+        return self.last_id
+    
+    def raw(self, data: bytes) -> bytes:
+        self.offset += len(data)
+        return data
+    
+    def obj(self, number: int, body: bytes) -> bytes:
+        self.offsets[number] = self.offset
+        return self.raw(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    
+    def trailer(self, root: int) -> bytes:
+        xref_offset = self.offset
+        entries = [b"0000000000 65535 f \n"]
+        entries.extend(b"%010d 00000 n \n" % self.offsets[number] for number in range(1, self.last_id + 1))
+        return self.raw(
+            b"xref\n0 %d\n" % (self.last_id + 1) + b"".join(entries)
+            + b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (self.last_id + 1, root, xref_offset)
+        )
+
+def _pdf_text(text: str) -> bytes:
+    data = text.encode("cp1252", errors="replace")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+def _wrap(text: str, width: int) -> List[str]:
+    lines: List[str] = []
+    current = ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    lines.append(current)
+    return lines
+
+# (font, ukuran, spasi baris) per jenis baris kerangka
+_PDF_STYLES = {
+    "title": (b"F2", 16, 24),
+    "heading": (b"F2", 13, 20),
+    "bullet": (b"F1", 11, 15),
+    "text": (b"F1", 11, 15),
+    "url": (b"F1", 9, 13),
+}
+
+def _pdf_lines(curriculum: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    for kind, text, url in outline(curriculum):
+        if kind == "heading":
+            yield "text", ""
+        prefix = "- " if kind == "bullet" else ""
+        for i, line in enumerate(_wrap(text, WRAP_CHARS - len(prefix))):
+            yield kind, (prefix if i == 0 else " " * len(prefix)) + line
+        if url:
+            yield "url", "  " + url
+        if kind in ("title", "text"):
+            yield "text", ""
+
+def iter_pdf(curriculum: Dict[str, Any]) -> Iterator[bytes]:
+    """PDF multi-halaman; setiap halaman dikirim segera setelah selesai ditata"""
+    writer = _PdfWriter()
+    yield writer.raw(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    catalog, pages, regular, bold = (writer.reserve() for _ in range(4))
+    yield writer.obj(catalog, b"<< /Type /Catalog /Pages %d 0 R >>" % pages)
+    yield writer.obj(regular, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    yield writer.obj(bold, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+    
+    kids: List[int] = []
+    
+    def page(content: List[bytes]) -> Iterator[bytes]:
+        stream = b"\n".join(content)
+        contents, page_id = writer.reserve(), writer.reserve()
+        yield writer.obj(contents, b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        yield writer.obj(page_id, (
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>"
+        ) % (pages, PAGE_WIDTH, PAGE_HEIGHT, regular, bold, contents))
+        kids.append(page_id)
+    
+    content: List[bytes] = []
+    y = PAGE_HEIGHT - MARGIN
+    for kind, line in _pdf_lines(curriculum):
+        font, size, leading = _PDF_STYLES[kind]
+        if y - leading < MARGIN:
+            yield from page(content)
+            content, y = [], PAGE_HEIGHT - MARGIN
+        y -= leading
+        if line:
+            content.append(b"BT /%s %d Tf %d %d Td (%s) Tj ET" % (font, size, MARGIN, y, _pdf_text(line)))
+    yield from page(content)
+    
+    yield writer.obj(pages, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    ))
+    yield writer.trailer(catalog)
+
+@dataclass
+class ExportFormat:
+    label: str
+    extension: str
+    mime: str
+    render: Callable[[Dict[str, Any]], Iterator[bytes]]
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "pdf": ExportFormat("PDF", "pdf", "application/pdf", iter_pdf),
+    "markdown": ExportFormat("Markdown", "md", "text/markdown", iter_markdown),
+    "json": ExportFormat("JSON", "json", "application/json", iter_json),
+}
+
+def export_format(name: str) -> ExportFormat:
+    spec = EXPORT_FORMATS.get(name)
+    if spec is None:
+        raise ValueError(f"format export harus salah satu dari {list(EXPORT_FORMATS)}")
+    return spec
+
+def export_filename(topic: str, fmt: str) -> str:
+    slug = re.sub(r"[^0-9A-Za-z]+", "_", topic).strip("_") or "kurikulum"
+    return f"curriculum_{slug}.{export_format(fmt).extension}"
+
+def render(curriculum: Dict[str, Any], fmt: str) -> bytes:
+    return b"".join(export_format(fmt).render(curriculum))
+
+class _ZipSink:
+    """Tujuan tulis ZipFile yang tidak bisa di-seek; isi diambil per potongan lewat drain()"""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def iter_zip(items: Iterable[Tuple[str, Dict[str, Any]]], fmt: str) -> Iterator[bytes]:
+    """ZIP streaming berisi satu file per (nama, kurikulum); entri ditulis satu per satu"""
+    spec = export_format(fmt)
+    sink = _ZipSink()
+    used: Dict[str, int] = {}
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, curriculum in items:
+            base = re.sub(r"[^0-9A-Za-z]+", "_", name).strip("_") or "kurikulum"
+            used[base] = used.get(base, 0) + 1
+            suffix = f"_{used[base]}" if used[base] > 1 else ""
+            with archive.open(f"{base}{suffix}.{spec.extension}", "w") as entry:
+                for chunk in spec.render(curriculum):
+                    entry.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            yield sink.drain()
+    yield sink.drain()
+
+def export_key(curriculum: Dict[str, Any]) -> str:
+    encoded = json.dumps(curriculum, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+class ExportEngine:
+    """Render export di thread pool latar belakang, hanya saat diminta"""
+    
+    def __init__(self, workers: int = DEFAULT_EXPORT_WORKERS, max_cached: int = 64, ttl: float = 3600.0):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export")
+        self._rendered = StageMemo(StageConfig(ttl=ttl, max_items=max_cached))
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, curriculum: Dict[str, Any], fmt: str) -> Future:
+        """Future berisi bytes hasil render; permintaan identik berbagi satu render"""
+        export_format(fmt)
+        key = (export_key(curriculum), fmt)
+        data = self._rendered.get(key, None)
+        if data is not None:
+            future: Future = Future()
+            future.set_result(data)
+            return future
+        
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._render, key, curriculum, fmt)
+                self._inflight[key] = future
+        return future
+    
+    def _render(self, key: Tuple[str, str], curriculum: Dict[str, Any], fmt: str) -> bytes:
+        try:
+            data = render(curriculum, fmt)
+            self._rendered.set(key, data)
+            metrics.inc("exports_total", format=fmt)
+            return data
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+    
+    def submit_bulk(self, items: Iterable[Tuple[str, Dict[str, Any]]], fmt: str, path: str) -> Future:
+        """Menulis ZIP streaming ke `path` di latar belakang; Future berisi path saat selesai"""
+        export_format(fmt)
+        
+        def write() -> str:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            partial = path + ".partial"
+            with open(partial, "wb") as f:
+                for chunk in iter_zip(items, fmt):
+                    f.write(chunk)
+            os.replace(partial, path)
+            metrics.inc("exports_total", format=f"zip_{fmt}")
+            return path
+        
+        return self._executor.submit(write)
+    
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+def cached_items(cache, limit: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(nama file, kurikulum) dari CurriculumCache untuk bulk export"""
+    for key, curriculum in cache.iter_items(limit):
+        topic, level, duration, _ = json.loads(key)
+        yield f"{topic}_{level}_{duration}jam", curriculum
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from core.cache import CurriculumCache
+    
+    parser = argparse.ArgumentParser(description="Bulk export kurikulum tersimpan ke satu file ZIP")
+    parser.add_argument("--cache", default=os.path.join(".cache", "curricula.sqlite3"), help="Path SQLite cache kurikulum")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="markdown")
+    parser.add_argument("--limit", type=int, help="Jumlah kurikulum maksimum (terbaru dulu)")
+    parser.add_argument("-o", "--output", default="kurikulum.zip", help="File ZIP output, atau - untuk stdout")
+    args = parser.parse_args(argv)
+    
+    cache = CurriculumCache(args.cache)
+    try:
+        output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        with output:
+            written = 0
+            for chunk in iter_zip(cached_items(cache, args.limit), args.format):
+                output.write(chunk)
+                written += len(chunk)
+    finally:
+        cache.close()
+    print(f"{written / 1024:.1f} KiB ditulis ke {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Ekstraksi streaming untuk halaman referensi WebAgent.
+
+Alih-alih membangun pohon BeautifulSoup penuh untuk setiap kandidat, halaman
+di-feed potong demi potong ke `html.parser.HTMLParser` (stdlib, event-based).
+Parser berhenti begitu teks yang cukup terkumpul atau batas byte tercapai.
+Output memakai bentuk dict yang sama dengan `WebAgent._reason_web_content`
+(title, summary, site_type, estimated_depth).
+"""
+import asyncio
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+MAX_PAGE_BYTES = 512 * 1024
+MAX_TEXT_CHARS = 4000
+CHUNK_BYTES = 16 * 1024
+SUMMARY_CHARS = 300
+
+# Elemen yang isinya bukan konten utama
+SKIP_TAGS = {"script", "style", "noscript", "nav", "footer", "header", "aside", "svg", "form"}
+TEXT_TAGS = {"p", "li", "h1", "h2", "h3", "h4", "pre", "code", "td", "blockquote"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+class _EnoughText(Exception):
+    """Sinyal internal untuk menghentikan parsing lebih awal"""
+
+class StreamingPageExtractor(HTMLParser):
+    """Mengumpulkan judul, meta description dan sinyal kedalaman konten secara incremental"""
+    
+    def __init__(self, max_text_chars: int = MAX_TEXT_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.max_text_chars = max_text_chars
+        self.title = ""
+        self.meta_description = ""
+        self.text_parts: List[str] = []
+        self.text_chars = 0
+        self.headings = 0
+        self.code_blocks = 0
+        self.complete = False
+        self._in_title = False
+        self._skip_depth = 0
+        self._text_depth = 0
+    
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "meta" and not self.meta_description:
+            attributes = dict(attrs)
+            name = (attributes.get("name") or attributes.get("property") or "").lower()
+            if name in ("description", "og:description"):
+                self.meta_description = _clean(attributes.get("content") or "")
+        
+        if tag in TEXT_TAGS:
+            self._text_depth += 1
+        if tag in HEADING_TAGS:
+            self.headings += 1
+        elif tag == "pre":
+            self.code_blocks += 1
+    
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        if tag in TEXT_TAGS and self._text_depth:
+            self._text_depth -= 1
+    
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title = _clean(self.title + " " + data)
+            return
+        if self._skip_depth or not self._text_depth:
+            return
+        
+        text = _clean(data)
+        if text:
+            self.text_parts.append(text)
+            self.text_chars += len(text) + 1
+            if self.text_chars >= self.max_text_chars:
+                self.complete = True
+                raise _EnoughText()
+    
+    def feed_chunks(self, chunks: Iterable[bytes], max_bytes: int = MAX_PAGE_BYTES, encoding: str = "utf-8") -> int:
+        """Feed potongan byte sampai teks cukup atau batas byte tercapai; mengembalikan jumlah byte terbaca"""
+        consumed = 0
+        # Decoder incremental: karakter multi-byte yang terbelah di batas chunk tetap utuh
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        try:
+            for chunk in chunks:
+                if consumed + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - consumed]
+                consumed += len(chunk)
+                self.feed(decoder.decode(chunk))
+                if consumed >= max_bytes:
+                    break
+            else:
+                # Sisa byte yang belum lengkap hanya diganti U+FFFD jika halaman memang berakhir di situ
+                self.feed(decoder.decode(b"", final=True))
+        except _EnoughText:
+            pass
+        return consumed
+    
+    @property
+    def word_count(self) -> int:
+        return sum(len(part.split()) for part in self.text_parts)
+
+def _clean(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+def _chunks(content: bytes, size: int = CHUNK_BYTES) -> Iterable[bytes]:
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+def classify_site(url: str) -> str:
+    """Menebak site_type dari host/path dengan kosakata yang sama seperti WebAgent"""
+    parts = urlsplit(url)
+    host, path = parts.netloc.lower(), parts.path.lower()
+    
+    if host.startswith(("docs.", "developer.", "developers.")) or "readthedocs" in host or "/doc" in path or "/api" in path:
+        return "official"
+    if any(name in host for name in ("medium.com", "blog", "hashnode", "substack")):
+        return "blog"
+    if any(name in host for name in ("dev.to", "stackoverflow", "github.com", "arxiv")):
+        return "technical"
+    if host.endswith(".edu") or any(name in host + path for name in ("learn", "course", "tutorial", "academy", "w3schools")):
+        return "educational"
+    return "mixed"
+
+def estimate_depth(word_count: int, headings: int, code_blocks: int, complete: bool) -> str:
+    """Deep / Moderate / Surface, selaras dengan WebAgent._estimate_content_depth"""
+    # Halaman yang memenuhi batas teks sebelum selesai dibaca pasti panjang
+    if complete and (code_blocks >= 2 or headings >= 6):
+        return "Deep"
+    if word_count >= 500 or code_blocks >= 3:
+        return "Deep"
+    if word_count >= 200 or headings >= 3 or code_blocks >= 1:
+        return "Moderate"
+    return "Surface"
+
+def extract_page(
+    content: bytes,
+    url: str,
+    max_bytes: int = MAX_PAGE_BYTES,
+    max_text_chars: int = MAX_TEXT_CHARS,
+    encoding: str = "utf-8"
+) -> Dict[str, Any]:
+    """Mengekstrak satu halaman secara streaming; aman dipanggil di worker process"""
+    extractor = StreamingPageExtractor(max_text_chars)
+    consumed = extractor.feed_chunks(_chunks(content), max_bytes, encoding)
+    
+    summary = extractor.meta_description
+    if not summary:
+        summary = " ".join(extractor.text_parts)
+    if len(summary) > SUMMARY_CHARS:
+        summary = summary[:SUMMARY_CHARS].rsplit(" ", 1)[0] + "..."
+    
+    return {
+        "title": extractor.title or url,
+        "url": url,
+        "summary": summary,
+        "site_type": classify_site(url),
+        "estimated_depth": estimate_depth(
+            extractor.word_count, extractor.headings, extractor.code_blocks, extractor.complete
+        ),
+        "bytes_read": consumed
+    }
+
+class PageExtractionPool:
+    """Menjalankan extract_page di process pool agar parsing tidak menahan GIL thread UI"""
+    
+    def __init__(self, workers: Optional[int] = None, max_bytes: int = MAX_PAGE_BYTES):
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self._executor = None
+    
+    @property
+    def executor(self):
+        if self._executor is None:
+            # Di-import saat dibutuhkan: multiprocessing menambah waktu import core
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+            
+            if multiprocessing.current_process().daemon:
+                # Proses daemon (worker core.jobs) tidak boleh punya anak; proses itu sudah
+                # terpisah dari UI, jadi thread cukup agar event loop-nya tidak tertahan
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="extract")
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+    
+    async def extract(self, content: bytes, url: str) -> Dict[str, Any]:
+        # Potong sebelum dikirim ke worker agar tidak menyalin byte yang tidak dibaca
+        content = content[:self.max_bytes]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, extract_page, content, url, self.max_bytes)
+    
+    async def extract_many(self, pages: List[Tuple[bytes, str]]) -> List[Dict[str, Any]]:
+        return list(await asyncio.gather(*(self.extract(content, url) for content, url in pages)))
+    
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,327 @@
+"""Subsistem fetch HTTP bersama untuk lookup web/YouTube yang nyata.
+
+Semua agent memakai satu `Fetcher`:
+- satu `requests.Session` dengan connection pool keep-alive (tidak membuka
+  koneksi TCP/TLS baru per panggilan),
+- batas konkurensi per host,
+- token bucket opsional per sumber (mis. kuota YouTube Data API),
+- retry dengan exponential backoff + jitter untuk error jaringan, 429 dan 5xx,
+- cache conditional GET (ETag / Last-Modified) sehingga halaman yang tidak
+  berubah dijawab 304 tanpa mengunduh ulang body.
+
+Primitive sinkronisasi memakai `threading` (bukan asyncio) agar satu Fetcher
+aman dipakai dari beberapa event loop, termasuk yang dibuat oleh run_sync.
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from core.optional import require
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class QuotaExceeded(Exception):
+    """Token bucket tidak bisa memberi izin dalam batas waktu tunggu"""
+
+class TokenBucket:
+    """Rate limiter token bucket yang thread-safe"""
+    
+    def __init__(self, rate: float, capacity: float, max_wait: float = 10.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait = max_wait
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, cost: float = 1.0) -> float:
+        """Memesan token dan mengembalikan lama waktu tunggu (detik) sebelum boleh jalan"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            wait = 0.0 if self._tokens >= cost else (cost - self._tokens) / self.rate
+            if wait > self.max_wait:
+                raise QuotaExceeded(f"Rate limit: perlu menunggu {wait:.1f}s (maks {self.max_wait:.1f}s)")
+            self._tokens -= cost
+            return wait
+    
+    def available(self) -> float:
+        """Jumlah token saat ini tanpa memesan"""
+        with self._lock:
+            return min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate)
+    
+    async def acquire(self, cost: float = 1.0) -> None:
+        wait = self.reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+@dataclass
+class FetchResponse:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    content: bytes
+    from_cache: bool = False
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+    
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+@dataclass
+class _Validator:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    response: FetchResponse = field(repr=False)
+
+class Fetcher:
+    """Klien HTTP bersama dengan pooling, rate limit, retry dan conditional GET"""
+    
+    def __init__(
+        self,
+        pool_size: int = 32,
+        per_host_limit: int = 8,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        validator_cache_size: int = 1024,
+        user_agent: str = "kurikulum-generator/1.0"
+    ):
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.validator_cache_size = validator_cache_size
+        
+        self._pool_size = pool_size
+        self._user_agent = user_agent
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+        self._validators: "OrderedDict[str, _Validator]" = OrderedDict()
+        self._validators_lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "not_modified": 0}
+        self._stats_lock = threading.Lock()
+    
+    @property
+    def session(self):
+        """Session dibuat saat pertama dipakai agar `requests` tidak di-import saat startup"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    requests = require("requests")
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=self._pool_size,
+                        pool_maxsize=self._pool_size
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers["User-Agent"] = self._user_agent
+                    self._session = session
+        return self._session
+    
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        bucket: Optional[TokenBucket] = None,
+        cost: float = 1.0,
+        conditional: bool = True,
+        max_bytes: Optional[int] = None
+    ) -> FetchResponse:
+        """GET async; pemanggilan blocking dijalankan di thread pool default event loop.
+
+        `max_bytes` membatasi body yang diunduh; sisa response tidak dibaca.
+        `bucket` dibebani `cost` untuk setiap percobaan, termasuk retry, karena
+        setiap percobaan adalah panggilan nyata yang memakai kuota.
+        """
+        full_url = f"{url}?{urlencode(params, doseq=True)}" if params else url
+        loop = asyncio.get_running_loop()
+        
+        for attempt in range(self.max_retries + 1):
+            if bucket is not None:
+                await bucket.acquire(cost)
+            try:
+                response = await loop.run_in_executor(
+                    None, self._get_blocking, full_url, dict(headers or {}), conditional, max_bytes
+                )
+            except QuotaExceeded:
+                raise
+            except Exception:
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                self._count("retries")
+                continue
+            
+            if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                await asyncio.sleep(self._retry_after(response) or self._backoff(attempt))
+                self._count("retries")
+                continue
+            return response
+        
+        return response
+    
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+    
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def _get_blocking(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        conditional: bool,
+        max_bytes: Optional[int] = None
+    ) -> FetchResponse:
+        validator = self._validator(url) if conditional else None
+        if validator is not None:
+            if validator.etag:
+                headers["If-None-Match"] = validator.etag
+            if validator.last_modified:
+                headers["If-Modified-Since"] = validator.last_modified
+        
+        with self._host_limit(url):
+            self._count("requests")
+            raw = self.session.get(url, headers=headers, timeout=self.timeout, stream=max_bytes is not None)
+            content = raw.content if max_bytes is None else _read_capped(raw, max_bytes)
+        
+        if raw.status_code == 304 and validator is not None:
+            self._count("not_modified")
+            cached = validator.response
+            return FetchResponse(url, 200, cached.headers, cached.content, from_cache=True)
+        
+        response = FetchResponse(url, raw.status_code, dict(raw.headers), content)
+        if conditional and raw.status_code == 200:
+            etag, last_modified = raw.headers.get("ETag"), raw.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._remember_validator(url, _Validator(etag, last_modified, response))
+        return response
+    
+    def _count(self, name: str) -> None:
+        # Dipanggil dari event loop dan dari thread executor
+        with self._stats_lock:
+            self._stats[name] += 1
+    
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            semaphore = self._host_limits.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_limits[host] = semaphore
+            return semaphore
+    
+    def _validator(self, url: str) -> Optional[_Validator]:
+        with self._validators_lock:
+            validator = self._validators.get(url)
+            if validator is not None:
+                self._validators.move_to_end(url)
+            return validator
+    
+    def _remember_validator(self, url: str, validator: _Validator) -> None:
+        with self._validators_lock:
+            self._validators[url] = validator
+            self._validators.move_to_end(url)
+            while len(self._validators) > self.validator_cache_size:
+                self._validators.popitem(last=False)
+    
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: acak antara 0 dan base * 2^attempt (dibatasi backoff_max)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+    
+    def _retry_after(self, response: FetchResponse) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        try:
+            return min(self.backoff_max, float(value)) if value else None
+        except ValueError:
+            return None
+
+def _read_capped(raw: Any, max_bytes: int) -> bytes:
+    """Membaca body streaming sampai max_bytes lalu menutup koneksi ke pool"""
+    chunks = []
+    size = 0
+    try:
+        for chunk in raw.iter_content(chunk_size=16 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+    finally:
+        raw.close()
+    return b"".join(chunks)[:max_bytes]
+
+# Kuota default YouTube Data API v3: 10.000 unit/hari, search.list = 100 unit
+YOUTUBE_SEARCH_COST = 100.0
+YOUTUBE_DAILY_QUOTA = 10000.0
+
+def youtube_quota_bucket(daily_quota: float = YOUTUBE_DAILY_QUOTA, burst: float = 1000.0) -> TokenBucket:
+    """Token bucket yang menyebar kuota harian secara merata dengan burst terbatas"""
+    return TokenBucket(rate=daily_quota / 86400, capacity=burst, max_wait=5.0)
+
+class YouTubeDataBackend:
+    """AgentBackend untuk YouTubeAgent yang memanggil YouTube Data API v3 lewat Fetcher"""
+    
+    SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+    
+    def __init__(
+        self,
+        api_key: str,
+        fetcher: Fetcher,
+        bucket: Optional[TokenBucket] = None,
+        max_results: int = 10
+    ):
+        self.api_key = api_key
+        self.fetcher = fetcher
+        self.bucket = bucket or youtube_quota_bucket()
+        self.max_results = max_results
+    
+    async def call(self, operation: str, payload: Dict[str, Any]) -> Any:
+        if operation != "search":
+            return None
+        
+        # Operator "site:" hanya relevan untuk web search, bukan YouTube API
+        query = payload["query"].replace("site:youtube.com", "").strip()
+        response = await self.fetcher.get(
+            self.SEARCH_URL,
+            params={
+                "part": "snippet",
+                "type": "video",
+                "q": query,
+                "maxResults": self.max_results,
+                "key": self.api_key
+            },
+            bucket=self.bucket,
+            cost=YOUTUBE_SEARCH_COST
+        )
+        if response.status != 200:
+            raise RuntimeError(f"YouTube API error {response.status}")
+        return response.json().get("items", [])
+
+def parse_youtube_items(items: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Mengambil (video_id, snippet) dari hasil search.list"""
+    parsed = []
+    for item in items:
+        video_id = item.get("id", {}).get("videoId")
+        if video_id:
+            parsed.append((video_id, item.get("snippet", {})))
+    return parsed
@@ -0,0 +1,330 @@
+"""Engine eksekusi graph bergaya LangGraph dengan checkpoint per node.
+
+Setiap agent menjadi node dengan dependensi eksplisit:
+
+    reasoning -> {youtube, web} -> composer
+
+Node yang dependensinya sudah terpenuhi dijalankan paralel. Output setiap node
+disimpan ke `CheckpointStore` (SQLite) segera setelah selesai, sehingga run yang
+terputus (rerun Streamlit, refresh browser, crash) dilanjutkan dari node
+terakhir yang selesai alih-alih mulai dari awal.
+"""
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, AsyncIterator, Awaitable, Callable, Optional, Union
+
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer
+from core.cache import make_cache_key
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(".cache", "checkpoints.sqlite3")
+# Interval cek run_id yang sedang dipakai run lain (thread dan event loop lain)
+CLAIM_POLL_INTERVAL = 0.05
+
+# Node berupa coroutine function, atau async generator function untuk output bertahap
+NodeFn = Callable[[Dict[str, Any]], Union[Awaitable[Any], AsyncIterator[Any]]]
+
+@dataclass
+class Node:
+    name: str
+    fn: NodeFn
+    after: List[str] = field(default_factory=list)
+
+@dataclass
+class NodeEvent:
+    """Satu node selesai (atau satu item parsial dari node generator).
+
+    `resumed` True jika output diambil dari checkpoint; `partial` True jika event
+    hanya membawa satu item dari node yang masih berjalan.
+    """
+    node: str
+    output: Any
+    resumed: bool = False
+    partial: bool = False
+
+class CheckpointStore:
+    """Penyimpanan output node per run di SQLite"""
+    
+    def __init__(self, path: Optional[str] = DEFAULT_CHECKPOINT_PATH):
+        directory = os.path.dirname(path) if path else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._lock = threading.Lock()
+        # run_id -> [lock eksekusi, jumlah run yang memegang atau menunggu]
+        self._claims: Dict[str, List[Any]] = {}
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "run_id TEXT PRIMARY KEY, inputs TEXT NOT NULL, status TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "run_id TEXT NOT NULL, node TEXT NOT NULL, output TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (run_id, node))"
+            )
+            self._db.commit()
+    
+    @asynccontextmanager
+    async def claim(self, run_id: str) -> AsyncIterator[None]:
+        """Memegang run_id selama satu run; run lain (thread/event loop mana pun) menunggu giliran"""
+        with self._lock:
+            claim = self._claims.setdefault(run_id, [threading.Lock(), 0])
+            claim[1] += 1
+        try:
+            # Polling, bukan acquire di executor: pembatalan saat menunggu tidak meninggalkan lock terpegang
+            while not claim[0].acquire(blocking=False):
+                await asyncio.sleep(CLAIM_POLL_INTERVAL)
+            try:
+                yield
+            finally:
+                claim[0].release()
+        finally:
+            with self._lock:
+                claim[1] -= 1
+                if not claim[1]:
+                    del self._claims[run_id]
+    
+    def claimants(self, run_id: str) -> int:
+        """Jumlah run di proses ini yang sedang memegang atau menunggu run_id"""
+        with self._lock:
+            claim = self._claims.get(run_id)
+            return claim[1] if claim is not None else 0
+    
+    def start(self, run_id: str, inputs: Dict[str, Any]) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO runs (run_id, inputs, status, updated_at) VALUES (?, ?, 'running', ?) "
+                "ON CONFLICT(run_id) DO UPDATE SET status = 'running', updated_at = excluded.updated_at",
+                (run_id, json.dumps(inputs, ensure_ascii=False), time.time())
+            )
+            self._db.commit()
+    
+    def load(self, run_id: str) -> Dict[str, Any]:
+        """Output semua node yang sudah selesai untuk run ini"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT node, output FROM checkpoints WHERE run_id = ?", (run_id,)
+            ).fetchall()
+        return {node: json.loads(output) for node, output in rows}
+    
+    def save(self, run_id: str, node: str, output: Any) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints (run_id, node, output, created_at) VALUES (?, ?, ?, ?)",
+                (run_id, node, json.dumps(output, ensure_ascii=False), time.time())
+            )
+            self._db.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (time.time(), run_id))
+            self._db.commit()
+    
+    def finish(self, run_id: str, status: str = "done") -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?", (status, time.time(), run_id)
+            )
+            self._db.commit()
+    
+    def status(self, run_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT status FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return row[0] if row else None
+    
+    def discard(self, run_id: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM checkpoints WHERE run_id = ?", (run_id,))
+            self._db.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self._db.commit()
+    
+    def prune(self, older_than: float) -> int:
+        """Menghapus run yang tidak disentuh selama `older_than` detik"""
+        cutoff = time.time() - older_than
+        with self._lock:
+            run_ids = [row[0] for row in self._db.execute("SELECT run_id FROM runs WHERE updated_at < ?", (cutoff,))]
+            for run_id in run_ids:
+                self._db.execute("DELETE FROM checkpoints WHERE run_id = ?", (run_id,))
+                self._db.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self._db.commit()
+        return len(run_ids)
+    
+    def close(self) -> None:
+        self._db.close()
+
+class ExecutionGraph:
+    """DAG node async dengan eksekusi paralel dan resume dari checkpoint"""
+    
+    def __init__(self):
+        self.nodes: Dict[str, Node] = {}
+    
+    def add_node(self, name: str, fn: NodeFn, after: Optional[List[str]] = None) -> "ExecutionGraph":
+        for dependency in after or []:
+            if dependency not in self.nodes:
+                raise ValueError(f"Node '{name}' bergantung pada node yang belum didefinisikan: '{dependency}'")
+        if name in self.nodes or name == "inputs":
+            raise ValueError(f"Nama node tidak valid atau duplikat: '{name}'")
+        self.nodes[name] = Node(name, fn, list(after or []))
+        return self
+    
+    async def astream(
+        self,
+        run_id: str,
+        inputs: Dict[str, Any],
+        store: Optional[CheckpointStore] = None,
+        node_timeout: Optional[float] = None,
+        discard: bool = False
+    ) -> AsyncIterator[NodeEvent]:
+        """Menjalankan graph dan menghasilkan NodeEvent setiap kali satu node selesai.
+
+        State yang diterima node berisi `inputs` dan output setiap node sebelumnya
+        dengan nama node sebagai kunci. Node boleh berupa async generator: setiap
+        item yang di-yield dikirim sebagai NodeEvent dengan `partial=True`, dan
+        output akhir node adalah list semua item. Jika satu node gagal atau
+        melewati `node_timeout`, node lain yang sedang berjalan dibatalkan dan
+        exception diteruskan; checkpoint node yang sudah selesai tetap tersimpan.
+        
+        Di satu proses hanya satu run per `run_id` yang berjalan: run kedua
+        menunggu run pertama selesai lalu melanjutkan dari checkpoint-nya.
+        `discard` membuang checkpoint setelah run selesai jika tidak ada run lain
+        yang menunggu run_id yang sama.
+        """
+        # Run lain dengan run_id yang sama menunggu di sini lalu memutar ulang checkpoint-nya
+        claim = store.claim(run_id) if store is not None else nullcontext()
+        async with claim:
+            state: Dict[str, Any] = {"inputs": inputs}
+            completed = store.load(run_id) if store is not None else {}
+            if store is not None:
+                store.start(run_id, inputs)
+            
+            # Node tetap dilaporkan (sebagai resumed) agar pemanggil bisa merender hasilnya
+            for name in self.nodes:
+                if name in completed:
+                    state[name] = completed[name]
+                    yield NodeEvent(name, completed[name], resumed=True)
+            
+            events: asyncio.Queue = asyncio.Queue()
+            running: Dict[str, asyncio.Future] = {}
+            try:
+                while len(state) - 1 < len(self.nodes):
+                    for node in self.nodes.values():
+                        if node.name in state or node.name in running:
+                            continue
+                        if all(dependency in state for dependency in node.after):
+                            coro = self._drive(node, dict(state), events)
+                            if node_timeout is not None:
+                                coro = asyncio.wait_for(coro, node_timeout)
+                            running[node.name] = asyncio.ensure_future(coro)
+                    
+                    if not running:
+                        raise RuntimeError("Graph tidak dapat dilanjutkan (dependensi melingkar?)")
+                    
+                    # Tunggu event berikutnya, atau task yang gagal sebelum sempat mengirim event
+                    getter = asyncio.ensure_future(events.get())
+                    done, _ = await asyncio.wait([getter, *running.values()], return_when=asyncio.FIRST_COMPLETED)
+                    for name, task in list(running.items()):
+                        if task in done and task.exception() is not None:
+                            getter.cancel()
+                            raise task.exception()
+                    if getter not in done:
+                        getter.cancel()
+                        continue
+                    
+                    event = getter.result()
+                    if not event.partial:
+                        running.pop(event.node)
+                        state[event.node] = event.output
+                        if store is not None:
+                            store.save(run_id, event.node, event.output)
+                    yield event
+            except BaseException:
+                for task in running.values():
+                    task.cancel()
+                if store is not None:
+                    store.finish(run_id, "interrupted")
+                raise
+            
+            if store is not None:
+                store.finish(run_id)
+            
+            # Checkpoint hanya untuk run yang terputus; pemanggil terakhir yang masih
+            # menunggu run_id ini yang membuangnya
+            if store is not None and discard and store.claimants(run_id) == 1:
+                store.discard(run_id)
+    
+    async def _drive(self, node: Node, state: Dict[str, Any], events: asyncio.Queue) -> None:
+        result = node.fn(state)
+        if inspect.isasyncgen(result):
+            items = []
+            async for item in result:
+                items.append(item)
+                await events.put(NodeEvent(node.name, item, partial=True))
+            output = items
+        else:
+            output = await result
+        await events.put(NodeEvent(node.name, output))
+    
+    async def run(
+        self,
+        run_id: str,
+        inputs: Dict[str, Any],
+        store: Optional[CheckpointStore] = None,
+        node_timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Menjalankan graph sampai selesai dan mengembalikan state akhir"""
+        state = {"inputs": inputs}
+        async for event in self.astream(run_id, inputs, store, node_timeout):
+            if not event.partial:
+                state[event.node] = event.output
+        return state
+
+def build_curriculum_graph(
+    reasoning_agent: ReasoningAgent,
+    youtube_agent: YouTubeAgent,
+    web_agent: WebAgent,
+    composer: CurriculumComposer,
+    on_description: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> ExecutionGraph:
+    """Graph empat agent: reasoning -> {youtube, web} -> composer.
+
+    `on_description` menerima potongan deskripsi selama node composer berjalan;
+    output node composer tetap kurikulum lengkap.
+    """
+    
+    async def reasoning(state: Dict[str, Any]) -> Dict[str, Any]:
+        inputs = state["inputs"]
+        return await reasoning_agent.analyze(inputs["topic"], inputs["level"], inputs["duration"], inputs["format"])
+    
+    async def youtube(state: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        async for video in youtube_agent.iter_search(state["reasoning"]):
+            yield video
+    
+    async def web(state: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        async for reference in web_agent.iter_scrape(state["reasoning"]):
+            yield reference
+    
+    async def compose(state: Dict[str, Any]) -> Dict[str, Any]:
+        return await composer.compose(state["reasoning"], state["youtube"], state["web"], on_description)
+    
+    return (
+        ExecutionGraph()
+        .add_node("reasoning", reasoning)
+        .add_node("youtube", youtube, after=["reasoning"])
+        .add_node("web", web, after=["reasoning"])
+        .add_node("composer", compose, after=["youtube", "web"])
+    )
+
+def curriculum_run_id(topic: str, level: str, duration: int, format_type: List[str]) -> str:
+    """ID run deterministik: input yang sama setelah rerun/refresh melanjutkan run yang sama.
+
+    ID ini sama untuk semua sesi. `ExecutionGraph.astream` menjalankan satu run per
+    ID sekaligus, dan pemanggil meminta `discard=True` agar checkpoint dibuang
+    setelah run terakhir untuk ID itu selesai; hanya run yang terputus yang dilanjutkan.
+    """
+    key = make_cache_key(topic, level, duration, format_type)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
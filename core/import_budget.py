@@ -0,0 +1,82 @@
+"""Mengukur waktu cold-import core dan memastikan tetap di bawah budget.
+
+    python -m core.import_budget            # cek dengan budget default
+    python -m core.import_budget --budget-ms 100
+
+Setiap pengukuran berjalan di interpreter baru sehingga tidak ada modul yang
+sudah ter-cache. Gagal (exit 1) jika median melebihi budget atau jika modul
+UI/dependency berat ikut ter-import.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Any, Optional
+
+# Budget cold-import modul pipeline inti (ms), di luar startup interpreter
+IMPORT_BUDGET_MS = 150.0
+
+CORE_MODULES = ["core.agents", "core.pipeline", "core.batch"]
+
+# Modul yang tidak boleh ikut ter-import oleh core
+FORBIDDEN_MODULES = [
+    "streamlit",
+    "langchain",
+    "langgraph",
+    "google.generativeai",
+    "pytube",
+    "bs4",
+    "requests",
+    "numpy",
+    # Stdlib yang hanya dibutuhkan saat store/ekstraksi dipakai; di-import di dalam fungsi
+    "sqlite3",
+    "html.parser",
+]
+
+_PROBE = """
+import json, sys, time
+modules = json.loads(sys.argv[1])
+started = time.perf_counter()
+for name in modules:
+    __import__(name)
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({"ms": elapsed, "loaded": [m for m in json.loads(sys.argv[2]) if m in sys.modules]}))
+"""
+
+def measure(modules: List[str] = CORE_MODULES, runs: int = 5) -> Dict[str, Any]:
+    """Median waktu import dan daftar modul terlarang yang ikut dimuat"""
+    timings = []
+    loaded = set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE, json.dumps(modules), json.dumps(FORBIDDEN_MODULES)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output)
+        timings.append(result["ms"])
+        loaded.update(result["loaded"])
+    
+    return {"median_ms": statistics.median(timings), "max_ms": max(timings), "forbidden_loaded": sorted(loaded)}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cek budget waktu import core")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+    
+    result = measure(runs=args.runs)
+    print(f"Import {', '.join(CORE_MODULES)}: median {result['median_ms']:.1f} ms "
+          f"(maks {result['max_ms']:.1f} ms, budget {args.budget_ms:.0f} ms)")
+    
+    ok = True
+    if result["median_ms"] > args.budget_ms:
+        print("GAGAL: waktu import melebihi budget", file=sys.stderr)
+        ok = False
+    if result["forbidden_loaded"]:
+        print(f"GAGAL: modul berat ikut ter-import: {', '.join(result['forbidden_loaded'])}", file=sys.stderr)
+        ok = False
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+"""Antrean job generasi berbasis SQLite dan pool worker multi-proses.
+
+Streamlit menjalankan script setiap sesi sebagai thread dalam satu proses,
+sehingga stage yang berat di CPU (parsing HTML, scoring, komposisi) dari
+banyak pengguna berebut satu GIL. Dengan antrean ini UI hanya mengirim job
+dan memantau statusnya; pipeline dijalankan oleh proses worker terpisah.
+
+    python -m core.jobs --workers 4                      # jalankan pool worker
+    python -m core.jobs --workers 4 --cache .cache/curricula.sqlite3
+
+Job interaktif (UI) selalu diambil sebelum job batch. `submit` menolak job
+baru (QueueFull) saat antrean penuh sehingga beban tidak menumpuk tanpa batas.
+Job identik yang masih antre atau berjalan tidak diduplikasi.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Any, Optional
+
+from core.cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = os.path.join(".cache", "jobs.sqlite3")
+PRIORITIES = {"interactive": 0, "batch": 10}
+DEFAULT_MAX_QUEUED = 200
+# Job "running" tanpa kemajuan selama ini dianggap milik worker yang mati
+DEFAULT_LEASE = 300.0
+POLL_INTERVAL = 0.2
+
+class QueueFull(Exception):
+    """Antrean sudah mencapai `max_queued`; pemanggil sebaiknya mencoba lagi nanti"""
+
+class JobQueue:
+    """Antrean job prioritas di SQLite yang aman dipakai bersama oleh banyak proses"""
+    
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, max_queued: int = DEFAULT_MAX_QUEUED):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_queued = max_queued
+        # Autocommit; transaksi yang perlu atomik dibuka eksplisit dengan BEGIN IMMEDIATE.
+        # Lock menjaga agar thread lain (sesi Streamlit) tidak menyisip di tengah transaksi.
+        self._db = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, dedupe_key TEXT NOT NULL, priority INTEGER NOT NULL, status TEXT NOT NULL, "
+            "params TEXT NOT NULL, stage TEXT, progress INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, "
+            "worker TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, priority, created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs(dedupe_key, status)")
+    
+    def submit(self, params: Dict[str, Any], priority: str = "interactive") -> str:
+        """Menambahkan job (atau mengembalikan job identik yang belum selesai) dan mengembalikan ID-nya"""
+        dedupe_key = make_cache_key(params["topic"], params["level"], params["duration"], params["formats"])
+        now = time.time()
+        with self._transaction():
+            row = self._db.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running')", (dedupe_key,)
+            ).fetchone()
+            if row is not None:
+                # Job interaktif yang menunggu job batch identik ikut menaikkan prioritasnya
+                self._db.execute(
+                    "UPDATE jobs SET priority = MIN(priority, ?) WHERE id = ?", (PRIORITIES[priority], row[0])
+                )
+                return row[0]
+            
+            queued = self._db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if queued >= self.max_queued:
+                raise QueueFull(f"Antrean penuh ({queued} job menunggu)")
+            
+            job_id = uuid.uuid4().hex
+            self._db.execute(
+                "INSERT INTO jobs (id, dedupe_key, priority, status, params, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, dedupe_key, PRIORITIES[priority], json.dumps(params, ensure_ascii=False), now, now)
+            )
+            return job_id
+    
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Mengambil job prioritas tertinggi secara atomik, atau None jika antrean kosong"""
+        with self._transaction():
+            row = self._db.execute(
+                "SELECT id, params FROM jobs WHERE status = 'queued' ORDER BY priority, created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, updated_at = ? WHERE id = ?",
+                (worker, time.time(), row[0])
+            )
+        return {"id": row[0], "params": json.loads(row[1])}
+    
+    def progress(self, job_id: str, stage: str, progress: int) -> None:
+        self._execute(
+            "UPDATE jobs SET stage = ?, progress = ?, updated_at = ? WHERE id = ?",
+            (stage, progress, time.time(), job_id)
+        )
+    
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        self._execute(
+            "UPDATE jobs SET status = 'done', progress = 100, result = ?, updated_at = ? WHERE id = ?",
+            (json.dumps(result, ensure_ascii=False), time.time(), job_id)
+        )
+    
+    def fail(self, job_id: str, error: str) -> None:
+        self._execute(
+            "UPDATE jobs SET status = 'error', error = ?, updated_at = ? WHERE id = ?",
+            (error, time.time(), job_id)
+        )
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT status, stage, progress, result, error FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        status, stage, progress, result, error = rows[0]
+        return {
+            "id": job_id,
+            "status": status,
+            "stage": stage,
+            "progress": progress,
+            "result": json.loads(result) if result else None,
+            "error": error
+        }
+    
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll: float = POLL_INTERVAL) -> Dict[str, Any]:
+        """Polling sampai job selesai atau gagal; TimeoutError jika melewati `timeout`"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job["status"] in ("done", "error"):
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Job {job_id} belum selesai dalam {timeout} detik")
+            time.sleep(poll)
+    
+    def requeue_stale(self, lease: float = DEFAULT_LEASE) -> int:
+        """Mengembalikan job 'running' yang tidak bergerak selama `lease` detik ke antrean"""
+        return self._execute(
+            "UPDATE jobs SET status = 'queued', worker = NULL, updated_at = ? "
+            "WHERE status = 'running' AND updated_at < ?",
+            (time.time(), time.time() - lease)
+        )
+    
+    def prune(self, older_than: float = 24 * 3600) -> int:
+        """Menghapus job selesai/gagal yang lebih lama dari `older_than` detik"""
+        return self._execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'error') AND updated_at < ?", (time.time() - older_than,)
+        )
+    
+    def stats(self) -> Dict[str, int]:
+        rows = self._query("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return {status: count for status, count in rows}
+    
+    def close(self) -> None:
+        self._db.close()
+    
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        """Menjalankan satu perintah tulis dan mengembalikan jumlah baris yang terdampak"""
+        with self._lock:
+            return self._db.execute(sql, params).rowcount
+    
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+    
+    def _transaction(self) -> "_ImmediateTransaction":
+        return _ImmediateTransaction(self._db, self._lock)
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK: mengunci penulis lain selama transaksi"""
+    
+    def __init__(self, db: sqlite3.Connection, lock: threading.Lock):
+        self._db = db
+        self._lock = lock
+    
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._db
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._db.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+        finally:
+            self._lock.release()
+
+def run_worker(queue_path: str, cache_path: Optional[str] = None, poll: float = POLL_INTERVAL) -> None:
+    """Loop satu proses worker: ambil job, jalankan pipeline, tulis hasil"""
+    from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer
+    from core.cache import CurriculumCache
+    from core.catalog import VideoCatalog
+    from core.extract import PageExtractionPool
+    from core.memo import StageMemoizer
+    from core.pipeline import iter_pipeline
+    
+    # Hanya proses induk yang menangani Ctrl+C; worker dihentikan lewat terminate()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    queue = JobQueue(queue_path)
+    worker = f"{os.getpid()}"
+    memo = StageMemoizer()
+    cache = catalog = None
+    if cache_path:
+        cache = CurriculumCache(cache_path)
+        # Semua worker berbagi satu file katalog; tambahan worker lain disusul lewat sync()
+        catalog = VideoCatalog(os.path.join(os.path.dirname(cache_path) or ".", "video_catalog.sqlite3"))
+    reasoning_agent = ReasoningAgent(os.environ.get("GEMINI_API_KEY", ""), memo=memo)
+    youtube_agent = YouTubeAgent(os.environ.get("YOUTUBE_API_KEY"), memo=memo, catalog=catalog)
+    # Worker adalah proses daemon: pool ini memakai thread (lihat PageExtractionPool.executor)
+    web_agent = WebAgent(memo=memo, extractor=PageExtractionPool())
+    composer = CurriculumComposer()
+    
+    async def run(job: Dict[str, Any]) -> Dict[str, Any]:
+        params = job["params"]
+        result: Dict[str, Any] = {}
+        async for stage, output in iter_pipeline(
+            reasoning_agent, youtube_agent, web_agent, composer,
+            params["topic"], params["level"], params["duration"], params["formats"], cache
+        ):
+            if stage == "description":
+                continue
+            result[stage] = output
+            # Empat stage (requirements, videos, references, curriculum) masing-masing 25%
+            queue.progress(job["id"], stage, 100 if stage == "curriculum" else 25 * len(result))
+        return result
+    
+    while True:
+        job = queue.claim(worker)
+        if job is None:
+            time.sleep(poll)
+            continue
+        try:
+            queue.complete(job["id"], asyncio.run(run(job)))
+        except Exception as e:
+            logger.exception("Job %s gagal", job["id"])
+            queue.fail(job["id"], str(e))
+
+class WorkerPool:
+    """Sekumpulan proses worker yang mengonsumsi satu JobQueue.
+    
+    Thread supervisor mengembalikan job milik worker yang mati ke antrean
+    (`requeue_stale`) setiap `lease / 10` detik dan menggantikan proses worker
+    yang berhenti, sehingga pool yang tertanam di proses lain (Streamlit) tetap
+    pulih tanpa restart.
+    """
+    
+    def __init__(
+        self,
+        workers: int = 2,
+        queue_path: str = DEFAULT_QUEUE_PATH,
+        cache_path: Optional[str] = None,
+        lease: float = DEFAULT_LEASE
+    ):
+        self.workers = workers
+        self.queue_path = queue_path
+        self.cache_path = cache_path
+        self.lease = lease
+        # spawn: worker tidak mewarisi state thread/Streamlit dari proses induk
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: List[multiprocessing.Process] = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+    
+    def start(self) -> "WorkerPool":
+        # Job milik worker yang mati di run sebelumnya dikembalikan ke antrean
+        queue = JobQueue(self.queue_path)
+        queue.requeue_stale(self.lease)
+        with self._lock:
+            self._processes = [self._spawn(index) for index in range(self.workers)]
+        threading.Thread(target=self._supervise, args=(queue,), name="worker-supervisor", daemon=True).start()
+        return self
+    
+    def _spawn(self, index: int) -> multiprocessing.Process:
+        process = self._context.Process(
+            target=run_worker,
+            args=(self.queue_path, self.cache_path),
+            name=f"curriculum-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        return process
+    
+    def _supervise(self, queue: "JobQueue") -> None:
+        while not self._stopping.wait(self.lease / 10):
+            try:
+                requeued = queue.requeue_stale(self.lease)
+            except sqlite3.Error:
+                logger.warning("requeue_stale gagal; dicoba lagi pada putaran berikutnya", exc_info=True)
+                requeued = 0
+            if requeued:
+                logger.warning("%d job tanpa kemajuan dikembalikan ke antrean", requeued)
+            with self._lock:
+                for index, process in enumerate(self._processes):
+                    if not process.is_alive() and not self._stopping.is_set():
+                        logger.warning("Worker %s berhenti (exit %s), diganti", process.name, process.exitcode)
+                        self._processes[index] = self._spawn(index)
+    
+    def alive(self) -> int:
+        with self._lock:
+            return sum(process.is_alive() for process in self._processes)
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        with self._lock:
+            processes, self._processes = self._processes, []
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join(timeout)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pool worker untuk antrean job kurikulum")
+    parser.add_argument("-w", "--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="Path SQLite antrean job")
+    parser.add_argument("--cache", help="Path SQLite cache kurikulum (opsional)")
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE, help="Batas detik job running tanpa kemajuan")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.INFO)
+    pool = WorkerPool(args.workers, args.queue, args.cache, args.lease).start()
+    logger.info("%d worker berjalan, antrean %s", args.workers, args.queue)
+    try:
+        # Requeue job macet dan penggantian worker ditangani supervisor pool
+        while pool.alive():
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
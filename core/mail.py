@@ -0,0 +1,288 @@
+"""Pengiriman kurikulum lewat email dengan antrean keluar yang dikirim per batch.
+
+`EmailQueue` tidak pernah mengirim di thread UI: pesan dimasukkan ke antrean
+dan satu thread latar belakang mengirimnya per batch lewat satu koneksi SMTP.
+Pesan yang gagal sementara (koneksi putus, balasan 4xx) dicoba lagi hingga
+`MAX_ATTEMPTS` kali; penolakan permanen (5xx, fitur yang tidak didukung server)
+langsung dihitung gagal.
+
+Tanpa server SMTP sungguhan (KURIKULUM_SMTP_HOST tidak diisi), `LocalSMTPServer`
+berperan sebagai stand-in yang menyimpan setiap pesan sebagai file .eml:
+
+    python -m core.mail --port 8025 --outbox .cache/outbox
+"""
+import argparse
+import asyncio
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+import uuid
+from email.message import EmailMessage
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTBOX = os.path.join(".cache", "outbox")
+DEFAULT_SMTP_PORT = 8025
+DEFAULT_SENDER = "kurikulum@localhost"
+# Jumlah pesan maksimum per koneksi SMTP dan lama menunggu batch terisi (detik)
+BATCH_SIZE = 20
+BATCH_WINDOW = 1.0
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 5.0
+MAX_MESSAGE_BYTES = 10 * 1024 * 1024
+
+def build_curriculum_email(
+    to: str,
+    curriculum: Dict[str, Any],
+    body: str,
+    attachments: List[Tuple[str, bytes, str]],
+    sender: str = DEFAULT_SENDER
+) -> EmailMessage:
+    """Email berisi ringkasan teks dan lampiran (nama file, isi, mime type)"""
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = to
+    message["Subject"] = f"Kurikulum: {curriculum['title']}"
+    message.set_content(body)
+    for filename, data, mime in attachments:
+        maintype, _, subtype = mime.partition("/")
+        message.add_attachment(data, maintype=maintype, subtype=subtype, filename=filename)
+    return message
+
+class EmailQueue:
+    """Antrean email keluar; satu thread daemon mengirim per batch"""
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_SMTP_PORT,
+        batch_size: int = BATCH_SIZE,
+        batch_window: float = BATCH_WINDOW,
+        max_pending: int = 1000
+    ):
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._stats = {"sent": 0, "failed": 0, "batches": 0}
+        self._lock = threading.Lock()
+        # Pesan yang belum terkirim maupun gagal final, termasuk yang menunggu retry
+        self._outstanding = 0
+        self._idle = threading.Condition(self._lock)
+        threading.Thread(target=self._run, name="email-queue", daemon=True).start()
+    
+    def send(self, message: EmailMessage) -> None:
+        """Memasukkan pesan ke antrean; queue.Full jika antrean penuh"""
+        with self._lock:
+            self._outstanding += 1
+        try:
+            self._queue.put_nowait((message, 1))
+        except queue.Full:
+            self._settle()
+            raise
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Menunggu semua pesan terkirim atau gagal final (termasuk retry); False jika `timeout` lewat"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._outstanding == 0, timeout)
+    
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Pesan yang datang dalam jendela batch ikut dikirim lewat koneksi yang sama
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._send_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _send_batch(self, batch: List[Tuple[EmailMessage, int]]) -> None:
+        with self._lock:
+            self._stats["batches"] += 1
+        pending = list(batch)
+        failed: List[Tuple[EmailMessage, int]] = []
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=30) as smtp:
+                while pending:
+                    message, attempt = pending[0]
+                    try:
+                        smtp.send_message(message)
+                        self._count("sent")
+                    except (smtplib.SMTPException, ValueError) as e:
+                        logger.warning("Gagal mengirim email ke %s", message["To"], exc_info=True)
+                        # Penolakan permanen tidak akan berhasil jika dicoba lagi
+                        failed.append((message, MAX_ATTEMPTS if is_permanent(e) else attempt))
+                    pending.pop(0)
+        except OSError:
+            logger.warning("Koneksi SMTP ke %s:%d gagal", self.host, self.port, exc_info=True)
+            failed.extend(pending)
+        
+        for message, attempt in failed:
+            if attempt >= MAX_ATTEMPTS:
+                self._count("failed")
+                continue
+            threading.Timer(RETRY_DELAY, self._retry, (message, attempt + 1)).start()
+    
+    def _retry(self, message: EmailMessage, attempt: int) -> None:
+        try:
+            self._queue.put_nowait((message, attempt))
+        except queue.Full:
+            self._count("failed")
+    
+    def _count(self, result: str) -> None:
+        """Mencatat hasil final satu pesan ("sent" / "failed")"""
+        with self._lock:
+            self._stats[result] += 1
+        metrics.inc("emails_total", result=result)
+        self._settle()
+    
+    def _settle(self) -> None:
+        with self._idle:
+            self._outstanding -= 1
+            if not self._outstanding:
+                self._idle.notify_all()
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "pending": self._outstanding}
+
+def is_permanent(error: Exception) -> bool:
+    """True untuk kegagalan kirim yang tidak akan berubah jika dicoba lagi"""
+    if isinstance(error, (smtplib.SMTPNotSupportedError, ValueError)):
+        # Mis. alamat non-ASCII ke server tanpa SMTPUTF8, atau header yang tidak valid
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+class LocalSMTPServer:
+    """Server SMTP minimal (asyncio) yang menyimpan setiap pesan ke folder outbox"""
+    
+    def __init__(self, outbox: str = DEFAULT_OUTBOX):
+        self.outbox = outbox
+        os.makedirs(outbox, exist_ok=True)
+    
+    async def serve(self, host: str, port: int, ready: Optional[threading.Event] = None) -> None:
+        server = await asyncio.start_server(self.handle, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+        logger.info("SMTP stand-in mendengarkan di %s:%d, outbox %s", host, self.port, self.outbox)
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+    
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Menjalankan server di thread daemon; mengembalikan port yang dipakai"""
+        ready = threading.Event()
+        threading.Thread(
+            target=lambda: asyncio.run(self.serve(host, port, ready)), name="smtp-stand-in", daemon=True
+        ).start()
+        if not ready.wait(5):
+            raise RuntimeError("SMTP stand-in gagal dijalankan")
+        return self.port
+    
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        sender, recipients = None, []
+        
+        async def reply(line: str) -> None:
+            writer.write(line.encode("ascii") + b"\r\n")
+            await writer.drain()
+        
+        try:
+            await reply("220 localhost SMTP stand-in kurikulum")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command, _, argument = line.decode("latin-1").strip().partition(" ")
+                command = command.upper()
+                if command == "EHLO":
+                    await reply(f"250-localhost\r\n250-SIZE {MAX_MESSAGE_BYTES}\r\n250 8BITMIME")
+                elif command == "HELO":
+                    await reply("250 localhost")
+                elif command == "MAIL":
+                    sender, recipients = argument.partition(":")[2].split(" ")[0].strip("<>"), []
+                    await reply("250 OK")
+                elif command == "RCPT":
+                    recipients.append(argument.partition(":")[2].strip().strip("<>"))
+                    await reply("250 OK")
+                elif command == "DATA":
+                    if not recipients:
+                        await reply("503 RCPT dulu")
+                        continue
+                    await reply("354 Akhiri dengan <CRLF>.<CRLF>")
+                    data = await self._read_data(reader)
+                    if data is None:
+                        await reply(f"552 Pesan melebihi batas {MAX_MESSAGE_BYTES} byte")
+                    else:
+                        await reply(f"250 OK {self._save(sender, recipients, data)}")
+                    sender, recipients = None, []
+                elif command == "RSET":
+                    sender, recipients = None, []
+                    await reply("250 OK")
+                elif command == "NOOP":
+                    await reply("250 OK")
+                elif command == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Perintah tidak didukung")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _read_data(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        """Isi DATA sampai baris ".", atau None jika melebihi MAX_MESSAGE_BYTES (tetap dibaca habis)"""
+        lines: List[bytes] = []
+        size = 0
+        while True:
+            line = await reader.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                break
+            if line.startswith(b".."):
+                line = line[1:]
+            size += len(line)
+            if size <= MAX_MESSAGE_BYTES:
+                lines.append(line)
+        return b"".join(lines) if size <= MAX_MESSAGE_BYTES else None
+    
+    def _save(self, sender: Optional[str], recipients: List[str], data: bytes) -> str:
+        message_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        envelope = f"X-Envelope-From: {sender or ''}\r\nX-Envelope-To: {', '.join(recipients)}\r\n"
+        path = os.path.join(self.outbox, f"{message_id}.eml")
+        with open(path + ".partial", "wb") as f:
+            f.write(envelope.encode("utf-8") + data)
+        os.replace(path + ".partial", path)
+        return message_id
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="SMTP stand-in lokal yang menyimpan email ke folder")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_SMTP_PORT)
+    parser.add_argument("--outbox", default=DEFAULT_OUTBOX)
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(LocalSMTPServer(args.outbox).serve(args.host, args.port))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+from core.metrics import metrics
+
+_MISSING = object()
+
+@dataclass
+class StageConfig:
+    """Aturan memoization untuk satu stage agent"""
+    ttl: Optional[float] = 3600.0  # None = tidak pernah kedaluwarsa
+    max_items: int = 1024
+    enabled: bool = True
+
+# Stage yang dimemoisasi oleh agent beserta kunci input-nya
+DEFAULT_STAGE_CONFIG: Dict[str, StageConfig] = {
+    "competencies": StageConfig(ttl=24 * 3600, max_items=2048),  # (topic, level)
+    "video_search": StageConfig(ttl=6 * 3600, max_items=2048),   # query string video
+    "web_content": StageConfig(ttl=6 * 3600, max_items=8192),    # satu query web
+}
+
+class StageMemo:
+    """LRU dengan TTL untuk output satu stage"""
+    
+    def __init__(self, config: StageConfig):
+        self.config = config
+        self._items: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """Mengembalikan nilai tersimpan atau `default` (_MISSING jika tidak diberikan)"""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._items[key]
+            self.misses += 1
+            return default
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        ttl = self.config.ttl
+        expires_at = float("inf") if ttl is None else time.time() + ttl
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.config.max_items:
+                self._items.popitem(last=False)
+    
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """Menghapus semua entri (atau yang cocok dengan predicate), mengembalikan jumlahnya"""
+        with self._lock:
+            if predicate is None:
+                count = len(self._items)
+                self._items.clear()
+                return count
+            keys = [key for key in self._items if predicate(key)]
+            for key in keys:
+                del self._items[key]
+            return len(keys)
+    
+    def __len__(self) -> int:
+        return len(self._items)
+
+class StageMemoizer:
+    """Kumpulan StageMemo per stage sehingga perubahan input hanya menjalankan ulang stage terkait"""
+    
+    def __init__(self, config: Optional[Dict[str, StageConfig]] = None):
+        self.config = dict(DEFAULT_STAGE_CONFIG)
+        if config:
+            self.config.update(config)
+        self._stages: Dict[str, StageMemo] = {}
+        self._lock = threading.Lock()
+    
+    def stage(self, name: str) -> StageMemo:
+        with self._lock:
+            memo = self._stages.get(name)
+            if memo is None:
+                memo = StageMemo(self.config.get(name, StageConfig()))
+                self._stages[name] = memo
+            return memo
+    
+    def memoize(self, stage: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Mengambil output stage dari memo, atau menghitung dan menyimpannya"""
+        memo = self.stage(stage)
+        if not memo.config.enabled:
+            return compute()
+        
+        value = memo.get(key)
+        metrics.inc("cache_requests_total", cache=stage, result="miss" if value is _MISSING else "hit")
+        if value is _MISSING:
+            value = compute()
+            memo.set(key, value)
+        return value
+    
+    async def memoize_async(self, stage: str, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Versi async dari memoize untuk panggilan backend"""
+        memo = self.stage(stage)
+        if not memo.config.enabled:
+            return await compute()
+        
+        value = memo.get(key)
+        metrics.inc("cache_requests_total", cache=stage, result="miss" if value is _MISSING else "hit")
+        if value is _MISSING:
+            value = await compute()
+            memo.set(key, value)
+        return value
+    
+    def invalidate(self, stage: Optional[str] = None, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """Invalidasi satu stage, atau semua stage jika `stage` None"""
+        names = [stage] if stage else list(self._stages)
+        return sum(self.stage(name).invalidate(predicate) for name in names)
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {"hits": memo.hits, "misses": memo.misses, "items": len(memo)}
+            for name, memo in self._stages.items()
+        }
@@ -0,0 +1,280 @@
+"""Metrik operasional per proses yang di-flush berkala ke store SQLite bersama.
+
+Hot path (`inc`, `observe`, `touch_session`) hanya menulis ke dict milik thread
+pemanggil, tanpa lock dan tanpa I/O. Thread flusher menjumlahkan semua shard
+setiap `interval` detik dan menulis total kumulatif proses ini ke
+`.cache/metrics.sqlite3`, satu baris per (proses, seri). Pembaca (landing page
+Streamlit, endpoint /metrics) menjumlahkan baris dari semua worker.
+
+Nama seri memakai format Prometheus, misalnya
+`cache_requests_total{cache="curriculum",result="hit"}`.
+"""
+import atexit
+import os
+import threading
+import time
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+DEFAULT_METRICS_PATH = os.path.join(".cache", "metrics.sqlite3")
+FLUSH_INTERVAL = 10.0
+# Sesi dianggap aktif jika ada interaksi dalam jendela ini (detik)
+SESSION_WINDOW = 300.0
+# Gauge dari proses yang tidak flush selama ini tidak ikut dijumlahkan
+GAUGE_FRESHNESS = 3 * FLUSH_INTERVAL
+# Counter proses yang tidak flush selama ini dilipat ke baris "retired"
+STALE_PROCESS_AFTER = 3600.0
+RETIRED_PROCESS = "retired"
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+GAUGES = {"active_sessions"}
+
+HELP = {
+    "curricula_generated_total": "Kurikulum yang benar-benar disusun (bukan diambil dari cache)",
+    "videos_curated_total": "Video dalam kurikulum yang disusun",
+    "references_collected_total": "Referensi dalam kurikulum yang disusun",
+    "active_sessions": "Sesi dengan interaksi dalam 5 menit terakhir",
+    "pipeline_latency_seconds": "Latensi pipeline end-to-end",
+    "cache_requests_total": "Lookup cache menurut hasil (hit/miss)",
+    "admission_requests_total": "Keputusan admission control (admitted atau alasan penolakan)",
+    "degraded_responses_total": "Respons yang dilayani lewat jalur degradasi menurut mode",
+    "exports_total": "File export yang dirender menurut format",
+    "emails_total": "Email kurikulum menurut hasil pengiriman (sent/failed)",
+    "prefetch_total": "Kerja prefetch latar belakang (warm-up/spekulatif) menurut hasil",
+}
+
+def series(name: str, labels: Optional[Dict[str, Any]] = None) -> str:
+    """Nama seri bergaya Prometheus dengan label terurut"""
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{key}="{labels[key]}"' for key in sorted(labels)) + "}"
+
+def base_name(key: str) -> str:
+    return key.split("{", 1)[0]
+
+class Metrics:
+    """Counter, histogram dan gauge sesi yang diagregasi per thread tanpa lock"""
+    
+    def __init__(self):
+        self.process_id = f"{os.getpid()}-{os.urandom(4).hex()}"
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[str, float]]] = []
+        self._retired: Dict[str, float] = {}
+        self._sessions: Dict[str, float] = {}
+        self._lock = threading.Lock()  # hanya untuk registrasi shard dan agregasi
+        self._flusher: Optional[threading.Thread] = None
+        self._store: Optional["MetricsStore"] = None
+    
+    def _shard(self) -> Dict[str, float]:
+        shard = getattr(self._local, "values", None)
+        if shard is None:
+            shard = {}
+            self._local.values = shard
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+    
+    def inc(self, name: str, amount: float = 1, **labels: Any) -> None:
+        shard = self._shard()
+        key = series(name, labels)
+        shard[key] = shard.get(key, 0) + amount
+    
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels: Any) -> None:
+        """Mencatat satu observasi histogram (bucket kumulatif, _sum dan _count)"""
+        shard = self._shard()
+        for bound in buckets:
+            # Bucket yang tidak terisi tetap ditulis (0) agar set bucket konsisten
+            key = series(f"{name}_bucket", {**labels, "le": bound})
+            shard[key] = shard.get(key, 0) + (value <= bound)
+        key = series(f"{name}_bucket", {**labels, "le": "+Inf"})
+        shard[key] = shard.get(key, 0) + 1
+        key = series(f"{name}_sum", labels)
+        shard[key] = shard.get(key, 0) + value
+        key = series(f"{name}_count", labels)
+        shard[key] = shard.get(key, 0) + 1
+    
+    def touch_session(self, session_id: str) -> None:
+        """Menandai sesi sebagai aktif; assignment dict tunggal aman tanpa lock"""
+        self._sessions[session_id] = time.time()
+    
+    def record_generation(self, curriculum: Dict[str, Any], latency: Optional[float] = None) -> None:
+        """Mencatat satu kurikulum yang baru disusun beserta jumlah video/referensinya"""
+        self.inc("curricula_generated_total")
+        self.inc("videos_curated_total", len(curriculum.get("videos", [])))
+        self.inc("references_collected_total", len(curriculum.get("references", [])))
+        if latency is not None:
+            self.observe("pipeline_latency_seconds", latency)
+    
+    def snapshot(self) -> Dict[str, float]:
+        """Total kumulatif proses ini, termasuk gauge sesi aktif"""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                    _merge(totals, dict(shard))
+                else:
+                    # Thread sudah selesai (mis. script run Streamlit): lipat ke total tetap
+                    _merge(self._retired, shard)
+            self._shards = alive
+            _merge(totals, self._retired)
+        
+        cutoff = time.time() - SESSION_WINDOW
+        for session_id, seen in list(self._sessions.items()):
+            if seen < cutoff:
+                self._sessions.pop(session_id, None)
+        totals["active_sessions"] = len(self._sessions)
+        return totals
+    
+    def start_flusher(self, store: "MetricsStore", interval: float = FLUSH_INTERVAL) -> None:
+        """Memulai thread yang menulis snapshot ke store setiap `interval` detik (sekali per proses)"""
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._store = store
+            self._flusher = threading.Thread(target=self._flush_loop, args=(interval,), name="metrics-flusher", daemon=True)
+            self._flusher.start()
+        atexit.register(self.flush)
+    
+    def flush(self) -> None:
+        if self._store is not None:
+            self._store.write(self.process_id, self.snapshot())
+    
+    def _flush_loop(self, interval: float) -> None:
+        import sqlite3
+        
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # Store sedang dikunci worker lain; total kumulatif ikut di flush berikutnya
+                continue
+    
+    def read(self, store: Optional["MetricsStore"] = None) -> Dict[str, float]:
+        """Total semua worker: isi store ditambah snapshot terbaru proses ini"""
+        store = store or self._store
+        if store is None:
+            return self.snapshot()
+        totals = store.read(exclude_process=self.process_id)
+        _merge(totals, self.snapshot())
+        return totals
+
+def _merge(target: Dict[str, float], values: Dict[str, float]) -> None:
+    for key, value in values.items():
+        target[key] = target.get(key, 0) + value
+
+class MetricsStore:
+    """Total kumulatif per proses di SQLite, dibagi oleh semua worker Streamlit/service"""
+    
+    def __init__(self, path: str = DEFAULT_METRICS_PATH, stale_after: float = STALE_PROCESS_AFTER):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        import sqlite3
+        
+        self.stale_after = stale_after
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS metrics ("
+                "process TEXT NOT NULL, series TEXT NOT NULL, value REAL NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (process, series))"
+            )
+            self._db.commit()
+    
+    def write(self, process_id: str, values: Dict[str, float]) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO metrics (process, series, value, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(process, series) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                [(process_id, key, value, now) for key, value in values.items()]
+            )
+            self._retire_stale(now)
+            self._db.commit()
+    
+    def read(self, exclude_process: Optional[str] = None) -> Dict[str, float]:
+        """Jumlah counter semua proses; gauge hanya dari proses yang masih hidup"""
+        cutoff = time.time() - GAUGE_FRESHNESS
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT series, value, updated_at FROM metrics WHERE process != ?", (exclude_process or "",)
+            ).fetchall()
+        
+        totals: Dict[str, float] = {}
+        for key, value, updated_at in rows:
+            if base_name(key) in GAUGES and updated_at < cutoff:
+                continue
+            totals[key] = totals.get(key, 0) + value
+        return totals
+    
+    def _retire_stale(self, now: float) -> None:
+        """Melipat counter worker yang sudah mati ke satu baris agar tabel tidak tumbuh terus"""
+        cutoff = now - self.stale_after
+        stale = self._db.execute(
+            "SELECT process, series, value FROM metrics WHERE updated_at < ? AND process != ?",
+            (cutoff, RETIRED_PROCESS)
+        ).fetchall()
+        for process, key, value in stale:
+            if base_name(key) not in GAUGES:
+                self._db.execute(
+                    "INSERT INTO metrics (process, series, value, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(process, series) DO UPDATE SET value = value + excluded.value",
+                    (RETIRED_PROCESS, key, value, now)
+                )
+            self._db.execute("DELETE FROM metrics WHERE process = ? AND series = ?", (process, key))
+    
+    def close(self) -> None:
+        self._db.close()
+
+def hit_rate(values: Dict[str, float], cache: str = "curriculum") -> Optional[float]:
+    hits = values.get(series("cache_requests_total", {"cache": cache, "result": "hit"}), 0)
+    misses = values.get(series("cache_requests_total", {"cache": cache, "result": "miss"}), 0)
+    total = hits + misses
+    return hits / total if total else None
+
+def histogram_quantile(values: Dict[str, float], name: str, q: float) -> Optional[float]:
+    """Perkiraan kuantil dari bucket histogram (batas atas bucket pertama yang mencapai q)"""
+    count = values.get(f"{name}_count", 0)
+    if not count:
+        return None
+    for bound in LATENCY_BUCKETS:
+        if values.get(series(f"{name}_bucket", {"le": bound}), 0) >= q * count:
+            return bound
+    return float("inf")
+
+def _series_order(key: str) -> Tuple[str, float]:
+    """Urutan seri dengan bucket histogram diurutkan menurut nilai `le`"""
+    name, _, labels = key.partition("{")
+    if 'le="' not in labels:
+        return name + labels, 0.0
+    bound = labels.split('le="', 1)[1].split('"', 1)[0]
+    other = labels.replace(f'le="{bound}"', "")
+    return name + other, float("inf") if bound == "+Inf" else float(bound)
+
+def render_prometheus(values: Dict[str, float]) -> str:
+    """Format eksposisi teks Prometheus 0.0.4"""
+    families: Dict[str, List[str]] = {}
+    for key in sorted(values, key=_series_order):
+        name = base_name(key)
+        for suffix in ("_bucket", "_sum", "_count"):
+            if name.endswith(suffix) and name[:-len(suffix)] in HELP:
+                name = name[:-len(suffix)]
+        families.setdefault(name, []).append(key)
+    
+    lines = []
+    for name, keys in families.items():
+        if name in HELP:
+            lines.append(f"# HELP {name} {HELP[name]}")
+        kind = "gauge" if name in GAUGES else "histogram" if name.endswith("_seconds") else "counter"
+        lines.append(f"# TYPE {name} {kind}")
+        for key in keys:
+            value = values[key]
+            lines.append(f"{key} {int(value) if float(value).is_integer() else value}")
+    return "\n".join(lines) + "\n"
+
+metrics = Metrics()
@@ -0,0 +1,50 @@
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Optional
+
+# Nama paket pip untuk modul opsional yang berat
+PIP_NAMES = {
+    "langchain": "langchain",
+    "langgraph": "langgraph",
+    "google.generativeai": "google-generativeai",
+    "pytube": "pytube",
+    "bs4": "beautifulsoup4",
+    "requests": "requests",
+    "numpy": "numpy",
+    "msgpack": "msgpack",
+}
+
+class LazyModule(ModuleType):
+    """Proxy modul yang baru di-import saat atribut pertama kali diakses"""
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module: Optional[ModuleType] = None
+    
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = require(self.__name__)
+        return self._module
+    
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+def require(name: str) -> ModuleType:
+    """Import dependency opsional dengan pesan error yang menyebutkan paket yang perlu dipasang"""
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        package = PIP_NAMES.get(name, name.split(".")[0])
+        raise ImportError(f"Fitur ini membutuhkan '{package}'. Install dengan: pip install {package}") from e
+
+def lazy_import(name: str) -> LazyModule:
+    """Mengembalikan proxy modul tanpa meng-import modulnya sekarang"""
+    return LazyModule(name)
+
+def is_available(name: str) -> bool:
+    """Cek ketersediaan modul tanpa meng-import-nya"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -0,0 +1,171 @@
+import asyncio
+import time
+from typing import Dict, List, Any, AsyncIterator, Optional, Tuple
+
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer
+from core.cache import CurriculumCache, make_cache_key
+from core.metrics import metrics
+from core.scoring import rescore_references
+from core.semantic import SemanticIndex, SemanticMatch, normalize_topic
+
+# Batas waktu (detik) per node graph agent
+AGENT_TIMEOUT = 60
+
+async def iter_pipeline(
+    reasoning_agent: ReasoningAgent,
+    youtube_agent: YouTubeAgent,
+    web_agent: WebAgent,
+    composer: CurriculumComposer,
+    topic: str,
+    level: str,
+    duration: int,
+    format_type: List[str],
+    cache: Optional[CurriculumCache] = None,
+    semantic_index: Optional[SemanticIndex] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Menjalankan pipeline dan menghasilkan (stage, output) segera setelah tiap stage selesai.
+
+    Urutan stage: "requirements", lalu "videos" dan "references" sesuai urutan
+    selesai, lalu nol atau lebih "description" (potongan deskripsi yang sedang
+    ditulis composer), lalu "curriculum". Jika kurikulum ada di cache, stage "requirements"
+    dilewati dan sisanya diambil dari hasil cache. Jika `semantic_index` menemukan
+    topik serupa di cache, video dan referensinya dipakai ulang tanpa memanggil
+    model reasoning maupun pencarian.
+    """
+    started = time.perf_counter()
+    if cache is not None:
+        cache_key = make_cache_key(topic, level, duration, format_type)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield "videos", cached["videos"]
+            yield "references", cached["references"]
+            yield "curriculum", cached
+            return
+        
+        similar = find_similar_curriculum(semantic_index, cache, topic, level)
+        if similar is not None:
+            async for stage, output in reuse_similar(
+                reasoning_agent, composer, similar, topic, level, duration, format_type, cache, started
+            ):
+                yield stage, output
+            return
+    
+    requirements = await reasoning_agent.analyze(topic, level, duration, format_type)
+    yield "requirements", requirements
+    
+    tasks = {
+        asyncio.ensure_future(youtube_agent.search(requirements)): "videos",
+        asyncio.ensure_future(web_agent.scrape(requirements)): "references"
+    }
+    results = {}
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[tasks[task]] = task.result()
+                yield tasks[task], results[tasks[task]]
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    async for stage, output in composer.iter_compose(requirements, results["videos"], results["references"]):
+        if stage == "description":
+            yield stage, output
+        else:
+            curriculum = output
+    
+    metrics.record_generation(curriculum, time.perf_counter() - started)
+    if cache is not None:
+        cache.set(cache_key, curriculum)
+        if semantic_index is not None:
+            semantic_index.add(topic, level, cache_key)
+    yield "curriculum", curriculum
+
+async def reuse_similar(
+    reasoning_agent: ReasoningAgent,
+    composer: CurriculumComposer,
+    similar: Tuple[SemanticMatch, Dict[str, Any]],
+    topic: str,
+    level: str,
+    duration: int,
+    format_type: List[str],
+    cache: CurriculumCache,
+    started: Optional[float] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Stage pipeline untuk kurikulum yang disusun ulang dari topik serupa (hasil find_similar_curriculum).
+    
+    Urutan stage sama dengan `iter_pipeline`; video dan referensi diambil dari
+    kurikulum lama tanpa memanggil model reasoning maupun pencarian. Hasilnya
+    disimpan di cache dengan key input baru.
+    """
+    if started is None:
+        started = time.perf_counter()
+    match, previous = similar
+    requirements = reasoning_agent.adapt_requirements(previous, topic, level, duration, format_type)
+    # Skor referensi kurikulum lama dihitung untuk campuran format lamanya
+    references = rescore_references(previous["references"], requirements)
+    yield "requirements", requirements
+    yield "videos", previous["videos"]
+    yield "references", references
+    
+    async for stage, output in composer.iter_compose(requirements, previous["videos"], references):
+        if stage == "description":
+            yield stage, output
+        else:
+            curriculum = output
+    curriculum["reused_from"] = {"topic": match.topic, "similarity": round(match.similarity, 3)}
+    cache.set(make_cache_key(topic, level, duration, format_type), curriculum)
+    metrics.record_generation(curriculum, time.perf_counter() - started)
+    yield "curriculum", curriculum
+
+def find_similar_curriculum(
+    semantic_index: Optional[SemanticIndex],
+    cache: CurriculumCache,
+    topic: str,
+    level: str,
+    threshold: Optional[float] = None,
+    same_word_count: bool = False,
+    peek: bool = False
+) -> Optional[Tuple[SemanticMatch, Dict[str, Any]]]:
+    """Kurikulum tersimpan dengan topik paling mirip (level sama), jika ada di cache.
+    
+    `same_word_count` dipakai bersama threshold yang lebih longgar: topik yang
+    hanya menambah kata ("React" vs "React Native") tidak dianggap sama.
+    `peek` membaca cache lewat `CurriculumCache.peek` untuk pengecekan yang tidak
+    melayani permintaan (mis. prefetch spekulatif), sehingga statistik hit/miss
+    dan urutan LRU tidak berubah.
+    """
+    if semantic_index is None:
+        return None
+    
+    words = len(normalize_topic(topic).split())
+    for match in semantic_index.search(topic, level, threshold=threshold):
+        if same_word_count and len(normalize_topic(match.topic).split()) != words:
+            continue
+        previous = cache.peek(match.cache_key) if peek else cache.get(match.cache_key)
+        if previous is not None:
+            return match, previous
+    return None
+
+async def generate_curriculum(
+    reasoning_agent: ReasoningAgent,
+    youtube_agent: YouTubeAgent,
+    web_agent: WebAgent,
+    composer: CurriculumComposer,
+    topic: str,
+    level: str,
+    duration: int,
+    format_type: List[str],
+    cache: Optional[CurriculumCache] = None,
+    semantic_index: Optional[SemanticIndex] = None
+) -> Dict[str, Any]:
+    """Pipeline lengkap dalam satu event loop: analisis -> (video | referensi) -> komposisi"""
+    curriculum = None
+    async for stage, output in iter_pipeline(
+        reasoning_agent, youtube_agent, web_agent, composer,
+        topic, level, duration, format_type, cache, semantic_index
+    ):
+        if stage == "curriculum":
+            curriculum = output
+    return curriculum
@@ -0,0 +1,337 @@
+"""Prefetch spekulatif dan warm-up cache untuk kombinasi topik/level yang populer.
+
+Dua jenis kerja latar belakang mengurangi waktu di jalur kritis klik Generate:
+
+    warm-up      `WarmupScheduler` membaca `RequestHistory` dan, saat proses
+                 idle, membuat kurikulum lengkap untuk top-N (topik, level,
+                 durasi, format) yang belum ada (atau hampir kedaluwarsa) di cache
+    spekulatif   `SpeculativePrefetcher` menjalankan reasoning serta pencarian
+                 video dan web begitu topik dan level di sidebar terisi. Hasilnya
+                 masuk StageMemoizer bersama (dan katalog video), sehingga pipeline
+                 setelah klik langsung mendapat memo hit. Prefetch untuk input
+                 lama dibatalkan saat input berubah.
+
+Keduanya melewati `PrefetchBudget`: kerja latar belakang hanya dimulai jika
+AdmissionController punya slot kosong (warm-up: tidak ada pipeline aktif sama
+sekali), pemakaian CPU proses di bawah batas, token prefetch per menit masih
+ada, dan kuota YouTube tidak di bawah cadangan untuk permintaan live.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeout
+from dataclasses import dataclass
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from core.admission import AdmissionController
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer
+from core.cache import CurriculumCache, make_cache_key
+from core.fetch import QuotaExceeded, TokenBucket
+from core.metrics import metrics
+from core.pipeline import generate_curriculum
+from core.semantic import SemanticIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = os.path.join(".cache", "request_history.sqlite3")
+# Permintaan yang lebih tua dari ini tidak dihitung untuk popularitas
+HISTORY_WINDOW = 30 * 24 * 3600
+DEFAULT_TOP_N = 20
+WARMUP_INTERVAL = 60.0
+# Entri cache yang kedaluwarsa dalam waktu ini ikut dibuat ulang saat warm-up
+REFRESH_BEFORE = 3600.0
+# Topik lebih pendek dari ini dianggap masih diketik dan tidak diprefetch
+MIN_TOPIC_CHARS = 3
+# Jeda sebelum prefetch spekulatif mulai; input yang berubah dalam jeda ini tidak memakai kuota
+SPECULATION_DEBOUNCE = 0.8
+# Prefetch yang tidak dipakai dalam waktu ini dilupakan (hasilnya tetap ada di memo)
+SPECULATION_TTL = 600.0
+
+Combo = Tuple[str, str, int, Tuple[str, ...]]
+
+class RequestHistory:
+    """Frekuensi permintaan per (topik, level, durasi, format) di SQLite, dibagi antar proses"""
+    
+    def __init__(self, path: Optional[str] = DEFAULT_HISTORY_PATH):
+        directory = os.path.dirname(path) if path else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS requests ("
+                "topic_key TEXT NOT NULL, level TEXT NOT NULL, duration INTEGER NOT NULL, formats TEXT NOT NULL, "
+                "topic TEXT NOT NULL, count INTEGER NOT NULL, last_seen REAL NOT NULL, "
+                "PRIMARY KEY (topic_key, level, duration, formats))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_requests_last_seen ON requests(last_seen)")
+            self._db.commit()
+    
+    def record(self, topic: str, level: str, duration: int, formats: List[str]) -> None:
+        """Mencatat satu permintaan; ejaan topik terakhir dipakai saat warm-up"""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO requests (topic_key, level, duration, formats, topic, count, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT(topic_key, level, duration, formats) DO UPDATE SET "
+                "count = count + 1, topic = excluded.topic, last_seen = excluded.last_seen",
+                (" ".join(topic.lower().split()), level, int(duration), json.dumps(sorted(set(formats))), topic.strip(), time.time())
+            )
+            self._db.commit()
+    
+    def top(self, n: int, window: float = HISTORY_WINDOW) -> List[Combo]:
+        """Kombinasi paling sering diminta dalam `window` detik terakhir"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT topic, level, duration, formats FROM requests WHERE last_seen >= ? "
+                "ORDER BY count DESC, last_seen DESC LIMIT ?",
+                (time.time() - window, n)
+            ).fetchall()
+        return [(topic, level, duration, tuple(json.loads(formats))) for topic, level, duration, formats in rows]
+    
+    def prune(self, older_than: float = HISTORY_WINDOW) -> int:
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM requests WHERE last_seen < ?", (time.time() - older_than,)).rowcount
+            self._db.commit()
+        return deleted
+    
+    def close(self) -> None:
+        self._db.close()
+
+class PrefetchBudget:
+    """Memutuskan apakah kerja latar belakang boleh dimulai tanpa mengganggu permintaan live"""
+    
+    def __init__(
+        self,
+        admission: Optional[AdmissionController] = None,
+        rate_per_minute: float = 6.0,
+        max_cpu_fraction: float = 0.5,
+        quota: Optional[TokenBucket] = None,
+        quota_reserve: float = 0.5
+    ):
+        self.admission = admission
+        self.max_cpu_fraction = max_cpu_fraction
+        self.quota = quota
+        self.quota_reserve = quota_reserve
+        self._tokens = TokenBucket(rate=rate_per_minute / 60, capacity=max(1.0, rate_per_minute), max_wait=0.0)
+        self._cpu_mark = (time.monotonic(), time.process_time())
+        self._cpu_fraction = 0.0
+        self._lock = threading.Lock()
+    
+    def cpu_fraction(self) -> float:
+        """Pemakaian CPU proses (semua thread, 0..1 dari seluruh core) sejak pengukuran sebelumnya, dihaluskan"""
+        with self._lock:
+            wall, cpu = time.monotonic(), time.process_time()
+            last_wall, last_cpu = self._cpu_mark
+            if wall - last_wall >= 1.0:
+                sample = (cpu - last_cpu) / (wall - last_wall) / (os.cpu_count() or 1)
+                self._cpu_fraction = 0.5 * self._cpu_fraction + 0.5 * sample
+                self._cpu_mark = (wall, cpu)
+            return self._cpu_fraction
+    
+    def check(self, kind: str, idle_only: bool = False) -> Optional[str]:
+        """None jika kerja `kind` boleh dimulai, atau alasan penolakannya"""
+        reason = self._deny_reason(idle_only)
+        metrics.inc("prefetch_total", kind=kind, result="admitted" if reason is None else f"skipped_{reason}")
+        return reason
+    
+    def _deny_reason(self, idle_only: bool) -> Optional[str]:
+        if self.admission is not None:
+            stats = self.admission.stats()
+            if stats["waiting"] or stats["active"] >= (1 if idle_only else self.admission.max_concurrent):
+                return "busy"
+        if self.cpu_fraction() > self.max_cpu_fraction:
+            return "cpu"
+        if self.quota is not None and self.quota.available() < self.quota.capacity * self.quota_reserve:
+            return "quota"
+        # Token dipakai paling akhir agar penolakan lain tidak menghabiskannya
+        try:
+            self._tokens.reserve()
+        except QuotaExceeded:
+            return "rate"
+        return None
+
+@dataclass
+class _Speculation:
+    key: Combo
+    future: Future
+    started: float
+
+class SpeculativePrefetcher:
+    """Stage awal pipeline untuk input sidebar yang belum di-Generate, satu per sesi"""
+    
+    def __init__(self, budget: PrefetchBudget, debounce: float = SPECULATION_DEBOUNCE):
+        self.budget = budget
+        self.debounce = debounce
+        self._sessions: Dict[str, _Speculation] = {}
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="speculative-prefetch", daemon=True).start()
+    
+    def update(
+        self,
+        session_id: str,
+        topic: str,
+        level: str,
+        duration: int,
+        formats: List[str],
+        agents: Tuple[ReasoningAgent, YouTubeAgent, WebAgent]
+    ) -> bool:
+        """Dipanggil setiap input sidebar berubah; True jika prefetch baru dijadwalkan.
+        
+        Budget baru diperiksa setelah jeda debounce, sehingga input yang berubah
+        lagi dalam jeda itu tidak memakai token prefetch.
+        """
+        key = _combo(topic, level, duration, formats)
+        with self._lock:
+            self._expire()
+            current = self._sessions.get(session_id)
+            if current is not None and current.key == key:
+                return False
+            if current is not None:
+                # Input berubah: hasil untuk input lama tidak akan dipakai klik berikutnya
+                if current.future.cancel():
+                    metrics.inc("prefetch_total", kind="speculative", result="discarded")
+                del self._sessions[session_id]
+            if len(topic.strip()) < MIN_TOPIC_CHARS:
+                return False
+            future = asyncio.run_coroutine_threadsafe(self._prefetch(topic.strip(), level, duration, formats, agents), self._loop)
+            self._sessions[session_id] = _Speculation(key, future, time.monotonic())
+            return True
+    
+    def wait(self, session_id: str, topic: str, level: str, duration: int, formats: List[str], timeout: float) -> bool:
+        """Menunggu prefetch sesi ini untuk input yang sama (paling lama `timeout`); True jika selesai.
+        
+        Dipanggil sebelum pipeline live agar stage yang sedang diprefetch tidak
+        dijalankan dua kali; prefetch untuk input lain dibatalkan.
+        """
+        with self._lock:
+            current = self._sessions.pop(session_id, None)
+        if current is None:
+            return False
+        if current.key != _combo(topic, level, duration, formats):
+            if current.future.cancel():
+                metrics.inc("prefetch_total", kind="speculative", result="discarded")
+            return False
+        try:
+            ran = current.future.result(timeout=max(0.0, timeout))
+        except FuturesTimeout:
+            return False
+        except Exception:
+            return False
+        if not ran:
+            return False
+        metrics.inc("prefetch_total", kind="speculative", result="used")
+        return True
+    
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - SPECULATION_TTL
+        for session_id in [s for s, spec in self._sessions.items() if spec.started < cutoff]:
+            self._sessions.pop(session_id).future.cancel()
+    
+    async def _prefetch(
+        self,
+        topic: str,
+        level: str,
+        duration: int,
+        formats: List[str],
+        agents: Tuple[ReasoningAgent, YouTubeAgent, WebAgent]
+    ) -> bool:
+        """True jika stage awal selesai diprefetch, False jika budget menolak"""
+        reasoning_agent, youtube_agent, web_agent = agents
+        # Pengguna mungkin masih mengetik; pembatalan dalam jeda ini gratis
+        await asyncio.sleep(self.debounce)
+        if self.budget.check("speculative") is not None:
+            return False
+        requirements = await reasoning_agent.analyze(topic, level, duration, formats)
+        await asyncio.gather(youtube_agent.search(requirements), web_agent.scrape(requirements))
+        metrics.inc("prefetch_total", kind="speculative", result="completed")
+        return True
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "running": sum(1 for spec in self._sessions.values() if not spec.future.done())
+            }
+
+class WarmupScheduler:
+    """Thread daemon yang membuat kurikulum top-N dari RequestHistory saat proses idle"""
+    
+    def __init__(
+        self,
+        history: RequestHistory,
+        cache: CurriculumCache,
+        budget: PrefetchBudget,
+        build_agents: Callable[[], Tuple[ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer]],
+        semantic_index: Optional[SemanticIndex] = None,
+        top_n: int = DEFAULT_TOP_N,
+        interval: float = WARMUP_INTERVAL
+    ):
+        self.history = history
+        self.cache = cache
+        self.budget = budget
+        self.build_agents = build_agents
+        self.semantic_index = semantic_index
+        self.top_n = top_n
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> "WarmupScheduler":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cache-warmup", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self._stop.set()
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.warning("Warm-up cache gagal", exc_info=True)
+    
+    def pending(self) -> List[Combo]:
+        """Kombinasi populer yang belum ada di cache atau akan segera kedaluwarsa"""
+        refresh_at = time.time() + REFRESH_BEFORE
+        pending = []
+        for topic, level, duration, formats in self.history.top(self.top_n):
+            expires_at = self.cache.expires_at(make_cache_key(topic, level, duration, list(formats)))
+            if expires_at is None or expires_at < refresh_at:
+                pending.append((topic, level, duration, formats))
+        return pending
+    
+    def run_once(self) -> int:
+        """Satu putaran warm-up; berhenti begitu budget menolak. Mengembalikan jumlah kurikulum dibuat"""
+        generated = 0
+        for topic, level, duration, formats in self.pending():
+            if self._stop.is_set() or self.budget.check("warmup", idle_only=True) is not None:
+                break
+            agents = self.build_agents()
+            # Tanpa cache-hit lookup: entri yang hampir kedaluwarsa tetap dibuat ulang
+            try:
+                curriculum = asyncio.run(generate_curriculum(*agents, topic, level, duration, list(formats)))
+            except Exception:
+                logger.warning("Warm-up %r (%s) gagal", topic, level, exc_info=True)
+                metrics.inc("prefetch_total", kind="warmup", result="failed")
+                continue
+            cache_key = make_cache_key(topic, level, duration, list(formats))
+            self.cache.set(cache_key, curriculum)
+            if self.semantic_index is not None:
+                self.semantic_index.add(topic, level, cache_key)
+            metrics.inc("prefetch_total", kind="warmup", result="generated")
+            generated += 1
+        return generated
+
+def _combo(topic: str, level: str, duration: int, formats: List[str]) -> Combo:
+    return " ".join(topic.lower().split()), level, int(duration), tuple(sorted(set(formats)))
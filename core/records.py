@@ -0,0 +1,341 @@
+"""Representasi ringkas untuk requirements, video, referensi dan kurikulum.
+
+Pipeline dan UI tetap bekerja dengan dict; record dipakai di tempat data
+disimpan lama (tingkat memori CurriculumCache, disk cache, ResultStore untuk
+requirements dan kurikulum generasi terakhir). Dibanding dict:
+
+- record memakai `__slots__` (dataclass slots=True), tanpa dict per objek;
+- field bergaya enum (level, content_type, site_type, estimated_depth) dan
+  semua teks di-intern, sehingga ringkasan/deskripsi template yang sama di
+  ribuan kurikulum hanya disimpan sekali;
+- `pack()` menghasilkan bentuk biner posisional (msgpack bila terpasang,
+  JSON kompak bila tidak) dengan nilai enum sebagai indeks kecil.
+
+`to_dict()` adalah view JSON yang lossless: key yang tidak dikenal disimpan
+di `extra` dan dikembalikan apa adanya, sehingga
+`Curriculum.from_dict(d).to_dict() == d`.
+
+    python -m core.records --count 2000      # benchmark memori & serialisasi
+"""
+import json
+import sys
+import time
+from dataclasses import dataclass, fields
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.optional import is_available, lazy_import
+
+msgpack = lazy_import("msgpack")
+HAS_MSGPACK = is_available("msgpack")
+
+LEVELS = ("pemula", "menengah", "lanjutan")
+CONTENT_TYPES = (
+    "Tutorial Guide", "Best Practices", "Documentation",
+    "Beginner Guide", "Advanced Tutorial", "General Resource"
+)
+SITE_TYPES = ("educational", "blog", "official", "technical", "mixed")
+DEPTHS = ("Surface", "Moderate", "Deep")
+
+PACK_VERSION = 1
+# Byte pertama hasil pack() menandai codec yang dipakai
+CODEC_MSGPACK = b"M"
+CODEC_JSON = b"J"
+
+_intern = sys.intern
+
+def intern_text(value: Any) -> Any:
+    return _intern(value) if type(value) is str else value
+
+def _intern_all(values: List[Any]) -> Tuple[Any, ...]:
+    return tuple([_intern(value) if type(value) is str else value for value in values])
+
+def _encode_enum(value: Any, vocabulary: Tuple[str, ...]) -> Any:
+    """Indeks dalam kosakata, atau nilai aslinya jika tidak dikenal (tetap lossless)"""
+    try:
+        return vocabulary.index(value)
+    except ValueError:
+        return value
+
+def _decode_enum(value: Any, vocabulary: Tuple[str, ...]) -> Any:
+    return vocabulary[value] if type(value) is int else intern_text(value)
+
+class _Record:
+    """Konversi dict <-> record untuk dataclass slots dengan field opsional dan `extra`"""
+    
+    __slots__ = ()
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        names = cls._field_names()
+        values = {}
+        extra = {}
+        for key, value in data.items():
+            if key in names and value is not None:
+                values[key] = cls._convert(key, value)
+            else:
+                extra[key] = value
+        return cls(**values, extra=extra or None)
+    
+    @classmethod
+    def _convert(cls, key: str, value: Any) -> Any:
+        if isinstance(value, list):
+            return _intern_all(value)
+        return intern_text(value)
+    
+    @classmethod
+    def _field_names(cls) -> Tuple[str, ...]:
+        names = cls.__dict__.get("_names")
+        if names is None:
+            names = tuple(f.name for f in fields(cls) if f.name != "extra")
+            cls._names = names
+        return names
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        for name in self._field_names():
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = list(value) if isinstance(value, tuple) else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+@dataclass(slots=True)
+class Requirements(_Record):
+    topic: Optional[str] = None
+    level: Optional[str] = None
+    duration: Optional[int] = None
+    format: Optional[Tuple[str, ...]] = None
+    competencies: Optional[Tuple[str, ...]] = None
+    learning_objectives: Optional[Tuple[str, ...]] = None
+    recommended_modules: Optional[int] = None
+    extra: Optional[Dict[str, Any]] = None
+
+@dataclass(slots=True)
+class Video(_Record):
+    title: Optional[str] = None
+    channel: Optional[str] = None
+    duration: Optional[str] = None
+    views: Optional[str] = None
+    url: Optional[str] = None
+    thumbnail: Optional[str] = None
+    description: Optional[str] = None
+    relevance_score: Optional[float] = None
+    extra: Optional[Dict[str, Any]] = None
+    
+    def pack_fields(self) -> List[Any]:
+        return [
+            self.title, self.channel, self.duration, self.views, self.url,
+            self.thumbnail, self.description, self.relevance_score, self.extra
+        ]
+    
+    @classmethod
+    def unpack_fields(cls, row: List[Any]) -> "Video":
+        title, channel, duration, views, url, thumbnail, description, score, extra = row
+        return cls(
+            intern_text(title), intern_text(channel), intern_text(duration), intern_text(views),
+            intern_text(url), intern_text(thumbnail), intern_text(description), score, extra
+        )
+
+@dataclass(slots=True)
+class Reference(_Record):
+    title: Optional[str] = None
+    url: Optional[str] = None
+    type: Optional[str] = None
+    summary: Optional[str] = None
+    site_type: Optional[str] = None
+    relevance_score: Optional[float] = None
+    estimated_depth: Optional[str] = None
+    query_source: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+    
+    def pack_fields(self) -> List[Any]:
+        return [
+            self.title, self.url, _encode_enum(self.type, CONTENT_TYPES), self.summary,
+            _encode_enum(self.site_type, SITE_TYPES), self.relevance_score,
+            _encode_enum(self.estimated_depth, DEPTHS), self.query_source, self.extra
+        ]
+    
+    @classmethod
+    def unpack_fields(cls, row: List[Any]) -> "Reference":
+        title, url, content_type, summary, site_type, score, depth, query, extra = row
+        return cls(
+            intern_text(title), intern_text(url), _decode_enum(content_type, CONTENT_TYPES),
+            intern_text(summary), _decode_enum(site_type, SITE_TYPES), score,
+            _decode_enum(depth, DEPTHS), intern_text(query), extra
+        )
+
+@dataclass(slots=True)
+class Curriculum(_Record):
+    title: Optional[str] = None
+    description: Optional[Tuple[str, ...]] = None
+    duration: Optional[str] = None
+    level: Optional[str] = None
+    learning_objectives: Optional[Tuple[str, ...]] = None
+    competencies: Optional[Tuple[str, ...]] = None
+    videos: Optional[Tuple[Video, ...]] = None
+    references: Optional[Tuple[Reference, ...]] = None
+    created_at: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def _convert(cls, key: str, value: Any) -> Any:
+        if key == "videos" and isinstance(value, list):
+            return tuple(Video.from_dict(video) for video in value)
+        if key == "references" and isinstance(value, list):
+            return tuple(Reference.from_dict(ref) for ref in value)
+        return super(Curriculum, cls)._convert(key, value)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = _Record.to_dict(self)
+        if self.videos is not None:
+            data["videos"] = [video.to_dict() for video in self.videos]
+        if self.references is not None:
+            data["references"] = [ref.to_dict() for ref in self.references]
+        return data
+
+def _optional_list(values: Optional[Tuple[Any, ...]]) -> Optional[List[Any]]:
+    return None if values is None else list(values)
+
+def _optional_tuple(values: Optional[List[Any]]) -> Optional[Tuple[Any, ...]]:
+    return None if values is None else _intern_all(values)
+
+def pack(curriculum: Curriculum) -> bytes:
+    """Serialisasi biner posisional; msgpack bila tersedia, JSON kompak bila tidak"""
+    row = [
+        PACK_VERSION,
+        curriculum.title,
+        _optional_list(curriculum.description),
+        curriculum.duration,
+        _encode_enum(curriculum.level, LEVELS),
+        _optional_list(curriculum.learning_objectives),
+        _optional_list(curriculum.competencies),
+        None if curriculum.videos is None else [video.pack_fields() for video in curriculum.videos],
+        None if curriculum.references is None else [ref.pack_fields() for ref in curriculum.references],
+        curriculum.created_at,
+        curriculum.extra
+    ]
+    if HAS_MSGPACK:
+        return CODEC_MSGPACK + msgpack.packb(row, use_bin_type=True)
+    return CODEC_JSON + json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def unpack(data: bytes) -> Curriculum:
+    codec, body = data[:1], data[1:]
+    if codec == CODEC_MSGPACK:
+        row = msgpack.unpackb(body, raw=False, strict_map_key=False)
+    elif codec == CODEC_JSON:
+        row = json.loads(body)
+    else:
+        raise ValueError(f"Codec record tidak dikenal: {codec!r}")
+    
+    version, title, description, duration, level, objectives, competencies, videos, references, created_at, extra = row
+    if version != PACK_VERSION:
+        raise ValueError(f"Versi record {version} tidak didukung")
+    return Curriculum(
+        title=intern_text(title),
+        description=_optional_tuple(description),
+        duration=intern_text(duration),
+        level=_decode_enum(level, LEVELS),
+        learning_objectives=_optional_tuple(objectives),
+        competencies=_optional_tuple(competencies),
+        videos=None if videos is None else tuple(Video.unpack_fields(video) for video in videos),
+        references=None if references is None else tuple(Reference.unpack_fields(ref) for ref in references),
+        created_at=created_at,
+        extra=extra
+    )
+
+def build_sample(count: int) -> List[Dict[str, Any]]:
+    """Kurikulum dari agent dengan backend lokal, melingkari korpus benchmark pipeline"""
+    import asyncio
+    
+    from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer, SimulatedBackend
+    from core.bench import build_corpus
+    from core.pipeline import generate_curriculum
+    from core.reporting import LoggingReporter
+    
+    backend = SimulatedBackend()
+    reporter = LoggingReporter()
+    agents = (
+        ReasoningAgent("", backend, reporter=reporter),
+        YouTubeAgent(None, backend, reporter=reporter),
+        WebAgent(backend, reporter=reporter),
+        CurriculumComposer(backend, reporter=reporter)
+    )
+    corpus = build_corpus()
+    
+    async def generate() -> List[Dict[str, Any]]:
+        unique = []
+        for job in corpus[:count]:
+            unique.append(await generate_curriculum(*agents, job["topic"], job["level"], job["duration"], job["formats"]))
+        return unique
+    
+    unique = asyncio.run(generate())
+    # Seperti dibaca ulang dari cache: setiap kurikulum punya salinan string sendiri
+    return [json.loads(json.dumps(unique[i % len(unique)], ensure_ascii=False)) for i in range(count)]
+
+def _retained_bytes(build) -> Tuple[Any, int]:
+    import tracemalloc
+    
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, after - before
+
+def _per_item_us(fn, items: List[Any]) -> float:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return round((time.perf_counter() - started) / len(items) * 1e6, 2)
+
+def run_benchmark(count: int) -> Dict[str, Any]:
+    """Memori per kurikulum dan waktu (de)serialisasi: dict + JSON vs record + pack"""
+    texts = [json.dumps(curriculum, ensure_ascii=False) for curriculum in build_sample(count)]
+    
+    dicts, dict_bytes = _retained_bytes(lambda: [json.loads(text) for text in texts])
+    records, record_bytes = _retained_bytes(lambda: [Curriculum.from_dict(json.loads(text)) for text in texts])
+    # Lossless: view JSON identik dengan dict asal
+    assert all(record.to_dict() == original for record, original in zip(records, dicts))
+    
+    packed = [pack(record) for record in records]
+    assert all(unpack(blob) == record for blob, record in zip(packed, records))
+    return {
+        "count": count,
+        "codec": "msgpack" if HAS_MSGPACK else "json",
+        "memory_bytes_per_curriculum": {
+            "dict": dict_bytes // count,
+            "record": record_bytes // count
+        },
+        "serialized_bytes_per_curriculum": {
+            "json": sum(len(text.encode("utf-8")) for text in texts) // count,
+            "pack": sum(len(blob) for blob in packed) // count
+        },
+        "serialize_us": {
+            "json_dumps": _per_item_us(lambda d: json.dumps(d, ensure_ascii=False), dicts),
+            "pack": _per_item_us(pack, records)
+        },
+        "deserialize_us": {
+            "json_loads": _per_item_us(json.loads, texts),
+            "unpack": _per_item_us(unpack, packed),
+            "unpack_to_dict": _per_item_us(lambda blob: unpack(blob).to_dict(), packed)
+        }
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Benchmark memori dan serialisasi record kurikulum")
+    parser.add_argument("--count", type=int, default=2000, help="Jumlah kurikulum yang ditahan di memori")
+    parser.add_argument("-o", "--output", help="File JSON hasil benchmark")
+    args = parser.parse_args(argv)
+    
+    result = run_benchmark(args.count)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
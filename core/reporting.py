@@ -0,0 +1,25 @@
+import logging
+from typing import Protocol
+
+logger = logging.getLogger("core")
+
+class Reporter(Protocol):
+    """Tujuan pesan error/peringatan dari agent (log, UI Streamlit, dsb.)"""
+    
+    def error(self, message: str) -> None:
+        ...
+    
+    def warning(self, message: str) -> None:
+        ...
+
+class LoggingReporter:
+    """Reporter default untuk mode headless: meneruskan pesan ke logging"""
+    
+    def __init__(self, logger: logging.Logger = logger):
+        self.logger = logger
+    
+    def error(self, message: str) -> None:
+        self.logger.error(message)
+    
+    def warning(self, message: str) -> None:
+        self.logger.warning(message)
@@ -0,0 +1,82 @@
+"""Store hasil generasi terbaru per generation ID, dibagi lintas sesi UI.
+
+Sesi yang meminta input yang sama dalam TTL mendapat hasil yang sudah jadi tanpa
+menjalankan pipeline maupun membaca cache. Hasil terdegradasi (template atau
+near match) tidak disimpan, sehingga permintaan berikutnya mencoba pipeline penuh.
+
+Generasi disimpan sebagai record (`core.records`), bukan dict: requirements dan
+kurikulum memakai slots dan teks yang di-intern, dan `get()` mengembalikan view
+dict yang identik dengan generasi yang disimpan.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.memo import StageConfig, StageMemo
+from core.records import Curriculum, Reference, Requirements, Video, intern_text
+
+# Batas memori hasil generasi yang dibagi lintas sesi
+RESULT_STORE_MAX_ITEMS = 200
+RESULT_STORE_TTL = 3600
+
+# Key yang hanya berlaku untuk tampilan satu permintaan, bukan bagian hasil
+VIEW_KEYS = ("timings", "trace")
+GENERATION_KEYS = ("id", "topic", "requirements", "videos", "references", "curriculum")
+
+@dataclass(slots=True)
+class _Entry:
+    topic: str
+    requirements: Optional[Requirements]
+    curriculum: Curriculum
+    # None jika sama dengan video/referensi kurikulum (kasus normal), agar tidak disimpan dua kali
+    videos: Optional[Tuple[Video, ...]] = None
+    references: Optional[Tuple[Reference, ...]] = None
+    extra: Optional[Dict[str, Any]] = None
+
+def _records(items: List[Dict[str, Any]], same: List[Dict[str, Any]], record) -> Optional[Tuple[Any, ...]]:
+    return None if items == same else tuple(record.from_dict(item) for item in items)
+
+class ResultStore:
+    """LRU dengan TTL berisi generasi {id, topic, requirements, videos, references, curriculum}"""
+    
+    def __init__(self, max_items: int = RESULT_STORE_MAX_ITEMS, ttl: Optional[float] = RESULT_STORE_TTL):
+        self._memo = StageMemo(StageConfig(ttl=ttl, max_items=max_items))
+    
+    def get(self, generation_id: str) -> Optional[Dict[str, Any]]:
+        """Salinan generasi tersimpan, atau None jika tidak ada / kedaluwarsa"""
+        entry = self._memo.get(generation_id, None)
+        if entry is None:
+            return None
+        curriculum = entry.curriculum.to_dict()
+        generation = {
+            "id": generation_id,
+            "topic": entry.topic,
+            "requirements": None if entry.requirements is None else entry.requirements.to_dict(),
+            "videos": curriculum.get("videos", []) if entry.videos is None else [v.to_dict() for v in entry.videos],
+            "references": (
+                curriculum.get("references", []) if entry.references is None
+                else [ref.to_dict() for ref in entry.references]
+            ),
+            "curriculum": curriculum
+        }
+        if entry.extra:
+            generation.update(entry.extra)
+        return generation
+    
+    def put(self, generation: Dict[str, Any]) -> bool:
+        """Menyimpan generasi dengan key `generation["id"]`; hasil terdegradasi ditolak"""
+        if "degraded" in generation["curriculum"]:
+            return False
+        curriculum = generation["curriculum"]
+        requirements = generation["requirements"]
+        self._memo.set(generation["id"], _Entry(
+            intern_text(generation["topic"]),
+            None if requirements is None else Requirements.from_dict(requirements),
+            Curriculum.from_dict(curriculum),
+            _records(generation["videos"], curriculum.get("videos"), Video),
+            _records(generation["references"], curriculum.get("references"), Reference),
+            {key: value for key, value in generation.items() if key not in GENERATION_KEYS + VIEW_KEYS} or None
+        ))
+        return True
+    
+    def __len__(self) -> int:
+        return len(self._memo)
@@ -0,0 +1,123 @@
+"""Engine skor relevansi batch dan seleksi top-k untuk kandidat video/referensi.
+
+Modul ini satu-satunya sumber rumus skor relevansi video dan referensi; skor
+dihitung untuk semua kandidat sekaligus dengan NumPy. Seleksi memakai heap atas (-skor, indeks) sehingga
+urutannya sama persis dengan sort stabil descending yang dipakai sebelumnya,
+tanpa perlu mengurutkan seluruh daftar.
+"""
+import heapq
+from typing import Dict, List, Any, Iterator, Sequence
+
+from core.optional import lazy_import
+
+np = lazy_import("numpy")
+
+# Jenis video yang mendapat boost +0.3 per level
+LEVEL_VIDEO_TYPES = {
+    "pemula": ["introduction", "basics"],
+    "menengah": ["intermediate", "practical"],
+    "lanjutan": ["advanced", "masterclass"],
+}
+TECH_TOPICS = ["programming", "development", "machine learning", "data"]
+TECH_VIDEO_TYPES = ["practical", "implementation"]
+
+# Jenis konten yang mendapat boost +0.3 per level
+LEVEL_CONTENT_TYPES = {
+    "pemula": ["Beginner Guide", "Tutorial Guide"],
+    "menengah": ["Tutorial Guide", "Best Practices"],
+    "lanjutan": ["Advanced Tutorial", "Documentation"],
+}
+TEXT_CONTENT_TYPES = ["Documentation", "Tutorial Guide"]
+
+def score_videos(video_types: Sequence[str], requirements: Dict[str, Any]):
+    """Skor relevansi semua jenis video dalam satu pass (ndarray float64)"""
+    types = np.asarray(video_types, dtype=object)
+    topic = requirements['topic'].lower()
+    
+    scores = np.full(len(types), 0.5)
+    scores += 0.3 * np.isin(types, LEVEL_VIDEO_TYPES.get(requirements['level'], []))
+    if any(tech in topic for tech in TECH_TOPICS):
+        scores += 0.2 * np.isin(types, TECH_VIDEO_TYPES)
+    return np.minimum(1.0, scores)
+
+def score_references(content_types: Sequence[str], requirements: Dict[str, Any]):
+    """Skor relevansi semua jenis konten referensi dalam satu pass (ndarray float64)"""
+    types = np.asarray(content_types, dtype=object)
+    
+    scores = np.full(len(types), 0.5)
+    scores += 0.3 * np.isin(types, LEVEL_CONTENT_TYPES.get(requirements['level'], []))
+    if "teks" in requirements.get('format', []):
+        scores += 0.2 * np.isin(types, TEXT_CONTENT_TYPES)
+    return np.minimum(1.0, scores)
+
+def rescore_references(references: Sequence[Dict[str, Any]], requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Salinan referensi yang dipakai ulang dengan skor untuk level/format baru, skor tertinggi dulu"""
+    if not references:
+        return []
+    scores = score_references([ref['type'] for ref in references], requirements)
+    rescored = [{**ref, "relevance_score": float(score)} for ref, score in zip(references, scores.tolist())]
+    return [rescored[i] for i in iter_ranked(scores)]
+
+def iter_ranked(scores) -> Iterator[int]:
+    """Indeks kandidat dari skor tertinggi, seri dipecah oleh urutan asli (stabil).
+
+    Heap dibangun O(n) dan setiap pop O(log n), jadi konsumen yang berhenti
+    setelah k elemen tidak membayar sort penuh.
+    """
+    heap = [(-score, index) for index, score in enumerate(np.asarray(scores, dtype=float).tolist())]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[1]
+
+def top_k(scores, k: int) -> List[int]:
+    """k indeks terbaik dengan urutan yang sama seperti sort stabil descending"""
+    scores = np.asarray(scores, dtype=float)
+    n = len(scores)
+    if k >= n:
+        return list(iter_ranked(scores))
+    if k <= 0:
+        return []
+    
+    # Partial selection: ambil ambang skor ke-k, lalu isi seri dengan indeks terkecil
+    threshold = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    candidates = np.concatenate([above, ties])
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order].tolist()
+
+def select_diverse(
+    scores,
+    groups: Sequence[Any],
+    limit: int = 4,
+    free_slots: int = 2,
+    minimum: int = 3
+) -> List[int]:
+    """Seleksi top-k dengan batasan keragaman, setara WebAgent._select_best_references.
+
+    Kandidat diambil sesuai ranking; setelah `free_slots` terpilih, kandidat dari
+    grup yang sudah dipakai dilewati. Jika hasil kurang dari `minimum`, diisi dengan
+    kandidat ber-ranking tertinggi yang belum terpilih.
+    """
+    selected: List[int] = []
+    chosen = set()
+    used_groups = set()
+    
+    for index in iter_ranked(scores):
+        if groups[index] not in used_groups or len(selected) < free_slots:
+            selected.append(index)
+            chosen.add(index)
+            used_groups.add(groups[index])
+        
+        if len(selected) >= limit:
+            break
+    
+    if len(selected) < minimum:
+        for index in iter_ranked(scores):
+            if len(selected) >= minimum:
+                break
+            if index not in chosen:
+                selected.append(index)
+                chosen.add(index)
+    
+    return selected
@@ -0,0 +1,171 @@
+"""Indeks vektor lokal untuk mencari topik yang hampir sama ("ML", "machine-learning basics").
+
+Embedding dibuat tanpa model eksternal: topik dinormalisasi (singkatan
+diekspansi, kata generik dibuang) lalu kata dan trigram karakternya di-hash
+ke vektor berdimensi tetap (feature hashing) dan dinormalisasi L2. Cukup
+murah untuk CPU dan deterministik antar proses.
+
+Vektor disimpan sebagai float32 mentah di `vectors.f32` dan dibaca lewat
+`numpy.memmap`; metadata (topik, level, cache key) di `meta.jsonl`. Pencarian
+memakai flat inner-product search yang difilter per level.
+"""
+import json
+import os
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional
+
+from core.optional import lazy_import
+
+np = lazy_import("numpy")
+
+DEFAULT_INDEX_DIR = os.path.join(".cache", "semantic")
+EMBEDDING_DIM = 256
+DEFAULT_THRESHOLD = 0.85
+
+# Singkatan umum yang diketik pengguna
+ALIASES = {
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "ds": "data science",
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "k8s": "kubernetes",
+    "db": "database",
+    "oop": "object oriented programming",
+    "ui": "user interface",
+    "ux": "user experience",
+}
+
+# Kata yang tidak mengubah topik inti
+GENERIC_WORDS = {
+    "basic", "basics", "dasar", "dasar-dasar", "intro", "introduction", "pengenalan",
+    "tutorial", "fundamental", "fundamentals", "belajar", "learn",
+    "course", "kursus", "guide", "panduan", "for", "untuk", "beginner", "beginners",
+    "pemula", "the", "and", "dan", "of", "with", "101",
+}
+
+_NON_WORD = re.compile(r"[^0-9a-z+#]+")
+
+def normalize_topic(topic: str) -> str:
+    """Bentuk kanonik topik untuk embedding"""
+    words = _NON_WORD.sub(" ", topic.lower()).split()
+    expanded = []
+    for word in words:
+        expanded.extend(ALIASES.get(word, word).split())
+    core_words = [word for word in expanded if word not in GENERIC_WORDS]
+    # Jangan sampai topik kosong hanya karena semua katanya generik
+    return " ".join(core_words or expanded)
+
+def embed_topic(topic: str, dim: int = EMBEDDING_DIM):
+    """Embedding hashing (kata + trigram karakter), dinormalisasi L2"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in normalize_topic(topic).split():
+        _add_feature(vector, "w:" + word, 1.0)
+        padded = f"<{word}>"
+        for start in range(len(padded) - 2):
+            _add_feature(vector, "c:" + padded[start:start + 3], 0.5)
+    
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+def _add_feature(vector, feature: str, weight: float) -> None:
+    hashed = zlib.crc32(feature.encode("utf-8"))
+    sign = 1.0 if hashed & 0x80000000 else -1.0
+    vector[hashed % len(vector)] += sign * weight
+
+@dataclass
+class SemanticMatch:
+    topic: str
+    level: str
+    cache_key: str
+    similarity: float
+
+class SemanticIndex:
+    """Indeks nearest-neighbour (flat) atas topik kurikulum yang pernah dibuat"""
+    
+    def __init__(self, directory: str = DEFAULT_INDEX_DIR, dim: int = EMBEDDING_DIM, threshold: float = DEFAULT_THRESHOLD):
+        self.directory = directory
+        self.dim = dim
+        self.threshold = threshold
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._meta_path = os.path.join(directory, "meta.jsonl")
+        self._lock = threading.Lock()
+        self._meta: List[Dict[str, Any]] = []
+        self._seen = set()
+        self._matrix = None
+        
+        os.makedirs(directory, exist_ok=True)
+        lines = 0
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding="utf-8") as f:
+                for lines, line in enumerate(f, 1):
+                    try:
+                        self._meta.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+        # Metadata dan vektor bisa tidak sinkron jika proses mati di tengah penulisan
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        self._meta = self._meta[:size // (4 * dim)]
+        # Sisa yang tidak berpasangan dibuang dari kedua file agar append berikutnya tetap sejajar
+        if size > len(self._meta) * 4 * dim:
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(len(self._meta) * 4 * dim)
+        if lines > len(self._meta):
+            with open(self._meta_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(m, ensure_ascii=False) + "\n" for m in self._meta)
+        self._seen = {(m["cache_key"]) for m in self._meta}
+    
+    def __len__(self) -> int:
+        return len(self._meta)
+    
+    def add(self, topic: str, level: str, cache_key: str) -> bool:
+        """Menambahkan kurikulum yang sudah dibuat; False jika sudah terindeks"""
+        with self._lock:
+            if cache_key in self._seen:
+                return False
+            
+            vector = embed_topic(topic, self.dim)
+            with open(self._vectors_path, "ab") as f:
+                f.write(vector.astype(np.float32).tobytes())
+            record = {"topic": topic, "level": level, "cache_key": cache_key}
+            with open(self._meta_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            
+            self._meta.append(record)
+            self._seen.add(cache_key)
+            self._matrix = None
+            return True
+    
+    def search(self, topic: str, level: str, k: int = 3, threshold: Optional[float] = None) -> List[SemanticMatch]:
+        """Tetangga terdekat dengan level yang sama dan similarity >= threshold"""
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            matrix = self._load_matrix()
+            meta = list(self._meta)
+        if matrix is None or not len(meta):
+            return []
+        
+        similarities = matrix[:len(meta)] @ embed_topic(topic, self.dim)
+        levels = np.fromiter((m["level"] == level for m in meta), dtype=bool, count=len(meta))
+        similarities = np.where(levels, similarities, -1.0)
+        
+        matches = []
+        for index in np.argsort(-similarities, kind="stable")[:k].tolist():
+            similarity = float(similarities[index])
+            if similarity < threshold:
+                break
+            m = meta[index]
+            matches.append(SemanticMatch(m["topic"], m["level"], m["cache_key"], similarity))
+        return matches
+    
+    def _load_matrix(self):
+        if self._matrix is None and self._meta:
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(len(self._meta), self.dim))
+        return self._matrix
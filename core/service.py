@@ -0,0 +1,370 @@
+"""Mode layanan HTTP untuk pipeline kurikulum (misalnya untuk integrasi LMS).
+
+    python -m core.service --port 8080
+
+Endpoint:
+    GET  /health               status dan statistik coalescing
+    GET  /metrics              metrik operasional semua worker (format teks Prometheus)
+    POST /curriculum           body JSON {topic, level, duration, formats} -> kurikulum
+    POST /curriculum/stream    sama, tetapi mengirim NDJSON per stage segera setelah siap
+                               (termasuk potongan "description" selama composer menulis)
+    POST /curriculum/export    sama ditambah {format: pdf|markdown|json} -> file export,
+                               dirender di thread terpisah dan dikirim per potongan
+
+Permintaan identik yang datang bersamaan digabung (coalesce) menjadi satu
+eksekusi pipeline; semua klien menerima hasil yang sama.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, List, Any, AsyncIterator, Callable, Iterator, Optional, Tuple
+
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer
+from core.cache import CurriculumCache, make_cache_key
+from core.catalog import VideoCatalog
+from core.export import export_filename, export_format
+from core.extract import PageExtractionPool
+from core.memo import StageMemoizer
+from core.metrics import MetricsStore, metrics, render_prometheus
+from core.pipeline import iter_pipeline
+from core.semantic import SemanticIndex
+from core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ["pemula", "menengah", "lanjutan"]
+FORMATS = ["video", "teks", "praktik", "quiz"]
+MAX_BODY_BYTES = 64 * 1024
+
+class BadRequest(ValueError):
+    """Permintaan HTTP tidak valid (dijawab 400); error lain dari pipeline dijawab 500"""
+
+class PipelineRun:
+    """Satu eksekusi pipeline yang output-nya dapat diikuti oleh banyak klien"""
+    
+    def __init__(self):
+        self.events: List[Tuple[str, Any]] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self._condition = asyncio.Condition()
+    
+    async def publish(self, stage: str, output: Any) -> None:
+        async with self._condition:
+            self.events.append((stage, output))
+            self._condition.notify_all()
+    
+    async def finish(self, error: Optional[BaseException] = None) -> None:
+        async with self._condition:
+            self.done = True
+            self.error = error
+            self._condition.notify_all()
+    
+    async def subscribe(self) -> AsyncIterator[Tuple[str, Any]]:
+        """Memutar ulang stage yang sudah selesai lalu mengikuti stage berikutnya"""
+        index = 0
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: index < len(self.events) or self.done)
+                pending = self.events[index:]
+                finished, error = self.done, self.error
+            
+            for event in pending:
+                yield event
+            index += len(pending)
+            
+            if finished and index >= len(self.events):
+                if error is not None:
+                    raise error
+                return
+    
+    async def result(self) -> Dict[str, Any]:
+        async for stage, output in self.subscribe():
+            if stage == "curriculum":
+                return output
+        raise RuntimeError("Pipeline selesai tanpa menghasilkan kurikulum")
+
+class RequestCoalescer:
+    """Menggabungkan permintaan identik yang sedang berjalan menjadi satu PipelineRun"""
+    
+    def __init__(self):
+        self._inflight: Dict[str, PipelineRun] = {}
+        self.runs_started = 0
+        self.requests_coalesced = 0
+    
+    def join(self, key: str, start: Callable[[], AsyncIterator[Tuple[str, Any]]]) -> PipelineRun:
+        run = self._inflight.get(key)
+        if run is not None:
+            self.requests_coalesced += 1
+        else:
+            run = PipelineRun()
+            self._inflight[key] = run
+            self.runs_started += 1
+            # Task berdiri sendiri: klien yang putus tidak membatalkan run milik klien lain
+            asyncio.ensure_future(self._drive(key, run, start()))
+        run.subscribers += 1
+        return run
+    
+    async def _drive(self, key: str, run: PipelineRun, stages: AsyncIterator[Tuple[str, Any]]) -> None:
+        error = None
+        try:
+            with tracer.span("service.pipeline", key=key):
+                async for stage, output in stages:
+                    await run.publish(stage, output)
+        except Exception as e:
+            logger.exception("Pipeline gagal untuk %s", key)
+            error = e
+        finally:
+            self._inflight.pop(key, None)
+            await run.finish(error)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "inflight": len(self._inflight),
+            "runs_started": self.runs_started,
+            "requests_coalesced": self.requests_coalesced
+        }
+
+class CurriculumService:
+    """Pipeline yang sama dengan main() Streamlit, dibagi oleh semua permintaan HTTP"""
+    
+    def __init__(
+        self,
+        cache: Optional[CurriculumCache] = None,
+        memo: Optional[StageMemoizer] = None,
+        semantic_index: Optional[SemanticIndex] = None,
+        catalog: Optional[VideoCatalog] = None,
+        extractor: Optional[PageExtractionPool] = None
+    ):
+        self.cache = cache
+        self.semantic_index = semantic_index
+        self.memo = memo if memo is not None else StageMemoizer()
+        self.reasoning_agent = ReasoningAgent(os.environ.get("GEMINI_API_KEY", ""), memo=self.memo)
+        self.youtube_agent = YouTubeAgent(os.environ.get("YOUTUBE_API_KEY"), memo=self.memo, catalog=catalog)
+        self.extractor = extractor if extractor is not None else PageExtractionPool()
+        self.web_agent = WebAgent(memo=self.memo, extractor=self.extractor)
+        self.composer = CurriculumComposer()
+        self.coalescer = RequestCoalescer()
+    
+    def start(self, params: Dict[str, Any]) -> PipelineRun:
+        key = make_cache_key(params["topic"], params["level"], params["duration"], params["formats"])
+        return self.coalescer.join(key, lambda: iter_pipeline(
+            self.reasoning_agent, self.youtube_agent, self.web_agent, self.composer,
+            params["topic"], params["level"], params["duration"], params["formats"],
+            self.cache, self.semantic_index
+        ))
+    
+    async def generate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.start(params).result()
+    
+    def stream(self, params: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        return self.start(params).subscribe()
+    
+    def close(self) -> None:
+        self.extractor.close()
+
+def parse_body(body: bytes) -> Dict[str, Any]:
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError as e:
+        raise BadRequest(f"body bukan JSON yang valid: {e}") from None
+    if not isinstance(payload, dict):
+        raise BadRequest("body harus berupa objek JSON")
+    return payload
+
+def parse_params(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Validasi body permintaan; BadRequest untuk input yang tidak valid"""
+    topic = str(payload.get("topic", "")).strip()
+    if not topic:
+        raise BadRequest("topic wajib diisi")
+    
+    level = str(payload.get("level", "pemula")).strip().lower()
+    if level not in LEVELS:
+        raise BadRequest(f"level harus salah satu dari {LEVELS}")
+    
+    try:
+        duration = int(payload.get("duration", 8))
+    except (TypeError, ValueError):
+        raise BadRequest("duration harus berupa angka") from None
+    if not 2 <= duration <= 40:
+        raise BadRequest("duration harus antara 2 dan 40 jam")
+    
+    formats = payload.get("formats", ["video", "teks"])
+    if isinstance(formats, str):
+        formats = [formats]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        raise BadRequest(f"format tidak dikenal: {unknown}")
+    
+    return {"topic": topic, "level": level, "duration": duration, "formats": list(formats)}
+
+class HTTPServer:
+    """Server HTTP/1.1 minimal berbasis asyncio, tanpa dependency tambahan"""
+    
+    def __init__(self, service: CurriculumService):
+        self.service = service
+    
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle, host, port)
+        logger.info("Mendengarkan di http://%s:%d", host, port)
+        async with server:
+            await server.serve_forever()
+    
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, path, body = await self._read_request(reader)
+            if method == "GET" and path == "/health":
+                await self._send_json(writer, 200, {"status": "ok", **self.service.coalescer.stats()})
+            elif method == "GET" and path == "/metrics":
+                await self._send_text(writer, 200, render_prometheus(metrics.read()))
+            elif method == "POST" and path in ("/curriculum", "/curriculum/stream"):
+                params = parse_params(parse_body(body))
+                if path == "/curriculum":
+                    await self._send_json(writer, 200, await self.service.generate(params))
+                else:
+                    await self._send_stream(writer, self.service.stream(params))
+            elif method == "POST" and path == "/curriculum/export":
+                payload = parse_body(body)
+                fmt = str(payload.get("format", "pdf"))
+                try:
+                    spec = export_format(fmt)
+                except ValueError as e:
+                    raise BadRequest(str(e)) from None
+                params = parse_params(payload)
+                curriculum = await self.service.generate(params)
+                await self._send_file(
+                    writer, spec.mime, export_filename(params["topic"], fmt), spec.render(curriculum)
+                )
+            else:
+                await self._send_json(writer, 404, {"error": "not found"})
+        except BadRequest as e:
+            await self._send_json(writer, 400, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            # Hanya sebelum status terkirim: _send_stream/_send_file menangani error-nya sendiri
+            logger.exception("Gagal menangani permintaan")
+            await self._send_json(writer, 500, {"error": str(e)})
+        finally:
+            writer.close()
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise BadRequest("request line tidak valid")
+        
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise BadRequest("content-length tidak valid") from None
+        if length > MAX_BODY_BYTES:
+            raise BadRequest("body terlalu besar")
+        body = await reader.readexactly(length) if length else b""
+        return parts[0].upper(), parts[1].split("?")[0], body
+    
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+    
+    async def _send_text(self, writer: asyncio.StreamWriter, status: int, text: str) -> None:
+        body = text.encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+    
+    async def _send_stream(self, writer: asyncio.StreamWriter, events: AsyncIterator[Tuple[str, Any]]) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson; charset=utf-8\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        try:
+            async for stage, output in events:
+                await self._write_chunk(writer, {"stage": stage, "data": output})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            raise
+        except Exception as e:
+            # Status 200 sudah terkirim: error dilaporkan sebagai event terakhir di stream yang sama
+            logger.exception("Pipeline gagal di tengah stream")
+            await self._write_chunk(writer, {"stage": "error", "data": str(e)})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+    
+    async def _send_file(self, writer: asyncio.StreamWriter, mime: str, filename: str, chunks: Iterator[bytes]) -> None:
+        """Mengirim output renderer per potongan; render berjalan di thread executor, bukan di event loop"""
+        loop = asyncio.get_running_loop()
+        writer.write(
+            f"HTTP/1.1 200 OK\r\n"
+            f"Content-Type: {mime}\r\n"
+            f'Content-Disposition: attachment; filename="{filename}"\r\n'
+            f"Transfer-Encoding: chunked\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1")
+        )
+        while True:
+            try:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+            except Exception:
+                # Tanpa chunk penutup klien melihat transfer tidak lengkap, bukan file yang terpotong diam-diam
+                logger.exception("Render export gagal di tengah stream")
+                return
+            if chunk is None:
+                break
+            if chunk:
+                writer.write(f"{len(chunk):x}\r\n".encode("latin-1") + chunk + b"\r\n")
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+    
+    async def _write_chunk(self, writer: asyncio.StreamWriter, payload: Dict[str, Any]) -> None:
+        line = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+        writer.write(f"{len(line):x}\r\n".encode("latin-1") + line + b"\r\n")
+        await writer.drain()
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Layanan HTTP curriculum generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache", help="Path SQLite cache kurikulum (opsional)")
+    parser.add_argument("--metrics", help="Path SQLite store metrik bersama (opsional)")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.INFO)
+    if args.metrics:
+        metrics.start_flusher(MetricsStore(args.metrics))
+    cache = semantic_index = catalog = None
+    if args.cache:
+        cache = CurriculumCache(args.cache)
+        semantic_index = SemanticIndex(os.path.join(os.path.dirname(args.cache) or ".", "semantic"))
+        catalog = VideoCatalog(os.path.join(os.path.dirname(args.cache) or ".", "video_catalog.sqlite3"))
+    service = CurriculumService(cache=cache, semantic_index=semantic_index, catalog=catalog)
+    try:
+        asyncio.run(HTTPServer(service).serve(args.host, args.port))
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""Registry template teks (judul, URL, ringkasan, deskripsi) yang dikompilasi sekali.
+
+Setiap template ditulis dengan sintaks `str.format` dan dikompilasi saat
+registry dibuat menjadi fungsi f-string dengan argumen posisional `FIELDS`.
+Tabel dispatch `(kind, key, level) -> fungsi` dihitung di muka untuk setiap
+locale, termasuk fallback (template khusus level -> template umum -> default
+kind), sehingga render hanya satu lookup dict dan satu pemanggilan fungsi.
+
+Pack per locale:
+    id    teks bawaan aplikasi (judul referensi berbahasa Inggris, ringkasan Indonesia)
+    en    seluruhnya berbahasa Inggris
+
+Pack yang tidak lengkap memakai template pack `id` untuk entri yang kosong. Locale aplikasi dipilih lewat env KURIKULUM_LOCALE.
+
+    python -m core.templates --iterations 20000     # micro-benchmark vs implementasi if/elif lama
+"""
+import json
+import os
+import string
+import sys
+import time
+from functools import lru_cache
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
+
+# Pack lengkap yang mengisi entri kosong di pack locale lain
+FALLBACK_LOCALE = "id"
+DEFAULT_LOCALE = os.environ.get("KURIKULUM_LOCALE", FALLBACK_LOCALE)
+LEVELS = ("pemula", "menengah", "lanjutan")
+
+# Nama field yang boleh dipakai template, sesuai urutan argumen fungsi hasil kompilasi
+FIELDS = ("topic", "level", "level_title", "topic_slug", "duration", "modules", "competencies")
+
+# kind -> key -> template, atau key -> {level atau "*": template}; key "*" = default kind
+TEMPLATE_PACKS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "id": {
+        "video.description": {
+            "introduction": "Pengenalan komprehensif {topic} untuk {level}. Cocok untuk pemula yang ingin memahami dasar-dasar.",
+            "basics": "Pembelajaran fundamental {topic} dengan pendekatan step-by-step yang mudah diikuti.",
+            "intermediate": "Panduan menengah {topic} dengan fokus pada implementasi praktis dan studi kasus nyata.",
+            "advanced": "Teknik lanjutan {topic} untuk profesional yang ingin mendalami aspek kompleks.",
+            "practical": "Aplikasi praktis {topic} dalam proyek nyata dengan contoh implementasi.",
+            "masterclass": "Masterclass {topic} yang mencakup best practices dan optimization techniques.",
+            "*": "Video pembelajaran {topic} untuk level {level}",
+        },
+        "reference.title": {
+            "Tutorial Guide": "Complete {topic} Tutorial for {level_title} Developers",
+            "Best Practices": "{topic} Best Practices and Common Pitfalls",
+            "Documentation": "Official {topic} Documentation and API Reference",
+            "Beginner Guide": "Getting Started with {topic}: A Beginner's Guide",
+            "Advanced Tutorial": "Advanced {topic} Techniques and Optimization",
+            "*": "Comprehensive {topic} Resource Guide",
+        },
+        "reference.summary": {
+            "Tutorial Guide": "Panduan komprehensif {topic} yang mencakup konsep fundamental hingga implementasi praktis. Dilengkapi dengan contoh kode dan studi kasus untuk level {level}.",
+            "Best Practices": "Kumpulan best practices terpilih dalam penggunaan {topic}, termasuk tips optimasi, common pitfalls yang harus dihindari, dan rekomendasi dari para ahli industri.",
+            "Documentation": "Dokumentasi resmi dan referensi API {topic} yang lengkap. Menyediakan spesifikasi teknis, parameter, dan contoh implementasi untuk pengembangan profesional.",
+            "Beginner Guide": "Panduan pemula yang ramah untuk memulai perjalanan belajar {topic}. Dijelaskan dengan bahasa sederhana dan pendekatan step-by-step.",
+            "Advanced Tutorial": "Tutorial lanjutan {topic} untuk profesional yang ingin mendalami teknik optimization, scalability, dan implementasi enterprise-level.",
+            "General Resource": "Sumber daya komprehensif {topic} yang mencakup berbagai aspek pembelajaran dari dasar hingga lanjutan.",
+            "*": "Sumber pembelajaran {topic} berkualitas tinggi untuk level {level}.",
+        },
+        "reference.url": {
+            "official": "https://docs.{topic_slug}.org/getting-started",
+            "educational": "https://learn{topic_slug}.com/tutorials/complete-guide",
+            "blog": "https://medium.com/@expert/mastering-{topic_slug}-best-practices",
+            "technical": "https://dev.to/advanced-{topic_slug}-techniques",
+            "*": "https://www.{topic_slug}-resources.com/comprehensive-guide",
+        },
+        "curriculum.title": {
+            "*": "Kurikulum {topic} - Level {level_title}",
+        },
+        "curriculum.duration": {
+            "*": "{duration} jam",
+        },
+        "curriculum.description": {
+            "1": (
+                "Kurikulum {topic} level {level} ini dirancang khusus untuk memberikan pemahaman komprehensif \n"
+                "        dalam waktu {duration} jam pembelajaran. Program ini menggabungkan teori fundamental dengan \n"
+                "        praktik langsung, memastikan peserta tidak hanya memahami konsep dasar tetapi juga mampu \n"
+                "        menerapkannya dalam skenario nyata. Setiap modul telah dikurasi dengan cermat untuk memastikan \n"
+                "        progres pembelajaran yang optimal."
+            ),
+            "2": (
+                "Melalui kombinasi video pembelajaran berkualitas tinggi dan referensi teks yang mendalam, \n"
+                "        kurikulum ini memberikan pengalaman belajar multi-modal yang efektif. Peserta akan dibimbing \n"
+                "        melalui {modules} modul utama yang mencakup {competencies} \n"
+                "        dan berbagai aspek praktis lainnya. Setiap sesi dirancang untuk membangun pemahaman secara \n"
+                "        bertahap dan memberikan kesempatan untuk praktek langsung."
+            ),
+        },
+    },
+    "en": {
+        "video.description": {
+            "introduction": "A comprehensive introduction to {topic} for {level} learners. Ideal for beginners who want to understand the fundamentals.",
+            "basics": "Fundamentals of {topic} with an easy-to-follow step-by-step approach.",
+            "intermediate": "An intermediate {topic} guide focused on practical implementation and real-world case studies.",
+            "advanced": "Advanced {topic} techniques for professionals who want to master its complex aspects.",
+            "practical": "Practical applications of {topic} in real projects with implementation examples.",
+            "masterclass": "A {topic} masterclass covering best practices and optimization techniques.",
+            "*": "{topic} learning video for the {level} level",
+        },
+        "reference.summary": {
+            "Tutorial Guide": "A comprehensive {topic} guide covering fundamental concepts through practical implementation, with code samples and case studies for the {level} level.",
+            "Best Practices": "Curated {topic} best practices, including optimization tips, common pitfalls to avoid and recommendations from industry experts.",
+            "Documentation": "Complete official documentation and API reference for {topic}, with technical specifications, parameters and implementation examples for professional development.",
+            "Beginner Guide": "A friendly beginner's guide to start learning {topic}, explained in plain language with a step-by-step approach.",
+            "Advanced Tutorial": "An advanced {topic} tutorial for professionals covering optimization, scalability and enterprise-level implementation.",
+            "General Resource": "A comprehensive {topic} resource covering every aspect of learning, from the basics to advanced topics.",
+            "*": "A high-quality {topic} learning resource for the {level} level.",
+        },
+        "curriculum.title": {
+            "*": "{topic} Curriculum - {level_title} Level",
+        },
+        "curriculum.duration": {
+            "*": "{duration} hours",
+        },
+        "curriculum.description": {
+            "1": (
+                "This {level} {topic} curriculum is designed to build a comprehensive understanding "
+                "in {duration} hours of study. It combines fundamental theory with hands-on practice, so "
+                "learners not only understand the core concepts but can also apply them in real scenarios. "
+                "Every module has been carefully curated for optimal learning progress."
+            ),
+            "2": (
+                "Through a combination of high-quality video lessons and in-depth text references, this "
+                "curriculum offers an effective multi-modal learning experience. Learners are guided through "
+                "{modules} main modules covering {competencies} and other practical aspects. Each session "
+                "is designed to build understanding step by step and to provide hands-on practice."
+            ),
+        },
+    },
+}
+
+# Dua paragraf deskripsi program yang dirender CurriculumComposer
+DESCRIPTION_PARAGRAPHS = (("curriculum.description", "1"), ("curriculum.description", "2"))
+# Judul dan label durasi kurikulum final
+CURRICULUM_LABELS = (("curriculum.title", "*"), ("curriculum.duration", "*"))
+
+# Jumlah kombinasi batch (daftar (kind, key) x level) yang disimpan dalam bentuk terkompilasi
+MAX_COMPILED_BATCHES = 4096
+
+_FORMATTER = string.Formatter()
+
+def _fstring(source: str, name: str) -> str:
+    for _, field, _, _ in _FORMATTER.parse(source):
+        if field is not None and field not in FIELDS:
+            raise ValueError(f"Field {field!r} pada template {name} tidak dikenal; gunakan salah satu dari {FIELDS}")
+    return f"f{source!r}"
+
+def _compile(expression: str, name: str) -> Callable[..., Any]:
+    code = compile(f"lambda {', '.join(FIELDS)}: {expression}", f"<template {name}>", "eval")
+    return eval(code, {"__builtins__": {}})
+
+def compile_template(source: str, name: str) -> Callable[..., str]:
+    """Mengompilasi template `str.format` menjadi fungsi f-string dengan argumen `FIELDS`"""
+    return _compile(_fstring(source, name), name)
+
+def compile_batch(sources: List[str], name: str) -> Callable[..., List[str]]:
+    """Satu fungsi yang merender beberapa template sekaligus menjadi list"""
+    return _compile("[" + ", ".join(_fstring(source, name) for source in sources) + "]", name)
+
+Context = Tuple[Any, ...]
+
+# Context per objek requirements (dicek identitasnya, requirements tidak diubah setelah
+# dibuat ReasoningAgent) agar beberapa stage dalam satu permintaan tidak menghitung ulang
+MAX_RECENT_CONTEXTS = 64
+_recent: Dict[int, Tuple[Dict[str, Any], Context]] = {}
+
+def make_context(requirements: Dict[str, Any]) -> Context:
+    """Nilai field template untuk satu requirements, urut sesuai `FIELDS`"""
+    entry = _recent.get(id(requirements))
+    if entry is not None and entry[0] is requirements:
+        return entry[1]
+    context = _context(
+        requirements["topic"],
+        requirements["level"],
+        requirements.get("duration", ""),
+        requirements.get("recommended_modules", ""),
+        tuple(requirements.get("competencies", ())[:2])
+    )
+    if len(_recent) >= MAX_RECENT_CONTEXTS:
+        _recent.clear()
+    _recent[id(requirements)] = (requirements, context)
+    return context
+
+@lru_cache(maxsize=1024)
+def _context(topic: str, level: str, duration: Any, modules: Any, competencies: Tuple[str, ...]) -> Context:
+    return (topic, level, level.title(), topic.lower().replace(" ", "-"), duration, modules, ", ".join(competencies))
+
+class LocalizedTemplates:
+    """Tabel dispatch (kind, key, level) -> template terkompilasi untuk satu locale"""
+    
+    def __init__(self, locale: str, sources: Dict[Tuple[str, str, str], str], compiled: Dict[str, Callable[..., str]]):
+        self.locale = locale
+        self._sources = sources
+        self._table = {entry: compiled[source] for entry, source in sources.items()}
+        self._batches: Dict[Tuple[Tuple[Tuple[str, str], ...], str], Callable[..., List[str]]] = {}
+    
+    def _resolve(self, kind: str, key: str, level: str) -> Tuple[str, str, str]:
+        """Entri tabel untuk (kind, key, level) setelah fallback ke key/level umum"""
+        for entry in ((kind, key, level), (kind, "*", level), (kind, key, "*"), (kind, "*", "*")):
+            if entry in self._sources:
+                return entry
+        raise KeyError(f"Tidak ada template {kind}:{key} untuk locale {self.locale}")
+    
+    def render(self, kind: str, key: str, level: str, context: Context) -> str:
+        template = self._table.get((kind, key, level)) or self._table[self._resolve(kind, key, level)]
+        return template(*context)
+    
+    def render_batch(self, requests: Iterable[Tuple[str, str]], level: str, context: Context) -> List[str]:
+        """Render banyak (kind, key) dengan context yang sama lewat satu fungsi batch terkompilasi"""
+        if type(requests) is not tuple:
+            requests = tuple(requests)
+        batch = self._batches.get((requests, level))
+        if batch is None:
+            batch = self._compile_batch(requests, level)
+        return batch(*context)
+    
+    def _compile_batch(self, requests: Tuple[Tuple[str, str], ...], level: str) -> Callable[..., List[str]]:
+        sources = [self._sources[self._resolve(kind, key, level)] for kind, key in requests]
+        batch = compile_batch(sources, f"{self.locale}:batch:{level}")
+        if len(self._batches) < MAX_COMPILED_BATCHES:
+            self._batches[(requests, level)] = batch
+        return batch
+    
+    def kinds(self) -> List[str]:
+        return sorted({kind for kind, _, _ in self._sources})
+
+class TemplateRegistry:
+    """Semua pack template, dikompilasi dan diindeks saat dibuat"""
+    
+    def __init__(
+        self,
+        packs: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+        default_locale: str = FALLBACK_LOCALE,
+        fallback_locale: str = FALLBACK_LOCALE
+    ):
+        packs = TEMPLATE_PACKS if packs is None else packs
+        for locale in (default_locale, fallback_locale):
+            if locale not in packs:
+                raise ValueError(f"Locale {locale!r} tidak punya pack template; tersedia {list(packs)}")
+        self.default_locale = default_locale
+        # Template identik di beberapa locale/level berbagi satu fungsi
+        compiled: Dict[str, Callable[..., str]] = {}
+        self._locales = {}
+        for locale, pack in packs.items():
+            sources = self._build_sources(packs[fallback_locale], pack)
+            for (kind, key, level), source in sources.items():
+                if source not in compiled:
+                    compiled[source] = compile_template(source, f"{locale}:{kind}:{key}:{level}")
+            self._locales[locale] = LocalizedTemplates(locale, sources, compiled)
+    
+    @staticmethod
+    def _build_sources(
+        fallback_pack: Dict[str, Dict[str, Any]],
+        pack: Dict[str, Dict[str, Any]]
+    ) -> Dict[Tuple[str, str, str], str]:
+        sources: Dict[Tuple[str, str, str], str] = {}
+        for kind in fallback_pack.keys() | pack.keys():
+            # Entri yang tidak ada di pack locale diambil dari pack fallback
+            entries = {**fallback_pack.get(kind, {}), **pack.get(kind, {})}
+            for key, value in entries.items():
+                variants = value if isinstance(value, dict) else {"*": value}
+                generic = variants.get("*")
+                for level in LEVELS + ("*",):
+                    source = variants.get(level, generic)
+                    if source is not None:
+                        sources[(kind, key, level)] = source
+        return sources
+    
+    @property
+    def locales(self) -> List[str]:
+        return list(self._locales)
+    
+    def localized(self, locale: Optional[str] = None) -> LocalizedTemplates:
+        """Tabel dispatch untuk `locale` (default registry jika None); ValueError jika tidak dikenal"""
+        templates = self._locales.get(locale or self.default_locale)
+        if templates is None:
+            raise ValueError(f"locale template harus salah satu dari {self.locales}")
+        return templates
+
+_registry: Optional[TemplateRegistry] = None
+
+def get_registry() -> TemplateRegistry:
+    """Registry bersama untuk semua agent, dikompilasi saat pertama dipakai"""
+    global _registry
+    if _registry is None:
+        _registry = TemplateRegistry(default_locale=DEFAULT_LOCALE)
+    return _registry
+
+# Implementasi sebelum registry (if/elif dan str.format per panggilan), dipakai benchmark
+_LEGACY_VIDEO_DESCRIPTIONS = dict(TEMPLATE_PACKS["id"]["video.description"])
+_LEGACY_REFERENCE_SUMMARIES = dict(TEMPLATE_PACKS["id"]["reference.summary"])
+
+def _legacy_title(topic: str, content_type: str, level: str) -> str:
+    if content_type == "Tutorial Guide":
+        return f"Complete {topic} Tutorial for {level.title()} Developers"
+    elif content_type == "Best Practices":
+        return f"{topic} Best Practices and Common Pitfalls"
+    elif content_type == "Documentation":
+        return f"Official {topic} Documentation and API Reference"
+    elif content_type == "Beginner Guide":
+        return f"Getting Started with {topic}: A Beginner's Guide"
+    elif content_type == "Advanced Tutorial":
+        return f"Advanced {topic} Techniques and Optimization"
+    else:
+        return f"Comprehensive {topic} Resource Guide"
+
+def _legacy_url(topic: str, site_type: str) -> str:
+    topic_slug = topic.lower().replace(' ', '-')
+    if site_type == "official":
+        return f"https://docs.{topic_slug}.org/getting-started"
+    elif site_type == "educational":
+        return f"https://learn{topic_slug}.com/tutorials/complete-guide"
+    elif site_type == "blog":
+        return f"https://medium.com/@expert/mastering-{topic_slug}-best-practices"
+    elif site_type == "technical":
+        return f"https://dev.to/advanced-{topic_slug}-techniques"
+    else:
+        return f"https://www.{topic_slug}-resources.com/comprehensive-guide"
+
+def _legacy_format(templates: Dict[str, str], key: str, topic: str, level: str) -> str:
+    return sys.intern(templates.get(key, templates["*"]).format(topic=topic, level=level))
+
+def _legacy_paragraphs(requirements: Dict[str, Any]) -> List[str]:
+    topic = requirements['topic']
+    level = requirements['level']
+    duration = requirements['duration']
+    
+    description_para1 = f"""
+        Kurikulum {topic} level {level} ini dirancang khusus untuk memberikan pemahaman komprehensif 
+        dalam waktu {duration} jam pembelajaran. Program ini menggabungkan teori fundamental dengan 
+        praktik langsung, memastikan peserta tidak hanya memahami konsep dasar tetapi juga mampu 
+        menerapkannya dalam skenario nyata. Setiap modul telah dikurasi dengan cermat untuk memastikan 
+        progres pembelajaran yang optimal.
+        """
+    
+    description_para2 = f"""
+        Melalui kombinasi video pembelajaran berkualitas tinggi dan referensi teks yang mendalam, 
+        kurikulum ini memberikan pengalaman belajar multi-modal yang efektif. Peserta akan dibimbing 
+        melalui {requirements['recommended_modules']} modul utama yang mencakup {', '.join(requirements['competencies'][:2])} 
+        dan berbagai aspek praktis lainnya. Setiap sesi dirancang untuk membangun pemahaman secara 
+        bertahap dan memberikan kesempatan untuk praktek langsung.
+        """
+    
+    return [description_para1.strip(), description_para2.strip()]
+
+def _legacy_request(requirements: Dict[str, Any], video_types: List[str], references: List[Tuple[str, str]]) -> List[str]:
+    topic, level = requirements["topic"], requirements["level"]
+    texts = [_legacy_format(_LEGACY_VIDEO_DESCRIPTIONS, video_type, topic, level) for video_type in video_types]
+    for content_type, site_type in references:
+        texts.append(_legacy_title(topic, content_type, level))
+        texts.append(_legacy_url(topic, site_type))
+        texts.append(_legacy_format(_LEGACY_REFERENCE_SUMMARIES, content_type, topic, level))
+    texts.append(f"Kurikulum {topic} - Level {level.title()}")
+    texts.extend(_legacy_paragraphs(requirements))
+    return texts
+
+def _registry_request(
+    templates: LocalizedTemplates,
+    requirements: Dict[str, Any],
+    video_types: List[str],
+    references: List[Tuple[str, str]]
+) -> List[str]:
+    """Pola panggilan yang sama dengan agent: satu batch video, satu batch per referensi, dst."""
+    level = requirements["level"]
+    texts = templates.render_batch(
+        tuple(("video.description", video_type) for video_type in video_types), level, make_context(requirements)
+    )
+    for content_type, site_type in references:
+        texts.extend(templates.render_batch(
+            (("reference.title", content_type), ("reference.url", site_type), ("reference.summary", content_type)),
+            level, make_context(requirements)
+        ))
+    texts.append(templates.render("curriculum.title", "*", level, make_context(requirements)))
+    texts.extend(templates.render_batch(DESCRIPTION_PARAGRAPHS, level, make_context(requirements)))
+    return texts
+
+def run_benchmark(iterations: int, repeats: int = 5) -> Dict[str, Any]:
+    """Biaya render semua teks template satu kurikulum: if/elif lama vs registry"""
+    from core.bench import BENCH_TOPICS
+    from core.records import CONTENT_TYPES, SITE_TYPES
+    
+    started = time.perf_counter()
+    templates = TemplateRegistry(default_locale="id").localized("id")
+    compile_ms = (time.perf_counter() - started) * 1000
+    
+    video_types = {
+        "pemula": ["introduction", "basics", "getting started"],
+        "menengah": ["intermediate", "practical", "implementation"],
+        "lanjutan": ["advanced", "masterclass", "expert"],
+    }
+    cases = []
+    for topic in BENCH_TOPICS:
+        for level in LEVELS:
+            requirements = {
+                "topic": topic, "level": level, "duration": 8, "recommended_modules": 4,
+                "competencies": [f"Memahami konsep {topic}", f"Menerapkan {topic}", "Evaluasi"]
+            }
+            references = [(content_type, SITE_TYPES[i % len(SITE_TYPES)]) for i, content_type in enumerate(CONTENT_TYPES[:4])]
+            cases.append((requirements, video_types[level], references))
+    
+    # Output registry (locale id) harus identik dengan implementasi lama
+    for case in cases:
+        assert _registry_request(templates, *case) == _legacy_request(*case), case[0]
+    renders_per_request = len(_legacy_request(*cases[0]))
+    rounds = max(1, iterations // len(cases))
+    
+    def measure(render_case: Callable[..., List[str]]) -> float:
+        best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            for _ in range(rounds):
+                for case in cases:
+                    render_case(*case)
+            best = min(best, time.perf_counter() - started)
+        return best / (rounds * len(cases)) * 1e9
+    
+    legacy = measure(_legacy_request)
+    registry = measure(lambda *case: _registry_request(templates, *case))
+    return {
+        "requests": rounds * len(cases),
+        "renders_per_request": renders_per_request,
+        "compile_registry_ms": round(compile_ms, 2),
+        "ns_per_request": {"legacy": round(legacy), "registry": round(registry)},
+        "ns_per_render": {
+            "legacy": round(legacy / renders_per_request),
+            "registry": round(registry / renders_per_request)
+        },
+        "speedup": round(legacy / registry, 2)
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Micro-benchmark render template teks")
+    parser.add_argument("--iterations", type=int, default=20000, help="Jumlah kurikulum yang dirender per varian")
+    parser.add_argument("--repeats", type=int, default=5, help="Pengulangan; waktu terbaik yang dilaporkan")
+    parser.add_argument("-o", "--output", help="File JSON hasil benchmark")
+    args = parser.parse_args(argv)
+    
+    result = run_benchmark(args.iterations, args.repeats)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
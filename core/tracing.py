@@ -0,0 +1,348 @@
+"""Tracing ringan per agent dengan span bersarang yang dapat diekspor ke OpenTelemetry.
+
+Span disimpan di contextvar sehingga panggilan dalam `asyncio.gather` atau task
+baru otomatis menjadi anak span yang sedang aktif. Tanpa exporter dan tanpa
+`record()` aktif, `span()` mengembalikan context manager no-op sehingga biaya di
+hot path hanya satu pengecekan.
+
+Konfigurasi lewat environment:
+    KURIKULUM_TRACE_FILE=.cache/traces.jsonl      ekspor OTLP/JSON per baris
+    KURIKULUM_TRACE_ENDPOINT=http://localhost:4318/v1/traces   ekspor OTLP/HTTP (JSON)
+
+Span diekspor per trace, saat root span selesai, oleh satu thread latar
+belakang agar penulisan file/HTTP tidak menambah latensi permintaan. Span yang
+selesai setelah root-nya (refresh katalog di latar belakang) langsung diekspor
+sendiri; trace yang root-nya tidak pernah selesai (prefetch yang dibatalkan)
+diekspor apa adanya setelah `max_pending_age` detik atau saat buffer penuh.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterator, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "kurikulum"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+_recorder: contextvars.ContextVar[Optional[List["Span"]]] = contextvars.ContextVar("span_recorder", default=None)
+
+class Span:
+    """Satu unit kerja bertimer dengan atribut (tag cache, jumlah panggilan keluar, dsb.)"""
+    
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+    
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+    
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+    
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+    
+    def add(self, key: str, amount: int = 1) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+    
+    def to_otlp(self) -> Dict[str, Any]:
+        """Representasi span dalam format OTLP/JSON"""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1}
+        }
+        return span
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+def otlp_payload(spans: List[Span]) -> Dict[str, Any]:
+    """Membungkus span sebagai body ExportTraceServiceRequest (OTLP/JSON)"""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": "core.tracing"}, "spans": [span.to_otlp() for span in spans]}]
+        }]
+    }
+
+class SpanExporter(Protocol):
+    """Tujuan ekspor span yang sudah selesai (file, collector OTLP, dsb.)"""
+    
+    def export(self, spans: List[Span]) -> None:
+        ...
+
+class FileSpanExporter:
+    """Menambahkan satu payload OTLP/JSON per trace sebagai satu baris file"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(otlp_payload(spans), ensure_ascii=False) + "\n")
+
+class OTLPHttpExporter:
+    """Mengirim span ke collector OpenTelemetry lewat OTLP/HTTP dengan encoding JSON"""
+    
+    def __init__(self, endpoint: str = "http://localhost:4318/v1/traces", timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+    
+    def export(self, spans: List[Span]) -> None:
+        import urllib.request
+        
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(otlp_payload(spans)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+class _NoopSpan:
+    """Pengganti Span saat tracing tidak aktif"""
+    
+    def set(self, key: str, value: Any) -> None:
+        pass
+    
+    def add(self, key: str, amount: int = 1) -> None:
+        pass
+
+class _NoopContext:
+    """Context manager no-op yang dipakai ulang agar span non-aktif tidak membuat objek"""
+    
+    def __enter__(self) -> _NoopSpan:
+        return _NOOP_SPAN
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+_NOOP_SPAN = _NoopSpan()
+_NOOP_CONTEXT = _NoopContext()
+
+class Tracer:
+    """Membuat span bersarang dan meneruskan trace yang selesai ke exporter"""
+    
+    def __init__(
+        self,
+        exporters: Optional[List[SpanExporter]] = None,
+        max_queue: int = 1000,
+        max_pending_traces: int = 1000,
+        max_pending_age: float = 60.0
+    ):
+        self.exporters: List[SpanExporter] = list(exporters or [])
+        self.max_queue = max_queue
+        self.max_pending_traces = max_pending_traces
+        self.max_pending_age = max_pending_age
+        # trace_id -> (waktu span pertama masuk, span anak yang menunggu root); urut dari yang tertua
+        self._pending: "OrderedDict[str, Tuple[float, List[Span]]]" = OrderedDict()
+        # Trace yang sudah diekspor; span anak yang datang terlambat diekspor tanpa ditahan
+        self._closed: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self.dropped = 0
+    
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        exporters: List[SpanExporter] = []
+        if os.environ.get("KURIKULUM_TRACE_FILE"):
+            exporters.append(FileSpanExporter(os.environ["KURIKULUM_TRACE_FILE"]))
+        if os.environ.get("KURIKULUM_TRACE_ENDPOINT"):
+            exporters.append(OTLPHttpExporter(os.environ["KURIKULUM_TRACE_ENDPOINT"]))
+        return cls(exporters)
+    
+    @property
+    def active(self) -> bool:
+        return bool(self.exporters) or _recorder.get() is not None
+    
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        self.exporters.append(exporter)
+    
+    def span(self, name: str, **attributes: Any):
+        """Context manager span anak dari span aktif (no-op jika tracing tidak aktif)"""
+        if not self.active:
+            return _NOOP_CONTEXT
+        return self._span(name, attributes)
+    
+    @contextmanager
+    def _span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        parent = _current_span.get()
+        span = Span(name, parent, attributes)
+        _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            # set(), bukan reset(token): span boleh dibuka di async generator
+            # yang dilanjutkan dari context lain
+            _current_span.set(parent)
+            self._finish(span)
+    
+    def current(self):
+        """Span aktif, atau span no-op sehingga pemanggil tidak perlu cek None"""
+        return _current_span.get() or _NOOP_SPAN
+    
+    @contextmanager
+    def record(self) -> Iterator[List[Span]]:
+        """Mengumpulkan semua span yang selesai di dalam blok ini (mis. untuk panel UI)"""
+        spans: List[Span] = []
+        token = _recorder.set(spans)
+        try:
+            yield spans
+        finally:
+            _recorder.reset(token)
+    
+    def recorded(self) -> Optional[List[Span]]:
+        """Span yang sudah dikumpulkan oleh `record()` aktif, atau None jika tidak merekam"""
+        return _recorder.get()
+    
+    def _finish(self, span: Span) -> None:
+        recorded = _recorder.get()
+        if recorded is not None:
+            recorded.append(span)
+        if not self.exporters:
+            return
+        
+        now = time.monotonic()
+        with self._lock:
+            batches = self._expire(now)
+            if span.parent_id is not None and span.trace_id not in self._closed:
+                entry = self._pending.get(span.trace_id)
+                if entry is None:
+                    self._pending[span.trace_id] = (now, [span])
+                else:
+                    entry[1].append(span)
+            else:
+                _, batch = self._pending.pop(span.trace_id, (now, []))
+                batch.append(span)
+                batches.append(batch)
+                self._close(span.trace_id)
+        for batch in batches:
+            self._enqueue(batch)
+    
+    def _expire(self, now: float) -> List[List[Span]]:
+        """Trace tertunda yang terlalu lama atau melebihi batas buffer; dipanggil dengan lock"""
+        expired = []
+        while self._pending:
+            trace_id, (first_seen, spans) = next(iter(self._pending.items()))
+            if now - first_seen < self.max_pending_age and len(self._pending) < self.max_pending_traces:
+                break
+            del self._pending[trace_id]
+            self._close(trace_id)
+            expired.append(spans)
+        return expired
+    
+    def _close(self, trace_id: str) -> None:
+        self._closed[trace_id] = None
+        while len(self._closed) > self.max_pending_traces:
+            self._closed.popitem(last=False)
+    
+    def _enqueue(self, spans: List[Span]) -> None:
+        if self._queue is None:
+            with self._lock:
+                if self._queue is None:
+                    self._queue = queue.Queue(maxsize=self.max_queue)
+                    threading.Thread(target=self._export_loop, name="span-exporter", daemon=True).start()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += len(spans)
+    
+    def _export_loop(self) -> None:
+        while True:
+            spans = self._queue.get()
+            for exporter in self.exporters:
+                try:
+                    exporter.export(spans)
+                except Exception:
+                    logger.warning("Gagal mengekspor %d span ke %s", len(spans), type(exporter).__name__, exc_info=True)
+            self._queue.task_done()
+    
+    def flush(self, timeout: float = 5.0) -> None:
+        """Menunggu antrean ekspor kosong (untuk CLI/proses yang akan berhenti)"""
+        if self._queue is None:
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorator yang membungkus coroutine function atau async generator dalam satu span"""
+    def decorate(fn: Callable) -> Callable:
+        if inspect.isasyncgenfunction(fn):
+            @functools.wraps(fn)
+            async def generator_wrapper(*args: Any, **kwargs: Any):
+                with tracer.span(name):
+                    async for item in fn(*args, **kwargs):
+                        yield item
+            return generator_wrapper
+        
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any):
+            with tracer.span(name):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def span_tree(spans: List[Span]) -> List[Dict[str, Any]]:
+    """Span terurut depth-first dengan kedalaman, untuk panel rincian waktu"""
+    children: Dict[Optional[str], List[Span]] = {}
+    ids = {span.span_id for span in spans}
+    for span in sorted(spans, key=lambda s: s.start_ns):
+        parent = span.parent_id if span.parent_id in ids else None
+        children.setdefault(parent, []).append(span)
+    
+    rows: List[Dict[str, Any]] = []
+    
+    def visit(parent: Optional[str], depth: int) -> None:
+        for span in children.get(parent, []):
+            rows.append({
+                "name": span.name,
+                "depth": depth,
+                "duration_ms": round(span.duration_ms, 2),
+                "attributes": dict(span.attributes),
+                "error": span.error
+            })
+            visit(span.span_id, depth + 1)
+    
+    visit(None, 0)
+    return rows
+
+tracer = Tracer.from_env()
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer, SimulatedBackend
+
+@pytest.fixture
+def fast_agents():
+    """Agent dengan backend simulasi tanpa latensi, dibuat per test (tanpa memo bersama)"""
+    def build(memo=None, catalog=None):
+        backend = SimulatedBackend(0.0)
+        return (
+            ReasoningAgent("", backend, memo),
+            YouTubeAgent(None, backend, memo, catalog=catalog),
+            WebAgent(backend, memo),
+            CurriculumComposer(backend)
+        )
+    return build
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.admission import AdmissionController, Deadline, Overloaded, request_deadline
+from core.agents import ReasoningAgent, YouTubeAgent, SimulatedBackend
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "kondisi tidak tercapai"
+        time.sleep(0.005)
+
+def test_waiting_sessions_are_served_round_robin():
+    controller = AdmissionController(max_concurrent=1, max_waiting=10, per_session=3)
+    controller.service_time = 0.01
+    order = []
+    
+    def request(session_id):
+        with controller.admit(session_id, 5.0):
+            order.append(session_id)
+    
+    holder = controller.admit("holder", 1.0)
+    holder.__enter__()
+    threads = []
+    for session_id in ("a", "a", "a", "b"):
+        thread = threading.Thread(target=request, args=(session_id,))
+        thread.start()
+        threads.append(thread)
+        # Tiket masuk antrean sesuai urutan klik
+        _wait_until(lambda: controller.stats()["waiting"] == len(threads))
+    holder.__exit__(None, None, None)
+    for thread in threads:
+        thread.join()
+    
+    assert order == ["a", "b", "a", "a"]
+    assert controller.stats()["active"] == 0
+
+@pytest.mark.parametrize("controller, session_id, timeout, reason", [
+    (AdmissionController(max_concurrent=1, max_waiting=0), "b", 5.0, "queue_full"),
+    (AdmissionController(max_concurrent=1, per_session=0), "b", 5.0, "session_limit"),
+    (AdmissionController(max_concurrent=1), "b", 1.0, "deadline"),
+])
+def test_requests_are_shed_without_waiting(controller, session_id, timeout, reason):
+    with controller.admit("a", 1.0):
+        started = time.monotonic()
+        with pytest.raises(Overloaded) as error:
+            with controller.admit(session_id, timeout):
+                pass
+        assert time.monotonic() - started < 0.5
+    assert error.value.reason == reason
+
+def test_waiter_gives_up_after_timeout():
+    controller = AdmissionController(max_concurrent=1)
+    controller.service_time = 0.01
+    with controller.admit("a", 1.0):
+        with pytest.raises(Overloaded) as error:
+            with controller.admit("b", 0.1):
+                pass
+        assert controller.stats()["waiting"] == 0
+    assert error.value.reason == "timeout"
+
+def test_expired_deadline_degrades_agents_to_templates():
+    async def run():
+        with request_deadline(Deadline(0.05)) as deadline:
+            requirements = await ReasoningAgent("", SimulatedBackend(1.0)).analyze("Python", "pemula", 8, ["video"])
+            videos = await YouTubeAgent(None, SimulatedBackend(1.0)).search(requirements)
+        return deadline, requirements, videos
+    
+    started = time.monotonic()
+    deadline, requirements, videos = asyncio.run(run())
+    assert time.monotonic() - started < 0.5
+    assert requirements["competencies"] and videos
+    assert deadline.degraded == ["requirements", "videos"]
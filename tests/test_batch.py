@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+from core.batch import BatchRunner, load_checkpoint, percentile, read_jobs
+
+def write_csv(path, rows):
+    path.write_text("topic,level,duration,formats\n" + "".join(f"{row}\n" for row in rows), encoding="utf-8")
+    return str(path)
+
+def test_invalid_rows_become_error_records_without_stopping_batch(tmp_path):
+    source = write_csv(tmp_path / "topics.csv", [
+        "Python,pemula,8,video;teks",
+        ",pemula,8,video",
+        "Rust,expert,8,video",
+        "Go,menengah,abc,video",
+        "SQL,lanjutan,4,teks",
+    ])
+    output = str(tmp_path / "out.jsonl")
+    
+    summary = asyncio.run(BatchRunner(workers=2, backend_latency=0.0).run(read_jobs(source), output, set()))
+    
+    records = [json.loads(line) for line in open(output, encoding="utf-8")]
+    assert summary["ok"] == 2 and summary["error"] == 3
+    assert sorted(r["input"]["topic"] for r in records if r["status"] == "ok") == ["Python", "SQL"]
+    errors = sorted(r["error"] for r in records if r["status"] == "error")
+    assert errors[0].startswith("baris 1: topic kosong")
+    assert "level" in errors[1] and "duration" in errors[2]
+
+def test_malformed_jsonl_line_does_not_abort_reading(tmp_path):
+    source = tmp_path / "topics.jsonl"
+    source.write_text('{"topic": "Python"}\n{bukan json\n["list"]\n{"topic": "Go", "level": "Lanjutan"}\n', encoding="utf-8")
+    
+    jobs = list(read_jobs(str(source)))
+    
+    assert [job.get("topic") for job in jobs] == ["Python", None, None, "Go"]
+    assert jobs[3]["level"] == "lanjutan"
+    assert "error" in jobs[1] and "error" in jobs[2]
+
+def test_checkpoint_skips_only_successful_jobs(tmp_path):
+    source = write_csv(tmp_path / "topics.csv", ["Python,pemula,8,video", "Go,salah,8,video"])
+    output = str(tmp_path / "out.jsonl")
+    asyncio.run(BatchRunner(workers=1, backend_latency=0.0).run(read_jobs(source), output, set()))
+    
+    done = load_checkpoint(output)
+    summary = asyncio.run(BatchRunner(workers=1, backend_latency=0.0).run(read_jobs(source), output, done))
+    
+    assert len(done) == 1
+    assert summary["skipped"] == 1 and summary["error"] == 1 and summary["ok"] == 0
+
+@pytest.mark.parametrize("values, pct, expected", [
+    (range(1, 11), 50, 5),
+    (range(1, 11), 90, 9),
+    (range(1, 11), 95, 10),
+    (range(1, 11), 100, 10),
+    (range(1, 11), 0, 1),
+    (range(1, 21), 95, 19),
+    (range(1, 101), 99, 99),
+    (range(1, 101), 7, 7),
+    ([3, 1, 2], 50, 2),
+    ([7], 50, 7),
+    ([], 50, 0.0),
+])
+def test_percentile_is_nearest_rank(values, pct, expected):
+    assert percentile(list(values), pct) == expected
@@ -0,0 +1,32 @@
+from core.bench import MIN_SAMPLES, build_corpus, comparable, compare, run_benchmark
+
+def result(jobs, throughput, p50=10.0, latency=0.0):
+    dist = {"p50_ms": p50, "p95_ms": p50 * 2}
+    run = {
+        "jobs": jobs,
+        "throughput_per_s": throughput,
+        "stages": {stage: dict(dist) for stage in ("analyze_requirements", "search_videos", "scrape_references", "compose_curriculum")},
+        "end_to_end": dict(dist)
+    }
+    return {"config": {"jobs": jobs, "latency_s": latency}, "runs": {"1": run}, "peak_rss_mb": 50.0}
+
+def test_small_runs_are_not_compared():
+    assert comparable(result(MIN_SAMPLES - 1, 100), result(MIN_SAMPLES - 1, 200)) is not None
+    assert comparable(result(200, 100), result(480, 100)) is not None
+    assert comparable(result(200, 100, latency=0.01), result(200, 100)) is not None
+    assert comparable(result(480, 100), result(480, 100)) is None
+
+def test_throughput_regression_uses_relative_threshold():
+    baseline = result(480, 100.0)
+    assert compare(result(480, 90.0), baseline) == []
+    regressions = compare(result(480, 60.0), baseline)
+    assert regressions == ["c=1 throughput_per_s: 100 -> 60 (-40%)"]
+
+def test_latency_regression_ignores_sub_millisecond_noise():
+    assert compare(result(480, 100, p50=0.4), result(480, 100, p50=0.2)) == []
+    assert any("p50_ms" in r for r in compare(result(480, 100, p50=20.0), result(480, 100, p50=10.0)))
+
+def test_benchmark_result_shape():
+    out = run_benchmark([2], limit=6, warmup=1)
+    assert out["config"]["jobs"] == 6 == len(build_corpus(6))
+    assert out["runs"]["2"]["end_to_end"]["count"] == 6
@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from core.cache import CurriculumCache, make_cache_key
+from core.pipeline import find_similar_curriculum
+from core.semantic import SemanticIndex
+
+def _curriculum(title="Python"):
+    return {
+        "title": title, "description": ["a", "b"], "duration": "8 jam", "level": "pemula",
+        "learning_objectives": ["x"], "competencies": ["y"], "videos": [], "references": [],
+        "created_at": "2024-01-01 00:00:00"
+    }
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CurriculumCache(str(tmp_path / "curricula.sqlite3"))
+    yield cache
+    cache.close()
+
+def test_cache_key_normalizes_inputs():
+    assert make_cache_key("  Machine   Learning ", "Pemula", "8", ["teks", "video", "teks"]) == \
+        make_cache_key("machine learning", "pemula", 8, ["video", "teks"])
+    assert make_cache_key("Python", "pemula", 8, "video") == make_cache_key("Python", "pemula", 8, ["video"])
+    assert make_cache_key("Python", "pemula", 8, ["video"]) != make_cache_key("Python", "pemula", 10, ["video"])
+
+def test_entries_expire_after_ttl(cache):
+    cache.set("short", _curriculum(), ttl=0.05)
+    cache.set("long", _curriculum())
+    assert cache.get("short") == _curriculum()
+    
+    time.sleep(0.06)
+    assert cache.get("short") is None
+    assert cache.get("long") == _curriculum()
+    # Entri kedaluwarsa juga dihapus dari disk
+    assert cache._db.execute("SELECT COUNT(*) FROM curricula WHERE key = 'short'").fetchone()[0] == 0
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = CurriculumCache(None, max_memory_items=2)
+    cache.set("a", _curriculum("A"))
+    cache.set("b", _curriculum("B"))
+    cache.get("a")
+    cache.set("c", _curriculum("C"))
+    
+    assert cache.get("b") is None
+    assert cache.get("a")["title"] == "A" and cache.get("c")["title"] == "C"
+    assert cache.stats()["evictions"] == 1
+
+def test_disk_tier_evicts_least_recently_accessed(tmp_path):
+    cache = CurriculumCache(str(tmp_path / "small.sqlite3"), max_memory_items=1, max_disk_items=2)
+    cache.set("a", _curriculum("A"))
+    time.sleep(0.01)
+    cache.set("b", _curriculum("B"))
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", _curriculum("C"))
+    
+    keys = {row[0] for row in cache._db.execute("SELECT key FROM curricula")}
+    assert keys == {"a", "c"}
+    cache.close()
+
+def test_disk_tier_survives_restart_and_counts_hits(tmp_path, cache):
+    cache.set("k", _curriculum())
+    
+    reopened = CurriculumCache(cache.path)
+    assert reopened.get("k") == _curriculum()
+    assert reopened.get("k") == _curriculum()
+    assert reopened.get("missing") is None
+    stats = reopened.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+    reopened.close()
+
+def _accessed_at(cache, key):
+    return cache._db.execute("SELECT accessed_at FROM curricula WHERE key = ?", (key,)).fetchone()[0]
+
+def test_peek_does_not_touch_stats_or_access_time(cache):
+    cache.set("k", _curriculum())
+    accessed_at = _accessed_at(cache, "k")
+    cache._memory.clear()
+    time.sleep(0.01)
+    
+    assert cache.peek("k") == _curriculum()
+    assert cache.peek("missing") is None
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 0
+    assert cache.stats()["memory_items"] == 0
+    assert _accessed_at(cache, "k") == accessed_at
+
+def test_peek_ignores_expired_entries(cache):
+    cache.set("k", _curriculum(), ttl=-1)
+    assert cache.peek("k") is None
+
+def test_semantic_peek_leaves_cache_stats_unchanged(tmp_path, cache):
+    index = SemanticIndex(str(tmp_path / "semantic"))
+    key = make_cache_key("Machine Learning", "pemula", 8, ["video"])
+    cache.set(key, _curriculum("Machine Learning"))
+    index.add("Machine Learning", "pemula", key)
+    
+    match, previous = find_similar_curriculum(index, cache, "ML", "pemula", peek=True)
+    assert match.cache_key == key and previous["title"] == "Machine Learning"
+    assert cache.stats()["hits"] == 0
+    
+    find_similar_curriculum(index, cache, "ML", "pemula")
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from core.agents import YouTubeAgent
+from core.catalog import VideoCatalog
+
+def _videos(prefix, count=3):
+    return [
+        {"title": f"{prefix} part {i}", "url": f"https://www.youtube.com/watch?v={prefix}{i}", "relevance_score": 1.0 - i / 10}
+        for i in range(count)
+    ]
+
+def _requirements(topic, level="pemula", duration=8):
+    return {"topic": topic, "level": level, "duration": duration}
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = VideoCatalog(str(tmp_path / "catalog.sqlite3"))
+    yield catalog
+    catalog.close()
+
+def test_lookup_returns_stored_videos_without_topic_terms(catalog):
+    catalog.add(_videos("intro"), _requirements("Python"))
+    
+    found = catalog.lookup("python", "pemula", 8)
+    assert [video["title"] for video in found.videos] == ["intro part 0", "intro part 1", "intro part 2"]
+    assert all("topics" not in video for video in found.videos)
+    assert not found.stale
+
+def test_lookup_filters_by_level_and_duration_bucket(catalog):
+    catalog.add(_videos("intro"), _requirements("Python"))
+    
+    assert catalog.lookup("Python", "lanjutan", 8) is None
+    assert catalog.lookup("Python", "pemula", 2) is None
+    assert catalog.lookup("Python", "pemula", 10) is not None
+
+def test_narrower_topic_does_not_answer_broader_query(catalog):
+    catalog.add(_videos("rn"), _requirements("React Native"))
+    
+    assert catalog.lookup("React", "pemula", 8) is None
+    assert catalog.lookup("react native", "pemula", 8) is not None
+    assert catalog.lookup("React Native Expo", "pemula", 8) is None
+
+def test_catalog_reloads_from_disk(tmp_path, catalog):
+    catalog.add(_videos("intro"), _requirements("Python"))
+    
+    reopened = VideoCatalog(str(tmp_path / "catalog.sqlite3"), stale_after=0.0)
+    found = reopened.lookup("Python", "pemula", 8)
+    assert len(found.videos) == 3 and found.stale
+    assert all("topics" not in video for video in found.videos)
+    reopened.close()
+
+def test_legacy_rows_with_topics_in_record_are_migrated(tmp_path):
+    path = str(tmp_path / "legacy.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE videos (id INTEGER PRIMARY KEY, url TEXT NOT NULL, level TEXT NOT NULL, bucket TEXT NOT NULL, "
+        "record TEXT NOT NULL, updated_at REAL NOT NULL, UNIQUE (url, level, bucket))"
+    )
+    for video in _videos("old"):
+        record = {**video, "topics": ["sql"]}
+        db.execute(
+            "INSERT INTO videos (url, level, bucket, record, updated_at) VALUES (?, 'pemula', 'medium', ?, 1.0)",
+            (video["url"], json.dumps(record))
+        )
+    db.commit()
+    db.close()
+    
+    catalog = VideoCatalog(path)
+    found = catalog.lookup("SQL", "pemula", 8)
+    assert len(found.videos) == 3
+    assert all("topics" not in video for video in found.videos)
+    catalog.close()
+
+class SearchBackend:
+    async def call(self, operation, payload):
+        if operation != "search":
+            return None
+        return [{"id": {"videoId": f"v{i}"}, "snippet": {"title": f"Video {i}"}} for i in range(3)]
+
+def test_template_videos_are_not_cataloged(catalog):
+    agent = YouTubeAgent(None, None, catalog=catalog)
+    videos = asyncio.run(agent.search(_requirements("Python")))
+    
+    assert videos
+    assert len(catalog) == 0
+
+def test_backend_videos_are_cataloged_and_reused(catalog):
+    agent = YouTubeAgent("key", SearchBackend(), catalog=catalog)
+    videos = asyncio.run(agent.search(_requirements("Python")))
+    
+    assert len(catalog) == 3
+    assert catalog.lookup("Python", "pemula", 8).videos == videos
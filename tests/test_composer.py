@@ -0,0 +1,58 @@
+import asyncio
+
+from core.agents import ReasoningAgent, CurriculumComposer, SimulatedBackend
+
+class StreamingBackend:
+    """Backend yang menulis potongan teks lalu (opsional) berhenti merespons"""
+    
+    def __init__(self, pieces, hang=False):
+        self.pieces = pieces
+        self.hang = hang
+    
+    async def call(self, operation, payload):
+        return None
+    
+    async def stream(self, operation, payload):
+        for piece in self.pieces:
+            yield piece
+        if self.hang:
+            await asyncio.sleep(10)
+
+def _compose(backend, timeout=1.0):
+    async def run():
+        requirements = await ReasoningAgent("", SimulatedBackend(0.0)).analyze("Python", "pemula", 8, ["video"])
+        composer = CurriculumComposer(backend, timeout=timeout)
+        templates = composer._description_templates(requirements)
+        chunks = []
+        curriculum = await composer.compose(requirements, [], [], on_chunk=chunks.append)
+        return chunks, curriculum, [t.strip() for t in templates]
+    return asyncio.run(run())
+
+def _replay(chunks):
+    paragraphs = ["", ""]
+    for chunk in chunks:
+        if chunk["replace"]:
+            paragraphs[chunk["paragraph"]] = chunk["text"]
+        else:
+            paragraphs[chunk["paragraph"]] += chunk["text"]
+    return [p.strip() for p in paragraphs]
+
+def test_model_text_is_streamed_per_paragraph():
+    chunks, curriculum, _ = _compose(StreamingBackend(["Paragraf ", "satu.\n\nParagraf", " dua."]))
+    
+    assert curriculum["description"] == ["Paragraf satu.", "Paragraf dua."]
+    assert _replay(chunks) == curriculum["description"]
+    assert [c["text"] for c in chunks[:2]] == ["Paragraf ", "satu."]
+
+def test_unwritten_paragraph_is_filled_from_template_on_timeout():
+    chunks, curriculum, templates = _compose(StreamingBackend(["Dari model.\n\nSetengah"], hang=True), timeout=0.1)
+    
+    assert curriculum["description"] == ["Dari model.", templates[1]]
+    # Paragraf kedua yang terpotong diganti, bukan disambung
+    assert any(c["paragraph"] == 1 and c["replace"] for c in chunks)
+    assert _replay(chunks) == curriculum["description"]
+
+def test_backend_without_stream_uses_templates():
+    chunks, curriculum, templates = _compose(SimulatedBackend(0.0))
+    assert curriculum["description"] == templates
+    assert _replay(chunks) == templates
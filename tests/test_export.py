@@ -0,0 +1,108 @@
+import asyncio
+import io
+import json
+import re
+import zipfile
+
+import pytest
+
+from core.export import ExportEngine, export_filename, export_format, iter_pdf, iter_zip, render
+from core.pipeline import generate_curriculum
+
+@pytest.fixture
+def curriculum(fast_agents):
+    return asyncio.run(generate_curriculum(*fast_agents(), "Python Dasar", "pemula", 8, ["video", "teks"]))
+
+def _xref_offsets(data):
+    start = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", data).group(1))
+    assert data[start:].startswith(b"xref\n")
+    header, _, rest = data[start:].partition(b"trailer")
+    lines = header.split(b"\n")[2:]
+    return [int(line[:10]) for line in lines if line.endswith(b" n ")]
+
+def test_pdf_has_valid_header_trailer_and_xref(curriculum):
+    data = render(curriculum, "pdf")
+    
+    assert data.startswith(b"%PDF-1.4\n")
+    assert data.endswith(b"%%EOF\n")
+    offsets = _xref_offsets(data)
+    assert offsets
+    for number, offset in enumerate(offsets, start=1):
+        assert data[offset:].startswith(b"%d 0 obj\n" % number)
+    size = int(re.search(rb"/Size (\d+)", data).group(1))
+    assert size == len(offsets) + 1
+
+def test_pdf_streams_match_declared_length(curriculum):
+    data = render(curriculum, "pdf")
+    
+    for match in re.finditer(rb"<< /Length (\d+) >>\nstream\n", data):
+        end = match.end() + int(match.group(1))
+        assert data[end:end + len(b"\nendstream")] == b"\nendstream"
+
+def test_pdf_paginates_long_curricula(curriculum):
+    long = dict(curriculum, learning_objectives=[f"Objektif {i}" for i in range(200)])
+    data = render(long, "pdf")
+    
+    count = int(re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count (\d+)", data).group(1))
+    assert count > 1
+    assert data.count(b"/Type /Page ") == count
+    _xref_offsets(data)
+
+def test_pdf_escapes_and_replaces_unencodable_text(curriculum):
+    data = render(dict(curriculum, title="C (lanjut) \\ 数据"), "pdf")
+    
+    assert b"(C \\(lanjut\\) \\\\ ??) Tj" in data
+
+def test_markdown_contains_title_sections_and_links(curriculum):
+    text = render(curriculum, "markdown").decode("utf-8")
+    
+    assert text.startswith(f"# {curriculum['title']}\n")
+    for heading in ("Deskripsi Program", "Objektif Pembelajaran", "Video Pembelajaran", "Referensi Pembelajaran"):
+        assert f"\n## {heading}\n" in text
+    for video in curriculum["videos"]:
+        assert f"]({video['url']})" in text
+
+def test_json_round_trips(curriculum):
+    assert json.loads(render(curriculum, "json")) == curriculum
+
+def test_zip_is_valid_and_deduplicates_names(curriculum):
+    items = [("Python Dasar", curriculum), ("Python Dasar", curriculum), ("", curriculum)]
+    data = b"".join(iter_zip(items, "markdown"))
+    
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["Python_Dasar.md", "Python_Dasar_2.md", "kurikulum.md"]
+        assert archive.read("Python_Dasar.md") == render(curriculum, "markdown")
+
+def test_unknown_format_is_rejected(curriculum):
+    with pytest.raises(ValueError):
+        export_format("docx")
+    with pytest.raises(ValueError):
+        b"".join(iter_zip([("a", curriculum)], "docx"))
+    assert export_filename("C++ / Rust", "pdf") == "curriculum_C_Rust.pdf"
+
+def test_engine_renders_once_and_reuses_cached_bytes(curriculum):
+    engine = ExportEngine(workers=2)
+    try:
+        first = engine.submit(curriculum, "pdf").result(timeout=5)
+        second = engine.submit(curriculum, "pdf")
+        
+        assert first == b"".join(iter_pdf(curriculum))
+        assert second.done()
+        assert second.result() is first
+    finally:
+        engine.shutdown()
+
+def test_engine_bulk_writes_zip_atomically(curriculum, tmp_path):
+    engine = ExportEngine(workers=1)
+    path = tmp_path / "out" / "bulk.zip"
+    try:
+        result = engine.submit_bulk([("a", curriculum), ("b", curriculum)], "json", str(path)).result(timeout=5)
+    finally:
+        engine.shutdown()
+    
+    assert result == str(path)
+    assert not (tmp_path / "out" / "bulk.zip.partial").exists()
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        assert [json.loads(archive.read(name)) for name in archive.namelist()] == [curriculum, curriculum]
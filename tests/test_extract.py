@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from core.agents import WebAgent
+from core.extract import (
+    CHUNK_BYTES, SUMMARY_CHARS, PageExtractionPool, StreamingPageExtractor, classify_site, extract_page
+)
+
+PAGE = b"""<html><head><title>Belajar  SQL</title>
+<script>var iklan = "jangan diambil";</script></head>
+<body><nav><p>Menu navigasi</p></nav>
+<h1>Pengantar</h1><p>SQL dipakai untuk mengolah data.</p>
+<pre>SELECT 1;</pre><footer><p>Hak cipta</p></footer></body></html>"""
+
+def test_extracts_title_and_main_text_only():
+    page = extract_page(PAGE, "https://learnsql.com/tutorial")
+    
+    assert page["title"] == "Belajar SQL"
+    assert page["summary"] == "Pengantar SQL dipakai untuk mengolah data. SELECT 1;"
+    assert page["site_type"] == "educational"
+    assert page["estimated_depth"] == "Moderate"
+    assert page["bytes_read"] == len(PAGE)
+
+def test_meta_description_is_preferred_and_summary_is_truncated():
+    with_meta = b'<head><meta name="description" content="Ringkasan  resmi"></head><p>isi</p>'
+    assert extract_page(with_meta, "https://x.com")["summary"] == "Ringkasan resmi"
+    
+    long_page = b"<p>" + b"kata " * 200 + b"</p>"
+    summary = extract_page(long_page, "https://x.com")["summary"]
+    assert summary.endswith("...") and len(summary) <= SUMMARY_CHARS + 3
+
+def test_parsing_stops_early_once_enough_text_is_collected():
+    huge = b"<html><title>Besar</title><body>" + b"<p>paragraf panjang berisi teks</p>" * 20000 + b"</body></html>"
+    page = extract_page(huge, "https://docs.python.org/3/")
+    
+    assert page["bytes_read"] <= CHUNK_BYTES
+    assert page["estimated_depth"] == "Deep"
+    assert page["site_type"] == "official"
+
+def test_max_bytes_caps_what_is_read():
+    page = extract_page(b"<p>a</p>" * 10000, "https://x.com", max_bytes=1000)
+    assert page["bytes_read"] == 1000
+    assert page["title"] == "https://x.com"
+
+def test_multibyte_characters_across_chunk_boundaries_survive():
+    # "é" dua byte setelah prefix tiga byte: setiap batas chunk membelah satu karakter
+    page = ("<p>" + "é" * 20000 + "</p>").encode("utf-8")
+    assert page[CHUNK_BYTES:CHUNK_BYTES + 1] == "é".encode("utf-8")[1:]
+    
+    extractor = StreamingPageExtractor(max_text_chars=10 ** 6)
+    extractor.feed_chunks(page[start:start + CHUNK_BYTES] for start in range(0, len(page), CHUNK_BYTES))
+    extractor.close()
+    
+    assert "".join(extractor.text_parts) == "é" * 20000
+
+def test_truncated_multibyte_tail_is_dropped():
+    page = ("<p>" + "é" * 10).encode("utf-8")
+    summary = extract_page(page, "https://x.com", max_bytes=len(page) - 1)["summary"]
+    assert summary == "é" * 9
+
+@pytest.mark.parametrize("url, site_type", [
+    ("https://docs.djangoproject.com/en/5.0/", "official"),
+    ("https://medium.com/@a/tips", "blog"),
+    ("https://dev.to/a/b", "technical"),
+    ("https://cs.stanford.edu/", "educational"),
+    ("https://example.com/", "mixed"),
+])
+def test_classify_site(url, site_type):
+    assert classify_site(url) == site_type
+
+class PagesBackend:
+    async def call(self, operation, payload):
+        if operation == "scrape":
+            return [{"url": "https://learnsql.com/tutorial", "content": PAGE}]
+        return None
+
+def test_web_agent_builds_references_from_real_pages():
+    requirements = {"topic": "SQL", "level": "pemula", "duration": 8, "format": ["teks"]}
+    references = asyncio.run(WebAgent(PagesBackend()).scrape(requirements))
+    
+    assert references
+    assert all(ref["title"] == "Belajar SQL" and ref["url"] == "https://learnsql.com/tutorial" for ref in references)
+    assert all(0.5 <= ref["relevance_score"] <= 1.0 for ref in references)
+
+@pytest.fixture
+def pool():
+    pool = PageExtractionPool(workers=2, max_bytes=4096)
+    yield pool
+    pool.close()
+
+def test_pool_extracts_pages_in_worker_processes(pool):
+    accented = ("<title>Café</title><p>" + "é" * 5000 + "</p>").encode("utf-8")
+    pages = [(PAGE, "https://learnsql.com/tutorial"), (accented, "https://x.com")]
+    
+    results = asyncio.run(pool.extract_many(pages))
+    
+    assert isinstance(pool.executor, ProcessPoolExecutor)
+    assert results == [extract_page(content[:4096], url, max_bytes=4096) for content, url in pages]
+    assert results[1]["title"] == "Café" and results[1]["bytes_read"] == 4096
+
+def test_web_agent_uses_the_pool(pool):
+    requirements = {"topic": "SQL", "level": "pemula", "duration": 8, "format": ["teks"]}
+    pooled = asyncio.run(WebAgent(PagesBackend(), extractor=pool).scrape(requirements))
+    
+    assert pool._executor is not None
+    assert pooled == asyncio.run(WebAgent(PagesBackend()).scrape(requirements))
+
+def test_pool_falls_back_to_threads_inside_daemon_processes(pool, monkeypatch):
+    class Daemon:
+        daemon = True
+    monkeypatch.setattr(multiprocessing, "current_process", lambda: Daemon())
+    
+    assert asyncio.run(pool.extract(PAGE, "https://x.com"))["title"] == "Belajar SQL"
+    assert isinstance(pool.executor, ThreadPoolExecutor)
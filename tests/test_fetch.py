@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.fetch import Fetcher, QuotaExceeded, TokenBucket
+
+class FakeRaw:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.content = b"{}"
+
+class FakeSession:
+    """Session palsu: mengembalikan status dari daftar secara berurutan"""
+    
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+    
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.calls += 1
+        return FakeRaw(self.statuses.pop(0))
+
+def make_fetcher(statuses, max_retries=3):
+    fetcher = Fetcher(max_retries=max_retries, backoff_base=0.0)
+    fetcher._session = FakeSession(statuses)
+    return fetcher
+
+def test_every_retry_is_charged_to_the_quota_bucket():
+    fetcher = make_fetcher([503, 503, 200])
+    bucket = TokenBucket(rate=0.001, capacity=100, max_wait=0.0)
+    
+    response = asyncio.run(fetcher.get("https://example.test/api", bucket=bucket, cost=10))
+    
+    assert response.status == 200
+    assert fetcher._session.calls == 3
+    assert bucket.available() == pytest.approx(70, abs=0.1)
+    assert fetcher.stats() == {"requests": 3, "retries": 2, "not_modified": 0}
+
+def test_retries_stop_when_quota_runs_out():
+    fetcher = make_fetcher([503, 503, 503, 200])
+    bucket = TokenBucket(rate=0.001, capacity=20, max_wait=0.0)
+    
+    with pytest.raises(QuotaExceeded):
+        asyncio.run(fetcher.get("https://example.test/api", bucket=bucket, cost=10))
+    assert fetcher._session.calls == 2
+
+def test_token_bucket_reserve_and_available():
+    bucket = TokenBucket(rate=0.001, capacity=5, max_wait=0.0)
+    for _ in range(5):
+        assert bucket.reserve() == 0.0
+    assert bucket.available() < 1
+    with pytest.raises(QuotaExceeded):
+        bucket.reserve()
+
+def test_stats_counter_is_thread_safe():
+    fetcher = Fetcher()
+    
+    def bump():
+        for _ in range(10000):
+            fetcher._count("requests")
+    
+    threads = [threading.Thread(target=bump) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fetcher.stats()["requests"] == 80000
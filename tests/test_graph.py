@@ -0,0 +1,129 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.graph import CheckpointStore, ExecutionGraph, build_curriculum_graph, curriculum_run_id
+
+def counting_graph(calls, fail_on=None):
+    def node(name):
+        async def fn(state):
+            calls.append(name)
+            if name == fail_on:
+                raise RuntimeError(f"{name} gagal")
+            return f"{name}-output"
+        return fn
+    
+    return (
+        ExecutionGraph()
+        .add_node("a", node("a"))
+        .add_node("b", node("b"), after=["a"])
+        .add_node("c", node("c"), after=["a"])
+        .add_node("d", node("d"), after=["b", "c"])
+    )
+
+def test_interrupted_run_resumes_from_completed_nodes():
+    store = CheckpointStore(None)
+    calls = []
+    with pytest.raises(RuntimeError):
+        asyncio.run(counting_graph(calls, fail_on="d").run("run-1", {}, store))
+    assert store.status("run-1") == "interrupted"
+    assert set(store.load("run-1")) == {"a", "b", "c"}
+    
+    calls.clear()
+    events = []
+    
+    async def resume():
+        async for event in counting_graph(calls).astream("run-1", {}, store):
+            events.append((event.node, event.resumed))
+    
+    asyncio.run(resume())
+    assert calls == ["d"]
+    assert sorted(events) == [("a", True), ("b", True), ("c", True), ("d", False)]
+    assert store.status("run-1") == "done"
+
+def test_discard_removes_run_so_next_run_starts_fresh():
+    store = CheckpointStore(None)
+    calls = []
+    asyncio.run(counting_graph(calls).run("run-2", {}, store))
+    store.discard("run-2")
+    
+    assert store.load("run-2") == {} and store.status("run-2") is None
+    calls.clear()
+    asyncio.run(counting_graph(calls).run("run-2", {}, store))
+    assert sorted(calls) == ["a", "b", "c", "d"]
+
+def test_overlapping_runs_on_one_id_do_not_clobber_each_other():
+    store = CheckpointStore(None)
+    calls = []
+    release = threading.Event()
+    
+    def gated_graph():
+        graph = counting_graph(calls)
+        first = graph.nodes["a"].fn
+        
+        async def a(state):
+            # Run pertama menahan node "a" sampai run kedua sudah menunggu
+            await asyncio.get_running_loop().run_in_executor(None, release.wait)
+            return await first(state)
+        graph.nodes["a"].fn = a
+        return graph
+    
+    results = {}
+    
+    def session(name, graph):
+        async def run():
+            return [(event.node, event.resumed) async for event in graph.astream("shared", {}, store, discard=True)]
+        results[name] = asyncio.run(run())
+    
+    first = threading.Thread(target=session, args=("first", gated_graph()))
+    first.start()
+    while store.claimants("shared") < 1:
+        threading.Event().wait(0.01)
+    second = threading.Thread(target=session, args=("second", counting_graph(calls)))
+    second.start()
+    while store.claimants("shared") < 2:
+        threading.Event().wait(0.01)
+    # Run kedua belum menjalankan node apa pun selama run pertama memegang run_id
+    assert calls == []
+    
+    release.set()
+    first.join(5)
+    second.join(5)
+    
+    assert sorted(calls) == ["a", "b", "c", "d"]
+    assert sorted(results["first"]) == [("a", False), ("b", False), ("c", False), ("d", False)]
+    assert sorted(results["second"]) == [("a", True), ("b", True), ("c", True), ("d", True)]
+    # Checkpoint dibuang oleh run terakhir, bukan saat run kedua masih menunggu
+    assert store.load("shared") == {} and store.claimants("shared") == 0
+
+def test_cancelled_waiter_releases_its_claim():
+    store = CheckpointStore(None)
+    
+    async def scenario():
+        async with store.claim("x"):
+            waiter = asyncio.ensure_future(counting_graph([]).run("x", {}, store))
+            await asyncio.sleep(0.1)
+            assert store.claimants("x") == 2
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        assert store.claimants("x") == 0
+        return await counting_graph([]).run("x", {}, store)
+    
+    assert asyncio.run(scenario())["d"] == "d-output"
+
+def test_run_id_is_stable_for_normalized_inputs():
+    assert curriculum_run_id("Machine  Learning", "pemula", 8, ["teks", "video"]) == \
+        curriculum_run_id("machine learning", "pemula", 8, ["video", "teks"])
+    assert curriculum_run_id("Python", "pemula", 8, ["video"]) != curriculum_run_id("Python", "menengah", 8, ["video"])
+
+def test_curriculum_graph_produces_curriculum(fast_agents):
+    reasoning, youtube, web, composer = fast_agents()
+    graph = build_curriculum_graph(reasoning, youtube, web, composer)
+    inputs = {"topic": "Python", "level": "pemula", "duration": 8, "format": ["video", "teks"]}
+    
+    state = asyncio.run(graph.run("run-3", inputs, CheckpointStore(None)))
+    
+    assert state["composer"]["videos"] == state["youtube"]
+    assert state["composer"]["references"] == state["web"]
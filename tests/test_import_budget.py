@@ -0,0 +1,31 @@
+import asyncio
+import os
+
+from core.agents import YouTubeAgent
+from core.import_budget import measure
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_core_import_does_not_load_ui_or_heavy_modules(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    assert measure(runs=1)["forbidden_loaded"] == []
+
+class ListReporter:
+    def __init__(self):
+        self.errors = []
+    
+    def error(self, message):
+        self.errors.append(message)
+    
+    def warning(self, message):
+        pass
+
+class BrokenBackend:
+    async def call(self, operation, payload):
+        raise RuntimeError("backend mati")
+
+def test_agent_errors_go_to_the_injected_reporter():
+    reporter = ListReporter()
+    agent = YouTubeAgent(None, BrokenBackend(), reporter=reporter)
+    assert asyncio.run(agent.search({"topic": "Python", "level": "pemula", "duration": 8})) == []
+    assert reporter.errors and "backend mati" in reporter.errors[0]
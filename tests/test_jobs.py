@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from core.jobs import JobQueue, QueueFull, WorkerPool
+
+def _params(topic, duration=8):
+    return {"topic": topic, "level": "pemula", "duration": duration, "formats": ["video", "teks"]}
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), max_queued=3)
+    yield queue
+    queue.close()
+
+def test_interactive_jobs_are_claimed_before_batch(queue):
+    batch = queue.submit(_params("SQL"), priority="batch")
+    interactive = queue.submit(_params("Python"))
+    
+    assert queue.claim("w1")["id"] == interactive
+    assert queue.claim("w1")["id"] == batch
+    assert queue.claim("w1") is None
+
+def test_identical_job_is_deduplicated_and_promoted(queue):
+    first = queue.submit(_params("SQL"), priority="batch")
+    other = queue.submit(_params("Git"), priority="interactive")
+    
+    assert queue.submit(_params("SQL"), priority="interactive") == first
+    # Setelah dipromosikan, job batch lama sejajar dengan job interaktif dan lebih dulu dibuat
+    assert queue.claim("w1")["id"] == first
+    assert queue.claim("w1")["id"] == other
+
+def test_submit_rejects_when_queue_is_full(queue):
+    for duration in range(3):
+        queue.submit(_params("SQL", duration + 1))
+    with pytest.raises(QueueFull):
+        queue.submit(_params("SQL", 10))
+
+def test_requeue_stale_returns_only_expired_leases(queue):
+    job_id = queue.submit(_params("SQL"))
+    assert queue.claim("w1")["id"] == job_id
+    
+    assert queue.requeue_stale(lease=60.0) == 0
+    assert queue.get(job_id)["status"] == "running"
+    
+    time.sleep(0.01)
+    assert queue.requeue_stale(lease=0.0) == 1
+    assert queue.get(job_id)["status"] == "queued"
+    assert queue.claim("w2")["id"] == job_id
+
+def test_pool_supervisor_requeues_stale_jobs_periodically(queue):
+    pool = WorkerPool(0, queue.path, lease=0.2).start()
+    try:
+        job_id = queue.submit(_params("SQL"))
+        queue.claim("dead-worker")
+        deadline = time.monotonic() + 5.0
+        while queue.get(job_id)["status"] != "queued" and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert queue.get(job_id)["status"] == "queued"
+    finally:
+        pool.stop()
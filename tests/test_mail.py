@@ -0,0 +1,84 @@
+import os
+import smtplib
+
+import pytest
+
+import core.mail
+from core.mail import EmailQueue, LocalSMTPServer, build_curriculum_email, is_permanent
+
+CURRICULUM = {"title": "Python Dasar"}
+
+class FlakyServer(LocalSMTPServer):
+    """Memutus koneksi pada pesan pertama, lalu menyimpan seperti biasa"""
+    
+    failures = 1
+    
+    def _save(self, sender, recipients, data):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionResetError("putus")
+        return super()._save(sender, recipients, data)
+
+def _outbox(path):
+    return [name for name in os.listdir(path) if name.endswith(".eml")]
+
+def _queue(server):
+    return EmailQueue("127.0.0.1", server.start_in_thread(), batch_window=0.01)
+
+def test_message_is_delivered_to_outbox(tmp_path):
+    queue = _queue(LocalSMTPServer(str(tmp_path)))
+    queue.send(build_curriculum_email("a@contoh.id", CURRICULUM, "isi", [("k.md", b"# K", "text/markdown")]))
+    
+    assert queue.flush(timeout=10)
+    assert queue.stats()["sent"] == 1
+    assert len(_outbox(tmp_path)) == 1
+
+def test_flush_waits_for_pending_retries(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.mail, "RETRY_DELAY", 0.2)
+    queue = _queue(FlakyServer(str(tmp_path)))
+    queue.send(build_curriculum_email("a@contoh.id", CURRICULUM, "isi", []))
+    
+    assert queue.flush(timeout=10)
+    assert queue.stats() == {"sent": 1, "failed": 0, "batches": 2, "pending": 0}
+    assert len(_outbox(tmp_path)) == 1
+
+def test_permanent_errors_are_not_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.mail, "RETRY_DELAY", 60.0)
+    queue = _queue(LocalSMTPServer(str(tmp_path)))
+    # Server tidak mengiklankan SMTPUTF8
+    queue.send(build_curriculum_email("pengguna@contoh.id", CURRICULUM, "isi", []))
+    queue.send(build_curriculum_email("pénguna@contoh.id", CURRICULUM, "isi", []))
+    
+    assert queue.flush(timeout=10)
+    assert queue.stats()["sent"] == 1
+    assert queue.stats()["failed"] == 1
+
+def test_oversized_message_is_rejected_with_552(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.mail, "MAX_MESSAGE_BYTES", 2048)
+    monkeypatch.setattr(core.mail, "RETRY_DELAY", 60.0)
+    server = LocalSMTPServer(str(tmp_path))
+    port = server.start_in_thread()
+    
+    with smtplib.SMTP("127.0.0.1", port, timeout=10) as smtp:
+        with pytest.raises(smtplib.SMTPDataError) as error:
+            smtp.sendmail("a@contoh.id", ["b@contoh.id"], b"x" * 4096)
+        assert error.value.smtp_code == 552
+        # Koneksi tetap bisa dipakai untuk pesan berikutnya
+        smtp.sendmail("a@contoh.id", ["b@contoh.id"], b"kecil")
+    assert len(_outbox(tmp_path)) == 1
+    
+    queue = EmailQueue("127.0.0.1", port, batch_window=0.01)
+    queue.send(build_curriculum_email("a@contoh.id", CURRICULUM, "isi", [("besar.bin", b"x" * 4096, "application/octet-stream")]))
+    assert queue.flush(timeout=10)
+    assert queue.stats()["failed"] == 1
+
+@pytest.mark.parametrize("error, permanent", [
+    (smtplib.SMTPNotSupportedError("SMTPUTF8"), True),
+    (smtplib.SMTPRecipientsRefused({"a@contoh.id": (550, b"no such user")}), True),
+    (smtplib.SMTPRecipientsRefused({"a@contoh.id": (451, b"try later")}), False),
+    (smtplib.SMTPDataError(552, b"too big"), True),
+    (smtplib.SMTPSenderRefused(421, b"busy", "a@contoh.id"), False),
+    (smtplib.SMTPServerDisconnected("putus"), False),
+])
+def test_is_permanent(error, permanent):
+    assert is_permanent(error) is permanent
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from core.memo import StageConfig, StageMemo, StageMemoizer
+from core.pipeline import generate_curriculum
+
+def test_stage_memo_expires_and_evicts():
+    memo = StageMemo(StageConfig(ttl=0.05, max_items=2))
+    memo.set("a", 1)
+    memo.set("b", 2)
+    memo.get("a")
+    memo.set("c", 3)
+    
+    assert memo.get("b", None) is None
+    assert memo.get("a") == 1 and memo.get("c") == 3
+    time.sleep(0.06)
+    assert memo.get("a", None) is None
+
+def test_memoize_computes_once_per_key():
+    memoizer = StageMemoizer()
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        return "nilai"
+    
+    assert memoizer.memoize("competencies", ("Python", "pemula"), compute) == "nilai"
+    assert memoizer.memoize("competencies", ("Python", "pemula"), compute) == "nilai"
+    assert len(calls) == 1
+    assert memoizer.stats()["competencies"] == {"hits": 1, "misses": 1, "items": 1}
+
+def test_disabled_stage_always_recomputes():
+    memoizer = StageMemoizer({"web_content": StageConfig(enabled=False)})
+    calls = []
+    for _ in range(2):
+        memoizer.memoize("web_content", "query", lambda: calls.append(1))
+    assert len(calls) == 2
+
+def test_changing_duration_reuses_every_agent_stage(fast_agents):
+    memoizer = StageMemoizer()
+    agents = fast_agents(memo=memoizer)
+    
+    async def run(duration):
+        return await generate_curriculum(*agents, "Python", "pemula", duration, ["video", "teks"])
+    
+    first = asyncio.run(run(8))
+    misses = {name: stats["misses"] for name, stats in memoizer.stats().items()}
+    second = asyncio.run(run(12))
+    
+    stats = memoizer.stats()
+    assert set(stats) == {"competencies", "video_search", "web_content"}
+    for name, stage in stats.items():
+        assert stage["misses"] == misses[name], name
+        assert stage["hits"] >= 1, name
+    assert second["competencies"] == first["competencies"]
+    assert second["duration"] != first["duration"]
+
+def test_invalidate_by_predicate():
+    memoizer = StageMemoizer()
+    memoizer.memoize("competencies", ("Python", "pemula"), lambda: 1)
+    memoizer.memoize("competencies", ("SQL", "pemula"), lambda: 2)
+    
+    assert memoizer.invalidate("competencies", lambda key: key[0] == "SQL") == 1
+    assert memoizer.stats()["competencies"]["items"] == 1
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from core.metrics import (
+    RETIRED_PROCESS, Metrics, MetricsStore, histogram_quantile, hit_rate, render_prometheus, series
+)
+
+def test_counters_from_finished_threads_are_kept():
+    metrics = Metrics()
+    threads = [threading.Thread(target=lambda: [metrics.inc("curricula_generated_total") for _ in range(100)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    metrics.inc("curricula_generated_total")
+    
+    assert metrics.snapshot()["curricula_generated_total"] == 401
+    assert metrics.snapshot()["curricula_generated_total"] == 401
+
+def test_histogram_quantile_and_hit_rate():
+    metrics = Metrics()
+    for latency in (0.05, 0.2, 0.3, 0.4, 3.0):
+        metrics.observe("pipeline_latency_seconds", latency)
+    for result in ("hit", "hit", "hit", "miss"):
+        metrics.inc("cache_requests_total", cache="curriculum", result=result)
+    values = metrics.snapshot()
+    
+    assert histogram_quantile(values, "pipeline_latency_seconds", 0.5) == 0.5
+    assert histogram_quantile(values, "pipeline_latency_seconds", 0.95) == 5.0
+    assert histogram_quantile({}, "pipeline_latency_seconds", 0.5) is None
+    assert hit_rate(values) == 0.75
+    assert hit_rate(values, cache="video_catalog") is None
+
+def test_store_sums_processes_and_drops_stale_gauges(tmp_path):
+    store = MetricsStore(str(tmp_path / "metrics.sqlite3"))
+    store.write("a", {"curricula_generated_total": 2, "active_sessions": 3})
+    store.write("b", {"curricula_generated_total": 5, "active_sessions": 1})
+    store._db.execute("UPDATE metrics SET updated_at = 0 WHERE process = 'b'")
+    
+    totals = store.read()
+    assert totals["curricula_generated_total"] == 7
+    assert totals["active_sessions"] == 3
+    assert store.read(exclude_process="a")["curricula_generated_total"] == 5
+    store.close()
+
+def test_dead_processes_are_folded_into_one_row(tmp_path):
+    store = MetricsStore(str(tmp_path / "metrics.sqlite3"), stale_after=0.5)
+    store.write("a", {"curricula_generated_total": 2, "active_sessions": 1})
+    store.write("b", {"curricula_generated_total": 3})
+    store._db.execute("UPDATE metrics SET updated_at = ?", (time.time() - 10,))
+    store.write("c", {"curricula_generated_total": 1})
+    
+    processes = {row[0] for row in store._db.execute("SELECT DISTINCT process FROM metrics")}
+    assert processes == {RETIRED_PROCESS, "c"}
+    assert store.read() == {"curricula_generated_total": 6}
+    store.close()
+
+def test_prometheus_output_orders_buckets_numerically():
+    metrics = Metrics()
+    metrics.observe("pipeline_latency_seconds", 0.2)
+    metrics.inc("emails_total", result="sent")
+    text = render_prometheus(metrics.snapshot())
+    
+    assert "# TYPE pipeline_latency_seconds histogram" in text
+    assert "# TYPE emails_total counter" in text
+    assert "# TYPE active_sessions gauge" in text
+    assert text.index('le="0.25"') < text.index('le="10.0"') < text.index('le="+Inf"')
+    assert f'{series("emails_total", {"result": "sent"})} 1' in text
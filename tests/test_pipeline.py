@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer, SimulatedBackend
+from core.cache import CurriculumCache
+from core.pipeline import generate_curriculum, iter_pipeline
+
+def test_video_and_reference_searches_run_concurrently():
+    agents = (
+        ReasoningAgent("", SimulatedBackend(0.0)),
+        YouTubeAgent(None, SimulatedBackend(0.3)),
+        WebAgent(SimulatedBackend(0.3)),
+        CurriculumComposer(SimulatedBackend(0.0))
+    )
+    
+    started = time.perf_counter()
+    curriculum = asyncio.run(generate_curriculum(*agents, "Python", "pemula", 8, ["video", "teks"]))
+    elapsed = time.perf_counter() - started
+    
+    assert curriculum["videos"] and curriculum["references"]
+    # Berurutan butuh >= 0.6 detik
+    assert elapsed < 0.5
+
+def test_simulated_backend_does_not_block_the_event_loop():
+    agent = ReasoningAgent("", SimulatedBackend(0.1))
+    
+    async def run():
+        return await asyncio.gather(*(agent.analyze(f"Topik {i}", "pemula", 8, ["video"]) for i in range(10)))
+    
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    assert [r["topic"] for r in results] == [f"Topik {i}" for i in range(10)]
+    assert time.perf_counter() - started < 0.5
+
+def test_sync_wrappers_match_async_api_inside_a_running_loop():
+    agent = YouTubeAgent(None, SimulatedBackend(0.0))
+    requirements = {"topic": "Python", "level": "pemula", "duration": 8, "format": ["video"]}
+    expected = asyncio.run(agent.search(requirements))
+    
+    async def from_loop():
+        # run_sync dipanggil dari dalam event loop yang sedang berjalan
+        return agent.search_videos(requirements)
+    
+    assert agent.search_videos(requirements) == expected
+    assert asyncio.run(from_loop()) == expected
+
+def _collect(agents, topic="Python", cache=None):
+    async def run():
+        return [item async for item in iter_pipeline(*agents, topic, "pemula", 8, ["video", "teks"], cache=cache)]
+    return asyncio.run(run())
+
+def test_pipeline_yields_each_stage_as_it_finishes(fast_agents):
+    events = _collect(fast_agents())
+    stages = [stage for stage, _ in events]
+    
+    assert stages[0] == "requirements"
+    assert sorted(stages[1:3]) == ["references", "videos"]
+    assert set(stages[3:-1]) == {"description"}
+    assert stages[-1] == "curriculum"
+    
+    outputs = dict(events)
+    assert outputs["curriculum"]["videos"] == outputs["videos"]
+    assert outputs["curriculum"]["references"] == outputs["references"]
+
+def test_cached_pipeline_skips_requirements(fast_agents):
+    cache = CurriculumCache(None)
+    _collect(fast_agents(), cache=cache)
+    assert [stage for stage, _ in _collect(fast_agents(), cache=cache)] == ["videos", "references", "curriculum"]
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.admission import AdmissionController
+from core.cache import CurriculumCache, make_cache_key
+from core.fetch import TokenBucket
+from core.memo import StageMemoizer
+from core.prefetch import PrefetchBudget, RequestHistory, SpeculativePrefetcher, WarmupScheduler
+
+@pytest.fixture
+def history():
+    history = RequestHistory(None)
+    yield history
+    history.close()
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CurriculumCache(str(tmp_path / "curricula.sqlite3"))
+    yield cache
+    cache.close()
+
+def _budget(**kwargs):
+    kwargs.setdefault("max_cpu_fraction", 2.0)
+    return PrefetchBudget(**kwargs)
+
+def test_history_ranks_by_count_and_merges_spelling(history):
+    history.record("Python", "pemula", 8, ["video"])
+    for _ in range(2):
+        history.record("  machine   LEARNING ", "menengah", 10, ["teks", "video", "teks"])
+    history.record("Machine Learning", "menengah", 10, ["video", "teks"])
+    
+    assert history.top(5) == [
+        ("Machine Learning", "menengah", 10, ("teks", "video")),
+        ("Python", "pemula", 8, ("video",))
+    ]
+    assert history.top(1) == [("Machine Learning", "menengah", 10, ("teks", "video"))]
+    assert history.top(5, window=-1) == []
+
+def test_budget_denies_when_busy_quota_low_or_rate_spent():
+    admission = AdmissionController(max_concurrent=2)
+    budget = _budget(admission=admission, rate_per_minute=60)
+    with admission.admit("a", timeout=1):
+        assert budget.check("warmup", idle_only=True) == "busy"
+        assert budget.check("speculative") is None
+    
+    quota = TokenBucket(rate=0.0, capacity=10)
+    for _ in range(6):
+        quota.reserve()
+    assert _budget(quota=quota).check("speculative") == "quota"
+    
+    limited = _budget(rate_per_minute=2)
+    assert [limited.check("speculative") for _ in range(3)] == [None, None, "rate"]
+
+def test_warmup_generates_missing_combos_once(history, cache, fast_agents):
+    history.record("Python", "pemula", 8, ["video"])
+    history.record("Rust", "mahir", 12, ["teks"])
+    cache.set(make_cache_key("Rust", "mahir", 12, ["teks"]), {"title": "Rust"})
+    scheduler = WarmupScheduler(history, cache, _budget(rate_per_minute=60), fast_agents)
+    
+    assert scheduler.pending() == [("Python", "pemula", 8, ("video",))]
+    assert scheduler.run_once() == 1
+    assert cache.get(make_cache_key("Python", "pemula", 8, ["video"]))["title"]
+    assert scheduler.pending() == []
+    assert scheduler.run_once() == 0
+
+def test_warmup_stops_when_budget_denies(history, cache, fast_agents):
+    for topic in ("Python", "Rust", "Go"):
+        history.record(topic, "pemula", 8, ["video"])
+    scheduler = WarmupScheduler(history, cache, _budget(rate_per_minute=1), fast_agents)
+    
+    assert scheduler.run_once() == 1
+    assert len(scheduler.pending()) == 2
+
+def test_speculation_fills_memo_and_is_reused(fast_agents):
+    memo = StageMemoizer()
+    reasoning, youtube, web, _ = fast_agents(memo)
+    prefetcher = SpeculativePrefetcher(_budget(rate_per_minute=60), debounce=0.0)
+    
+    assert not prefetcher.update("s", "Py", "pemula", 8, ["video"], (reasoning, youtube, web))
+    assert prefetcher.update("s", "Python", "pemula", 8, ["video"], (reasoning, youtube, web))
+    assert not prefetcher.update("s", " python ", "pemula", 8, ["video"], (reasoning, youtube, web))
+    assert prefetcher.wait("s", "PYTHON", "pemula", 8, ["video"], timeout=5)
+    assert prefetcher.stats() == {"sessions": 0, "running": 0}
+    assert set(memo.stats()) == {"competencies", "video_search", "web_content"}
+    
+    requirements = asyncio.run(reasoning.analyze("Python", "pemula", 8, ["video"]))
+    asyncio.run(youtube.search(requirements))
+    assert memo.stats()["competencies"]["hits"] == 1
+    assert memo.stats()["video_search"]["hits"] == 1
+
+def test_changed_input_discards_pending_speculation(fast_agents):
+    reasoning, youtube, web, _ = fast_agents()
+    prefetcher = SpeculativePrefetcher(_budget(rate_per_minute=60), debounce=5.0)
+    
+    prefetcher.update("s", "Python", "pemula", 8, ["video"], (reasoning, youtube, web))
+    first = prefetcher._sessions["s"].future
+    prefetcher.update("s", "Rust", "pemula", 8, ["video"], (reasoning, youtube, web))
+    
+    done = threading.Event()
+    first.add_done_callback(lambda _: done.set())
+    assert done.wait(1) and first.cancelled()
+    assert not prefetcher.wait("s", "Python", "pemula", 8, ["video"], timeout=0)
+
+def test_debounced_keystrokes_spend_no_budget(fast_agents):
+    reasoning, youtube, web, _ = fast_agents()
+    # Satu token per menit: hanya input terakhir yang boleh memakainya
+    prefetcher = SpeculativePrefetcher(_budget(rate_per_minute=1), debounce=0.2)
+    
+    for topic in ("Pyth", "Pytho", "Python"):
+        assert prefetcher.update("s", topic, "pemula", 8, ["video"], (reasoning, youtube, web))
+    assert prefetcher.wait("s", "Python", "pemula", 8, ["video"], timeout=5)
+
+def test_speculation_denied_by_budget_is_not_reported_as_used(fast_agents):
+    reasoning, youtube, web, _ = fast_agents()
+    budget = _budget(rate_per_minute=1)
+    budget.check("warmup")
+    prefetcher = SpeculativePrefetcher(budget, debounce=0.0)
+    
+    assert prefetcher.update("s", "Python", "pemula", 8, ["video"], (reasoning, youtube, web))
+    assert not prefetcher.wait("s", "Python", "pemula", 8, ["video"], timeout=5)
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+import core.records
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer, SimulatedBackend
+from core.pipeline import generate_curriculum
+from core.records import Curriculum, Requirements, pack, unpack
+
+@pytest.fixture(scope="module")
+def curricula():
+    backend = SimulatedBackend(0.0)
+    agents = (ReasoningAgent("", backend), YouTubeAgent(None, backend), WebAgent(backend), CurriculumComposer(backend))
+    
+    async def run():
+        return [
+            await generate_curriculum(*agents, topic, level, 8, ["video", "teks"])
+            for topic, level in (("Python", "pemula"), ("SQL", "menengah"), ("Docker", "lanjutan"))
+        ]
+    return asyncio.run(run())
+
+def _unusual():
+    return {
+        "title": "Kurikulum Rust", "description": ["a", "b"], "duration": "8 jam", "level": "ahli",
+        "learning_objectives": [], "competencies": ["x"], "videos": [{"title": "V", "url": "u", "chapter": 2}],
+        "references": [{"title": "R", "type": "Podcast", "site_type": "forum", "estimated_depth": "Deep", "lang": "en"}],
+        "created_at": "2024-01-01 00:00:00", "reused_from": {"topic": "Rust", "similarity": 0.91}, "note": None
+    }
+
+def test_dict_view_is_lossless(curricula):
+    for curriculum in curricula + [_unusual()]:
+        assert Curriculum.from_dict(curriculum).to_dict() == curriculum
+
+def test_requirements_view_is_lossless():
+    async def run():
+        reasoning = ReasoningAgent("", SimulatedBackend(0.0))
+        analyzed = await reasoning.analyze("Python", "pemula", 8, ["video", "teks"])
+        return [analyzed, {**analyzed, "format": [], "focus": {"area": "web"}}]
+    
+    for requirements in asyncio.run(run()):
+        record = Requirements.from_dict(requirements)
+        assert isinstance(record.format, tuple)
+        assert record.to_dict() == requirements
+
+@pytest.mark.parametrize("msgpack", [True, False])
+def test_pack_round_trip(curricula, monkeypatch, msgpack):
+    if msgpack and not core.records.HAS_MSGPACK:
+        pytest.skip("msgpack tidak terpasang")
+    monkeypatch.setattr(core.records, "HAS_MSGPACK", msgpack)
+    
+    for curriculum in curricula + [_unusual()]:
+        data = pack(Curriculum.from_dict(curriculum))
+        assert data[:1] == (b"M" if msgpack else b"J")
+        assert unpack(data).to_dict() == curriculum
+
+def test_unpacked_text_is_interned(curricula):
+    first = unpack(pack(Curriculum.from_dict(curricula[0])))
+    second = unpack(pack(Curriculum.from_dict(curricula[0])))
+    assert first.references[0].summary is second.references[0].summary
+    assert first.videos[0].description is second.videos[0].description
+
+def test_unknown_codec_and_version_are_rejected(monkeypatch):
+    with pytest.raises(ValueError):
+        unpack(b"X[]")
+    monkeypatch.setattr(core.records, "HAS_MSGPACK", False)
+    data = pack(Curriculum.from_dict(_unusual()))
+    with pytest.raises(ValueError):
+        unpack(data.replace(b"J[1,", b"J[99,", 1))
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from core.pipeline import iter_pipeline
+from core.records import Curriculum, Requirements
+from core.results import ResultStore
+
+def _generation(generation_id, degraded=None):
+    curriculum = {"title": generation_id, "videos": [], "references": []}
+    if degraded:
+        curriculum["degraded"] = degraded
+    return {
+        "id": generation_id, "topic": generation_id, "requirements": None,
+        "videos": [], "references": [], "curriculum": curriculum
+    }
+
+def test_same_generation_id_returns_stored_generation_without_view_keys():
+    store = ResultStore()
+    generation = _generation("g1")
+    generation["timings"] = {"total_ms": 12}
+    generation["trace"] = [{"name": "root"}]
+    
+    assert store.put(generation)
+    shared = store.get("g1")
+    
+    assert shared == _generation("g1")
+    assert store.get("g2") is None
+    # Sesi lain boleh menambah timings/trace ke salinannya tanpa mengubah isi store
+    shared["timings"] = {"total_ms": 1}
+    assert "timings" not in store.get("g1")
+
+def test_oldest_generation_is_evicted_past_max_items():
+    store = ResultStore(max_items=2)
+    for generation_id in ("a", "b"):
+        store.put(_generation(generation_id))
+    store.get("a")
+    store.put(_generation("c"))
+    
+    assert len(store) == 2
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+
+def test_generations_expire_after_ttl():
+    store = ResultStore(ttl=0.05)
+    store.put(_generation("a"))
+    assert store.get("a") is not None
+    time.sleep(0.06)
+    assert store.get("a") is None
+
+def test_degraded_generations_are_never_stored():
+    store = ResultStore()
+    
+    assert not store.put(_generation("t", degraded={"mode": "template", "stages": ["references"]}))
+    assert not store.put(_generation("n", degraded={"mode": "near_match", "topic": "x", "similarity": 0.9}))
+    assert len(store) == 0 and store.get("t") is None
+
+def test_real_generation_round_trips_through_records(fast_agents):
+    async def run():
+        stages = {}
+        async for stage, output in iter_pipeline(*fast_agents(), "Python", "pemula", 8, ["video", "teks"]):
+            stages[stage] = output
+        return stages
+    stages = asyncio.run(run())
+    generation = {
+        "id": "py", "topic": "Python", "requirements": stages["requirements"],
+        "videos": stages["videos"], "references": stages["references"], "curriculum": stages["curriculum"]
+    }
+    store = ResultStore()
+    store.put(generation)
+    
+    entry = store._memo.get("py")
+    assert isinstance(entry.requirements, Requirements) and isinstance(entry.curriculum, Curriculum)
+    # Video dan referensi generasi sama dengan milik kurikulum: tidak disimpan dua kali
+    assert entry.videos is None and entry.references is None
+    assert store.get("py") == generation
+    
+    reordered = dict(generation, references=generation["references"][::-1], source="queue")
+    store.put(reordered)
+    assert store.get("py") == reordered
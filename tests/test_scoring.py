@@ -0,0 +1,79 @@
+import asyncio
+import random
+
+import pytest
+
+from core.agents import SimulatedBackend, WebAgent
+from core.scoring import iter_ranked, score_references, score_videos, select_diverse, top_k
+
+VIDEO_TYPES = ["introduction", "basics", "intermediate", "practical", "implementation", "advanced", "masterclass", "expert"]
+CONTENT_TYPES = ["Tutorial Guide", "Best Practices", "Documentation", "Beginner Guide", "Advanced Tutorial", "General Resource"]
+
+def _legacy_select(references):
+    """Seleksi WebAgent._select_best_references sebelum engine scoring"""
+    references = sorted(references, key=lambda x: x['relevance_score'], reverse=True)
+    selected = []
+    used_types = set()
+    for ref in references:
+        if ref['type'] not in used_types or len(selected) < 2:
+            selected.append(ref)
+            used_types.add(ref['type'])
+        if len(selected) >= 4:
+            break
+    while len(selected) < 3 and len(references) > len(selected):
+        for ref in references:
+            if ref not in selected:
+                selected.append(ref)
+                break
+    return selected
+
+@pytest.mark.parametrize("topic, level, expected", [
+    ("Python programming", "pemula", [0.8, 0.8, 0.5, 0.7, 0.7, 0.5, 0.5, 0.5]),
+    ("Python programming", "menengah", [0.5, 0.5, 0.8, 1.0, 0.7, 0.5, 0.5, 0.5]),
+    ("Sejarah Indonesia", "lanjutan", [0.5, 0.5, 0.5, 0.5, 0.5, 0.8, 0.8, 0.5]),
+])
+def test_video_scores(topic, level, expected):
+    scores = score_videos(VIDEO_TYPES, {"topic": topic, "level": level})
+    assert scores.tolist() == pytest.approx(expected)
+
+@pytest.mark.parametrize("level, formats, expected", [
+    ("pemula", ["video", "teks"], [1.0, 0.5, 0.7, 0.8, 0.5, 0.5]),
+    ("menengah", ["video"], [0.8, 0.8, 0.5, 0.5, 0.5, 0.5]),
+    ("lanjutan", ["teks"], [0.7, 0.5, 1.0, 0.5, 0.8, 0.5]),
+])
+def test_reference_scores(level, formats, expected):
+    scores = score_references(CONTENT_TYPES, {"topic": "Python", "level": level, "format": formats})
+    assert scores.tolist() == pytest.approx(expected)
+
+def test_web_agent_scores_selected_references_with_the_engine():
+    requirements = {"topic": "Python", "level": "lanjutan", "duration": 8, "format": ["teks"]}
+    references = asyncio.run(WebAgent(SimulatedBackend(0.0)).scrape(requirements))
+    
+    assert [ref["type"] for ref in references] == ["Documentation", "Advanced Tutorial", "Tutorial Guide", "Best Practices"]
+    assert [ref["relevance_score"] for ref in references] == pytest.approx([1.0, 0.8, 0.7, 0.5])
+
+def test_top_k_matches_stable_descending_sort():
+    rng = random.Random(7)
+    for _ in range(300):
+        scores = [rng.choice([0.5, 0.7, 0.8, 1.0]) for _ in range(rng.randint(0, 30))]
+        expected = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+        for k in (0, 1, 3, len(scores), len(scores) + 2):
+            assert top_k(scores, k) == expected[:k]
+        assert list(iter_ranked(scores)) == expected
+
+def test_select_diverse_matches_legacy_reference_selection():
+    rng = random.Random(11)
+    for _ in range(500):
+        references = [
+            {"id": i, "type": rng.choice(CONTENT_TYPES[:rng.randint(1, 6)]), "relevance_score": rng.choice([0.5, 0.7, 0.8, 1.0])}
+            for i in range(rng.randint(0, 12))
+        ]
+        selected = select_diverse([r["relevance_score"] for r in references], [r["type"] for r in references])
+        assert [references[i] for i in selected] == _legacy_select(references)
+
+def test_select_diverse_limits_repeated_groups():
+    scores = [1.0, 0.9, 0.8, 0.7, 0.6]
+    groups = ["a", "a", "a", "b", "a"]
+    assert select_diverse(scores, groups) == [0, 1, 3]
+    # Kurang dari minimum: diisi kandidat ber-ranking tertinggi berikutnya
+    assert select_diverse(scores, ["a"] * 5) == [0, 1, 2]
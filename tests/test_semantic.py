@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from core.admission import NEAR_MATCH_THRESHOLD
+from core.cache import CurriculumCache, make_cache_key
+from core.pipeline import find_similar_curriculum, iter_pipeline, reuse_similar
+from core.scoring import rescore_references
+from core.semantic import SemanticIndex, normalize_topic
+
+FORMATS = ["video"]
+
+def _curriculum(topic):
+    return {
+        "title": topic, "description": ["a", "b"], "duration": "8 jam", "level": "pemula",
+        "learning_objectives": ["x"], "competencies": ["y"], "videos": [],
+        "references": [
+            {"title": "Docs", "type": "Documentation", "relevance_score": 0.5},
+            {"title": "Intro", "type": "Beginner Guide", "relevance_score": 0.8}
+        ],
+        "created_at": "2024-01-01 00:00:00"
+    }
+
+@pytest.fixture
+def stored(tmp_path):
+    index = SemanticIndex(str(tmp_path / "semantic"))
+    cache = CurriculumCache(None)
+    for topic in ("React", "Python 2", "Excel", "Machine Learning"):
+        key = make_cache_key(topic, "pemula", 8, FORMATS)
+        cache.set(key, _curriculum(topic))
+        index.add(topic, "pemula", key)
+    return index, cache
+
+def test_aliases_and_generic_words_are_normalized():
+    assert normalize_topic("ML basics") == "machine learning"
+    assert normalize_topic("Belajar Python untuk pemula") == "python"
+
+@pytest.mark.parametrize("topic", ["ML", "machine-learning basics", "Belajar Machine Learning"])
+def test_default_threshold_matches_paraphrases(stored, topic):
+    index, cache = stored
+    match, _ = find_similar_curriculum(index, cache, topic, "pemula")
+    assert match.topic == "Machine Learning"
+
+@pytest.mark.parametrize("topic", ["React Native", "Python 3", "Excel VBA"])
+def test_near_match_rejects_topic_variants(stored, topic):
+    index, cache = stored
+    assert find_similar_curriculum(index, cache, topic, "pemula") is None
+    assert find_similar_curriculum(
+        index, cache, topic, "pemula", threshold=NEAR_MATCH_THRESHOLD, same_word_count=True
+    ) is None
+
+def test_near_match_requires_same_level(stored):
+    index, cache = stored
+    assert find_similar_curriculum(index, cache, "ML", "lanjutan", threshold=NEAR_MATCH_THRESHOLD) is None
+
+def test_rescore_references_follows_requested_formats():
+    references = _curriculum("SQL")["references"]
+    
+    video_only = rescore_references(references, {"level": "pemula", "format": ["video"]})
+    assert [ref["relevance_score"] for ref in video_only] == [0.8, 0.5]
+    
+    text = rescore_references(references, {"level": "lanjutan", "format": ["teks"]})
+    assert [(ref["title"], ref["relevance_score"]) for ref in text] == [("Docs", 1.0), ("Intro", 0.5)]
+    # Referensi asli di cache tidak ikut berubah
+    assert references[0]["relevance_score"] == 0.5
+
+def test_semantic_reuse_rescores_references_for_new_formats(stored, fast_agents):
+    index, cache = stored
+    
+    async def run():
+        stages = {}
+        async for stage, output in iter_pipeline(
+            *fast_agents(), "ML basics", "pemula", 8, ["teks"], cache=cache, semantic_index=index
+        ):
+            stages[stage] = output
+        return stages
+    
+    stages = asyncio.run(run())
+    assert stages["curriculum"]["reused_from"]["topic"] == "Machine Learning"
+    assert [(ref["title"], ref["relevance_score"]) for ref in stages["references"]] == [("Intro", 0.8), ("Docs", 0.7)]
+
+def test_reuse_similar_yields_pipeline_stages_and_caches_under_new_key(stored, fast_agents):
+    index, cache = stored
+    reasoning, _, _, composer = fast_agents()
+    similar = find_similar_curriculum(index, cache, "ML basics", "pemula")
+    
+    async def run():
+        return [item async for item in reuse_similar(
+            reasoning, composer, similar, "ML basics", "pemula", 8, ["teks"], cache
+        )]
+    
+    stages = asyncio.run(run())
+    names = [stage for stage, _ in stages]
+    assert names[:3] == ["requirements", "videos", "references"]
+    assert set(names[3:-1]) == {"description"} and names[-1] == "curriculum"
+    
+    curriculum = stages[-1][1]
+    assert curriculum["reused_from"]["topic"] == "Machine Learning"
+    assert curriculum["references"] == stages[2][1]
+    assert cache.get(make_cache_key("ML basics", "pemula", 8, ["teks"]))["reused_from"] == curriculum["reused_from"]
+
+def test_index_persists_and_skips_duplicates(tmp_path):
+    index = SemanticIndex(str(tmp_path / "semantic"))
+    assert index.add("Kubernetes", "menengah", "k1")
+    assert not index.add("Kubernetes", "menengah", "k1")
+    
+    reopened = SemanticIndex(str(tmp_path / "semantic"))
+    assert len(reopened) == 1
+    assert [m.cache_key for m in reopened.search("k8s", "menengah")] == ["k1"]
+
+def test_index_drops_metadata_without_vectors(tmp_path):
+    directory = tmp_path / "semantic"
+    index = SemanticIndex(str(directory))
+    index.add("Docker", "pemula", "d1")
+    index.add("Git", "pemula", "g1")
+    # Proses mati setelah menulis meta tetapi sebelum vektor kedua lengkap
+    vectors = directory / "vectors.f32"
+    vectors.write_bytes(vectors.read_bytes()[:-4])
+    
+    reopened = SemanticIndex(str(directory))
+    assert len(reopened) == 1
+    assert reopened.search("Git", "pemula") == []
+    # Vektor baru ditulis sejajar setelah vektor yang terpotong dibuang
+    reopened.add("Git", "pemula", "g2")
+    assert [m.cache_key for m in SemanticIndex(str(directory)).search("Git", "pemula")] == ["g2"]
+
+def test_index_recovers_from_torn_metadata_line(tmp_path):
+    directory = tmp_path / "semantic"
+    SemanticIndex(str(directory)).add("Docker", "pemula", "d1")
+    with open(directory / "meta.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"topic": "Gi')
+    
+    index = SemanticIndex(str(directory))
+    index.add("Git", "pemula", "g1")
+    reopened = SemanticIndex(str(directory))
+    assert len(reopened) == 2
+    assert [m.cache_key for m in reopened.search("Git", "pemula")] == ["g1"]
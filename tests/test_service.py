@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+from core.service import HTTPServer, RequestCoalescer
+
+class FailingService:
+    """Service palsu: pipeline gagal setelah stage pertama"""
+    
+    def __init__(self, error: Exception):
+        self.error = error
+        self.coalescer = RequestCoalescer()
+    
+    async def generate(self, params):
+        raise self.error
+    
+    async def stream(self, params):
+        yield "requirements", {"topic": params["topic"]}
+        raise self.error
+
+async def request(service, method, path, body=b""):
+    server = await asyncio.start_server(HTTPServer(service).handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    return response
+
+def run(service, method, path, payload=None):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload or {}).encode("utf-8")
+    return asyncio.run(request(service, method, path, body))
+
+VALID = {"topic": "Python", "level": "pemula", "duration": 8, "formats": ["video"]}
+
+def test_invalid_request_is_400():
+    service = FailingService(RuntimeError("tidak dipakai"))
+    assert run(service, "POST", "/curriculum", b"{bukan json").startswith(b"HTTP/1.1 400")
+    assert run(service, "POST", "/curriculum", {**VALID, "level": "ahli"}).startswith(b"HTTP/1.1 400")
+    assert run(service, "POST", "/curriculum/export", {**VALID, "format": "docx"}).startswith(b"HTTP/1.1 400")
+
+def test_value_error_inside_pipeline_is_500_not_400():
+    response = run(FailingService(ValueError("bug di pipeline")), "POST", "/curriculum", VALID)
+    assert response.startswith(b"HTTP/1.1 500")
+
+def test_stream_failure_ends_stream_with_error_event():
+    response = run(FailingService(RuntimeError("model mati")), "POST", "/curriculum/stream", VALID)
+    
+    assert response.count(b"HTTP/1.1") == 1
+    assert response.startswith(b"HTTP/1.1 200")
+    assert response.endswith(b"0\r\n\r\n")
+    body = response.split(b"\r\n\r\n", 1)[1]
+    events = [json.loads(line) for line in body.split(b"\r\n") if line.startswith(b"{")]
+    assert [event["stage"] for event in events] == ["requirements", "error"]
+    assert events[-1]["data"] == "model mati"
+
+def test_identical_inflight_requests_share_one_run():
+    started = []
+    
+    async def stages():
+        started.append(1)
+        yield "requirements", {}
+        await asyncio.sleep(0.05)
+        yield "curriculum", {"title": "Python"}
+    
+    async def run_all():
+        coalescer = RequestCoalescer()
+        runs = [coalescer.join("k", stages) for _ in range(3)]
+        results = await asyncio.gather(*(run.result() for run in runs))
+        # Setelah selesai, permintaan berikutnya memulai run baru
+        again = await coalescer.join("k", stages).result()
+        return coalescer.stats(), results, again
+    
+    stats, results, again = asyncio.run(run_all())
+    assert results == [{"title": "Python"}] * 3 and again == {"title": "Python"}
+    assert len(started) == 2
+    assert stats == {"inflight": 0, "runs_started": 2, "requests_coalesced": 2}
+
+def test_late_subscriber_replays_finished_stages():
+    async def stages():
+        yield "requirements", {"n": 1}
+        yield "videos", []
+        yield "curriculum", {"title": "SQL"}
+    
+    async def late():
+        run = RequestCoalescer().join("k", stages)
+        await run.result()
+        return [stage async for stage, _ in run.subscribe()]
+    
+    assert asyncio.run(late()) == ["requirements", "videos", "curriculum"]
@@ -0,0 +1,43 @@
+import asyncio
+import inspect
+
+import pytest
+
+from core.agents import ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer, SimulatedBackend
+from core.templates import TEMPLATE_PACKS, get_registry, make_context
+
+@pytest.mark.parametrize("agent", [ReasoningAgent, YouTubeAgent, WebAgent, CurriculumComposer])
+def test_every_agent_accepts_locale(agent):
+    assert "locale" in inspect.signature(agent).parameters
+
+def test_unknown_locale_is_rejected():
+    with pytest.raises(ValueError):
+        ReasoningAgent("", SimulatedBackend(0.0), locale="xx")
+
+@pytest.mark.parametrize("locale, title, duration", [
+    ("id", "Kurikulum Python - Level Pemula", "8 jam"),
+    ("en", "Python Curriculum - Pemula Level", "8 hours"),
+])
+def test_composer_renders_labels_in_agent_locale(locale, title, duration):
+    backend = SimulatedBackend(0.0)
+    
+    async def run():
+        requirements = await ReasoningAgent("", backend, locale=locale).analyze("Python", "pemula", 8, ["video"])
+        return await CurriculumComposer(backend, locale=locale).compose(requirements, [], [])
+    
+    curriculum = asyncio.run(run())
+    assert curriculum["title"] == title
+    assert curriculum["duration"] == duration
+
+def test_registry_matches_str_format():
+    requirements = {"topic": "Data Science", "level": "menengah", "duration": 12, "recommended_modules": 6}
+    fields = dict(zip(
+        ("topic", "level", "level_title", "topic_slug", "duration", "modules", "competencies"),
+        make_context(requirements)
+    ))
+    for locale in get_registry().locales:
+        templates = get_registry().localized(locale)
+        for kind, entries in TEMPLATE_PACKS[locale].items():
+            for key, source in entries.items():
+                if isinstance(source, str):
+                    assert templates.render(kind, key, "menengah", make_context(requirements)) == source.format(**fields)
@@ -0,0 +1,78 @@
+import asyncio
+
+from core.tracing import Tracer, _current_span, span_tree
+
+class ListExporter:
+    def __init__(self):
+        self.batches = []
+    
+    def export(self, spans):
+        self.batches.append(sorted(span.name for span in spans))
+
+def make_tracer(**kwargs):
+    exporter = ListExporter()
+    return Tracer([exporter], **kwargs), exporter
+
+def test_children_are_exported_with_their_root():
+    tracer, exporter = make_tracer()
+    with tracer.span("root"):
+        with tracer.span("child"):
+            pass
+    tracer.flush()
+    
+    assert exporter.batches == [["child", "root"]]
+    assert not tracer._pending
+
+def test_child_ending_after_root_is_exported_alone():
+    tracer, exporter = make_tracer()
+    
+    async def main():
+        release = asyncio.Event()
+        
+        async def background():
+            with tracer.span("refresh"):
+                await release.wait()
+        
+        with tracer.span("root"):
+            task = asyncio.ensure_future(background())
+            await asyncio.sleep(0)
+        release.set()
+        await task
+    
+    asyncio.run(main())
+    tracer.flush()
+    
+    assert exporter.batches == [["root"], ["refresh"]]
+    assert not tracer._pending
+
+def test_orphaned_traces_are_bounded_by_count_and_age():
+    tracer, exporter = make_tracer(max_pending_traces=3, max_pending_age=3600)
+    roots = []
+    for i in range(5):
+        # Root tidak pernah selesai, mis. prefetch yang dibatalkan
+        roots.append(tracer._span(f"root-{i}", {}))
+        roots[-1].__enter__()
+        with tracer.span(f"child-{i}"):
+            pass
+        _current_span.set(None)
+    tracer.flush()
+    
+    assert len(tracer._pending) == 3
+    assert exporter.batches == [["child-0"], ["child-1"]]
+    
+    tracer.max_pending_age = 0.0
+    with tracer.span("trigger"):
+        pass
+    tracer.flush()
+    assert not tracer._pending
+
+def test_record_collects_nested_spans_without_exporter():
+    tracer = Tracer()
+    with tracer.record() as spans:
+        with tracer.span("outer"):
+            with tracer.span("inner", topic="x"):
+                pass
+    
+    rows = span_tree(spans)
+    assert [(row["name"], row["depth"]) for row in rows] == [("outer", 0), ("inner", 1)]
+    assert rows[1]["attributes"] == {"topic": "x"}